@@ -2,6 +2,961 @@
 # Date: 5/25/20
 # Description: Program which allows users to play Gess (Chess combined with Go)
 
+import logging
+import random
+import threading
+import time
+from collections import namedtuple
+from collections.abc import Mapping, MutableMapping
+from operator import mul
+
+# letters labelling the columns of the board, from west to east
+LETTERS = 'abcdefghijklmnopqrst'
+# number of rows and columns on the board
+BOARD_SIZE = 20
+# number of cells on the board
+CELL_COUNT = BOARD_SIZE * BOARD_SIZE
+# cell contents as stored by the board
+EMPTY_CELL = 0
+BLACK_STONE = 1
+WHITE_STONE = 2
+# characters used to display each kind of cell content
+STONE_CHARS = ' bw'
+# stone belonging to each player
+PLAYER_STONES = {'BLACK': BLACK_STONE, 'WHITE': WHITE_STONE}
+
+# (column, row) offsets of the cells of a piece, keyed by their position in the piece
+_FOOTPRINT_DELTAS = {'NW': (-1, 1), 'N': (0, 1), 'NE': (1, 1),
+                     'W': (-1, 0), 'C': (0, 0), 'E': (1, 0),
+                     'SW': (-1, -1), 'S': (0, -1), 'SE': (1, -1)}
+# positions within a piece, in display order
+FOOTPRINT_KEYS = tuple(_FOOTPRINT_DELTAS)
+# index offsets of the cells of a piece relative to its center, in display order
+FOOTPRINT = tuple(dr * BOARD_SIZE + dc for dc, dr in _FOOTPRINT_DELTAS.values())
+# index offset of a single step in each of the eight directions
+DIRECTIONS = {key: FOOTPRINT[i] for i, key in enumerate(FOOTPRINT_KEYS) if key != 'C'}
+
+
+def _step_cells(direction, leading):
+    """
+    returns the (column, row) offsets of the cells a
+    piece newly covers (leading) or leaves behind
+    (trailing) when it takes one step in the given
+    direction. leading offsets are relative to the
+    center before the step, trailing offsets to the
+    center after it
+    """
+    dc, dr = _FOOTPRINT_DELTAS[direction]
+    if not leading:
+        dc, dr = -dc, -dr
+    footprint = set(_FOOTPRINT_DELTAS.values())
+    return tuple((c + dc, r + dr) for c, r in _FOOTPRINT_DELTAS.values() if (c + dc, r + dr) not in footprint)
+
+
+# cells uncovered by a step, relative to the center before the step
+FRONTIERS = {direction: tuple(r * BOARD_SIZE + c for c, r in _step_cells(direction, True))
+             for direction in DIRECTIONS}
+# cells left behind by a step, relative to the center after the step
+WAKES = {direction: tuple(r * BOARD_SIZE + c for c, r in _step_cells(direction, False))
+         for direction in DIRECTIONS}
+
+# 64 bit Zobrist keys for each kind of cell content on each cell, empty cells
+# hashing to zero, and the key toggled when white is the player to move. The
+# seed is fixed so that hashes agree between processes and runs
+_zobrist_random = random.Random(0x6E55)
+ZOBRIST_KEYS = ((0,) * CELL_COUNT,
+                tuple(_zobrist_random.getrandbits(64) for _ in range(CELL_COUNT)),
+                tuple(_zobrist_random.getrandbits(64) for _ in range(CELL_COUNT)))
+ZOBRIST_WHITE_TO_MOVE = _zobrist_random.getrandbits(64)
+del _zobrist_random
+
+# layout of the stones at the beginning of a game, from row 20 down to row 1
+_STARTING_ROWS = ('....................',
+                  '..w.w.wwwwwwww.w.w..',
+                  '.www.w.wwww.w.w.www.',
+                  '..w.w.wwwwwwww.w.w..',
+                  '....................',
+                  '....................',
+                  '..w..w..w..w..w..w..',
+                  '....................',
+                  '....................',
+                  '....................',
+                  '....................',
+                  '....................',
+                  '....................',
+                  '..b..b..b..b..b..b..',
+                  '....................',
+                  '....................',
+                  '..b.b.bbbbbbbb.b.b..',
+                  '.bbb.b.bbbb.b.b.bbb.',
+                  '..b.b.bbbbbbbb.b.b..',
+                  '....................')
+
+
+def address_to_index(address):
+    """
+    converts an address such as 'l3' into the
+    index of its cell on the board. Raises a
+    ValueError if the address is not on the board
+    """
+    try:
+        column = LETTERS.index(address[0])
+        row = int(address[1:]) - 1
+    except (IndexError, TypeError, ValueError):
+        raise ValueError('not a board address: %r' % (address,))
+    if not 0 <= row < BOARD_SIZE or not address[1:].isdigit():
+        raise ValueError('not a board address: %r' % (address,))
+    return row * BOARD_SIZE + column
+
+
+# address of every cell, by index
+_ADDRESSES = tuple(LETTERS[index % BOARD_SIZE] + str(index // BOARD_SIZE + 1) for index in range(CELL_COUNT))
+
+
+def index_to_address(index):
+    """converts the index of a cell into its address, such as 'l3'"""
+    return _ADDRESSES[index]
+
+
+def is_interior(index):
+    """
+    returns True if a piece centered on the
+    given cell lies entirely on the board
+    """
+    row, column = divmod(index, BOARD_SIZE)
+    return 0 < row < BOARD_SIZE - 1 and 0 < column < BOARD_SIZE - 1
+
+
+# cells which may be the center of a piece, from b2 onwards
+INTERIOR_CENTERS = tuple(index for index in range(CELL_COUNT) if is_interior(index))
+
+
+def _neighbor(index, direction):
+    """returns the cell one step away in the given direction, or None off the board"""
+    dc, dr = _FOOTPRINT_DELTAS[direction]
+    row, column = divmod(index, BOARD_SIZE)
+    if 0 <= row + dr < BOARD_SIZE and 0 <= column + dc < BOARD_SIZE:
+        return index + DIRECTIONS[direction]
+    return None
+
+
+def _ray(center, direction):
+    """returns the centers a piece passes through sliding from center to the edge"""
+    ray = []
+    position = _neighbor(center, direction)
+    while position is not None and is_interior(position):
+        ray.append(position)
+        position = _neighbor(position, direction)
+    return tuple(ray)
+
+
+# geometry of the board, computed once so that moves never work out neighbours
+# or footprints cell by cell. Each table is indexed by cell; the tables about
+# pieces hold None for the cells which cannot be the center of a piece
+# the nine cells of the piece centered on each cell, in display order
+FOOTPRINTS = tuple(tuple(index + offset for offset in FOOTPRINT) if is_interior(index) else None
+                   for index in range(CELL_COUNT))
+# the centers a piece passes through sliding from each cell in each direction
+RAYS = tuple({direction: _ray(index, direction) for direction in DIRECTIONS} if is_interior(index) else None
+             for index in range(CELL_COUNT))
+# the cells a piece newly covers stepping from each center in each direction
+LEADING_EDGES = tuple({direction: tuple(index + offset for offset in FRONTIERS[direction])
+                       for direction in DIRECTIONS if RAYS[index][direction]}
+                      if is_interior(index) else None
+                      for index in range(CELL_COUNT))
+
+
+def get_piece_moves(footprint):
+    """
+    given the contents of the nine cells of a piece,
+    returns a dictionary of the directions it may move
+    in and the furthest it may travel in each: 17 in
+    every direction with a center stone, otherwise 3
+    towards each stone. Returns None if the piece holds
+    both black and white stones
+    """
+    if BLACK_STONE in footprint and WHITE_STONE in footprint:
+        return None
+    if footprint[4] != EMPTY_CELL:
+        return {key: 17 for key in FOOTPRINT_KEYS}
+    return {key: 3 for key, stone in zip(FOOTPRINT_KEYS, footprint) if stone != EMPTY_CELL}
+
+
+# a piece holds one of 3 ** 9 stone patterns, numbered by reading the contents
+# of its cells in display order as the digits of a base 3 number, lowest first
+PATTERN_COUNT = 3 ** len(FOOTPRINT_KEYS)
+# value of a stone in each position of a piece towards its pattern number
+PATTERN_WEIGHTS = tuple(3 ** position for position in range(len(FOOTPRINT_KEYS)))
+
+
+def pattern_index(footprint):
+    """returns the pattern number of the contents of the nine cells of a piece"""
+    return sum(stone * weight for stone, weight in zip(footprint, PATTERN_WEIGHTS))
+
+
+def pattern_footprint(pattern):
+    """returns the contents of the nine cells of a piece holding the given pattern"""
+    return tuple(pattern // weight % 3 for weight in PATTERN_WEIGHTS)
+
+
+def _pattern_tables():
+    """
+    returns the moves, owning stone and direction
+    limits of every pattern. The move dictionaries
+    are shared between the patterns giving the same
+    moves, so they must never be changed
+    """
+    shared = {}
+    moves, stones, directions = [], [], []
+    for pattern in range(PATTERN_COUNT):
+        footprint = pattern_footprint(pattern)
+        valid_moves = get_piece_moves(footprint)
+        if valid_moves is not None:
+            valid_moves = shared.setdefault(tuple(valid_moves.items()), valid_moves)
+        moves.append(valid_moves)
+        if valid_moves is None:
+            stones.append(None)
+        else:
+            stones.append(max(footprint))
+        directions.append(tuple((direction, valid_moves[direction]) for direction in DIRECTIONS
+                                if direction in valid_moves) if valid_moves else ())
+    return tuple(moves), tuple(stones), tuple(directions)
+
+
+# for each pattern: the moves get_piece_moves allows, the stone of the only
+# color it holds, which is EMPTY_CELL if it is empty and None if it mixes
+# colors, and its (direction, limit) pairs in the order of DIRECTIONS
+PATTERN_MOVES, PATTERN_STONES, PATTERN_DIRECTIONS = _pattern_tables()
+
+
+def _pattern_targets():
+    """returns the (center, weight) of each piece holding each cell"""
+    targets = [[] for _ in range(CELL_COUNT)]
+    for center in INTERIOR_CENTERS:
+        for index, weight in zip(FOOTPRINTS[center], PATTERN_WEIGHTS):
+            targets[index].append((center, weight))
+    return tuple(tuple(cell_targets) for cell_targets in targets)
+
+
+# the (center, weight) of each piece holding each cell, for keeping pattern numbers
+PATTERN_TARGETS = _pattern_targets()
+
+# the board is divided into 5 x 5 regions, numbered row by row from the a1 corner
+REGION_SIZE = 5
+REGIONS_PER_SIDE = BOARD_SIZE // REGION_SIZE
+REGION_COUNT = REGIONS_PER_SIDE * REGIONS_PER_SIDE
+# region of each cell
+CELL_REGIONS = tuple(index // BOARD_SIZE // REGION_SIZE * REGIONS_PER_SIDE + index % BOARD_SIZE // REGION_SIZE
+                     for index in range(CELL_COUNT))
+# evaluation features kept up to date by the boards as cells are written. Each
+# color has a block of FEATURES_PER_COLOR counters, black first: its stones,
+# its pieces (centers whose piece holds only its stones), its rings, its near
+# rings (empty centers with seven ring cells of its stones and the eighth
+# empty), then its stones in each region
+FEATURE_STONES = 0
+FEATURE_PIECES = 1
+FEATURE_RINGS = 2
+FEATURE_NEAR_RINGS = 3
+FEATURE_REGIONS = 4
+FEATURES_PER_COLOR = FEATURE_REGIONS + REGION_COUNT
+FEATURE_COUNT = 2 * FEATURES_PER_COLOR
+
+
+def feature_slot(stone, feature):
+    """returns the position of a feature of the given stone's color among the board features"""
+    return (stone - 1) * FEATURES_PER_COLOR + feature
+
+
+def _pattern_features(pattern):
+    """returns the feature slots counting a piece holding the given pattern"""
+    stone = PATTERN_STONES[pattern]
+    if not stone:
+        return ()
+    slots = [feature_slot(stone, FEATURE_PIECES)]
+    footprint = pattern_footprint(pattern)
+    if footprint[4] == EMPTY_CELL:
+        filled = footprint.count(stone)
+        if filled == 8:
+            slots.append(feature_slot(stone, FEATURE_RINGS))
+        elif filled == 7:
+            slots.append(feature_slot(stone, FEATURE_NEAR_RINGS))
+    return tuple(slots)
+
+
+# the feature slots counting a piece of each pattern, and counting a cell
+# holding each stone. Equal tuples of slots are shared, so that a change
+# between patterns counted alike is seen by identity and skipped
+_SHARED_SLOTS = {}
+PATTERN_FEATURES = tuple(_SHARED_SLOTS.setdefault(slots, slots)
+                         for slots in map(_pattern_features, range(PATTERN_COUNT)))
+del _SHARED_SLOTS
+CELL_FEATURES = (((),) * CELL_COUNT,) + tuple(tuple((feature_slot(stone, FEATURE_STONES),
+                                                      feature_slot(stone, FEATURE_REGIONS + CELL_REGIONS[index]))
+                                                     for index in range(CELL_COUNT))
+                                               for stone in (BLACK_STONE, WHITE_STONE))
+
+
+def _invalid_centers(ring_center):
+    """
+    returns the cells within two rows and two columns
+    of the given cell, other than the cell itself
+    """
+    ring_row, ring_column = divmod(ring_center, BOARD_SIZE)
+    invalid_centers = set()
+    for row in range(max(ring_row - 2, 0), min(ring_row + 3, BOARD_SIZE)):
+        for column in range(max(ring_column - 2, 0), min(ring_column + 3, BOARD_SIZE)):
+            if row != ring_row or column != ring_column:
+                invalid_centers.add(row * BOARD_SIZE + column)
+    return frozenset(invalid_centers)
+
+
+# the centers of the pieces overlapping the 3 x 3 square around each cell
+_INVALID_CENTERS = tuple(_invalid_centers(index) for index in range(CELL_COUNT))
+# the ring centers whose rings can be made or broken by writing the
+# footprint of the piece centered on each cell
+_RING_REGIONS = tuple(frozenset(ring for ring in _INVALID_CENTERS[index] | {index} if is_interior(ring))
+                      if is_interior(index) else frozenset()
+                      for index in range(CELL_COUNT))
+
+
+def get_invalid_centers(ring_center):
+    """
+    given the index of the center of a ring, returns
+    the indices of the centers which cannot be the
+    coordinate of a piece without breaking the ring
+    """
+    return _INVALID_CENTERS[ring_center]
+
+
+def find_rings(board, stone):
+    """returns the set of centers of every ring of the given stone on the board"""
+    return {center for center in INTERIOR_CENTERS if board.is_ring(center, stone)}
+
+
+def rings_after_slide(board, start, stop, footprint, rings, stone):
+    """
+    returns the set of centers of the rings of the given
+    stone once the piece holding footprint has slid from
+    the start center to the stop center, without changing
+    the board. Only the rings around the two footprints
+    can change, so only those are examined
+    """
+    changes = dict.fromkeys(FOOTPRINTS[start], EMPTY_CELL)
+    changes.update(zip(FOOTPRINTS[stop], footprint))
+    region = _RING_REGIONS[start] | _RING_REGIONS[stop]
+    after = set(rings - region)
+    for center in region:
+        if changes.get(center, board.get(center)) != EMPTY_CELL:
+            continue
+        for index in FOOTPRINTS[center]:
+            if index != center and changes.get(index, board.get(index)) != stone:
+                break
+        else:
+            after.add(center)
+    return after
+
+
+class BaseBoard:
+    """
+    Behaviour shared by every board engine. An engine
+    stores the contents of the 400 cells, indexed by
+    row * 20 + column with row and column counted from
+    zero at a1, and moves pieces through the lift,
+    frontier_occupied and place methods
+    """
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        creates a board from twenty strings of
+        twenty characters, listed from row 20
+        down to row 1, with 'b' and 'w' marking
+        stones and any other character an empty cell
+        """
+        board = cls()
+        for number, row in zip(range(BOARD_SIZE - 1, -1, -1), rows):
+            for column, char in enumerate(row):
+                if char in 'bw':
+                    board.set(number * BOARD_SIZE + column, STONE_CHARS.index(char))
+        return board
+
+    def frontier(self, center, direction):
+        """
+        returns the contents of the cells the piece
+        centered on the given cell would newly cover
+        by taking one step in the given direction
+        """
+        return [self.get(center + offset) for offset in FRONTIERS[direction]]
+
+    def view(self):
+        """
+        returns a view of the board keyed by letter
+        and by row number string, as in board['l']['3']
+        """
+        return BoardView(self)
+
+    def to_dict(self):
+        """
+        returns a new dictionary of dictionaries
+        holding the display character of every cell
+        """
+        return {letter: dict(column) for letter, column in self.view().items()}
+
+    def _recount(self, index, old, new):
+        """
+        adds a change in the contents of a cell to the
+        pattern numbers of the pieces holding it and to
+        the features counting the cell and those pieces
+        """
+        patterns = self._patterns
+        features = self._features
+        pattern_features = PATTERN_FEATURES
+        change = new - old
+        for center, weight in PATTERN_TARGETS[index]:
+            pattern = patterns[center]
+            patterns[center] = pattern + change * weight
+            before = pattern_features[pattern]
+            after = pattern_features[pattern + change * weight]
+            if before is not after:
+                for slot in before:
+                    features[slot] -= 1
+                for slot in after:
+                    features[slot] += 1
+        for slot in CELL_FEATURES[old][index]:
+            features[slot] -= 1
+        for slot in CELL_FEATURES[new][index]:
+            features[slot] += 1
+
+
+class Board(BaseBoard):
+    """
+    Compact gess board holding the contents of
+    all 400 cells in a flat bytearray
+    """
+    def __init__(self, cells=None):
+        """
+        creates an empty board, or a board
+        holding a copy of the given cells
+        """
+        if cells is None:
+            self._cells = bytearray(CELL_COUNT)
+        else:
+            self._cells = bytearray(cells)
+            if len(self._cells) != CELL_COUNT:
+                raise ValueError('a board has exactly %d cells' % CELL_COUNT)
+        # (index, previous contents) of each cell changed since begin_undo
+        self._journal = None
+        # Zobrist hash of the stones, updated with every cell written
+        self._hash = 0
+        # pattern number of the piece centered on each cell, updated with every cell written
+        self._patterns = [0] * CELL_COUNT
+        # evaluation features, updated with every cell written
+        self._features = [0] * FEATURE_COUNT
+        for index, stone in enumerate(self._cells):
+            if stone:
+                self._hash ^= ZOBRIST_KEYS[stone][index]
+                self._recount(index, EMPTY_CELL, stone)
+
+    def get(self, index):
+        """returns the contents of a cell"""
+        return self._cells[index]
+
+    def set(self, index, value):
+        """sets the contents of a cell"""
+        old = self._cells[index]
+        if old != value:
+            if self._journal is not None:
+                self._journal.append((index, old))
+            self._hash ^= ZOBRIST_KEYS[old][index] ^ ZOBRIST_KEYS[value][index]
+            self._cells[index] = value
+            self._recount(index, old, value)
+
+    def get_hash(self):
+        """returns the Zobrist hash of the stones on the board"""
+        return self._hash
+
+    def begin_undo(self):
+        """starts recording the cells written to the board"""
+        self._journal = []
+
+    def end_undo(self):
+        """
+        stops recording, returning the record which
+        undo needs to restore the recorded cells
+        """
+        journal = self._journal
+        self._journal = None
+        return journal
+
+    def undo(self, journal):
+        """restores the cells recorded between begin_undo and end_undo"""
+        cells = self._cells
+        h = self._hash
+        for index, stone in reversed(journal):
+            old = cells[index]
+            h ^= ZOBRIST_KEYS[old][index] ^ ZOBRIST_KEYS[stone][index]
+            cells[index] = stone
+            self._recount(index, old, stone)
+        self._hash = h
+
+    def pattern(self, center):
+        """returns the pattern number of the piece centered on the given cell"""
+        return self._patterns[center]
+
+    def get_features(self):
+        """returns the FEATURE_COUNT evaluation features of the board as a tuple"""
+        return tuple(self._features)
+
+    def footprint(self, center):
+        """
+        returns the contents of the nine cells of
+        the piece centered on the given cell
+        """
+        cells = self._cells
+        return tuple(cells[index] for index in FOOTPRINTS[center])
+
+    def lift(self, center):
+        """
+        returns the stone pattern of the piece centered
+        on the given cell, in the form place expects
+        """
+        return self.footprint(center)
+
+    def frontier_occupied(self, center, direction):
+        """
+        returns True if a step in the given direction
+        would bring the piece centered on the given
+        cell onto any stones
+        """
+        cells = self._cells
+        for index in LEADING_EDGES[center][direction]:
+            if cells[index]:
+                return True
+        return False
+
+    def slide_stop(self, start, direction, distance):
+        """
+        casts a ray of at most the given distance from the
+        start center in the given direction, and returns the
+        center where a slide would stop, with True if it
+        stops there because it lands on stones
+        """
+        cells = self._cells
+        edges = LEADING_EDGES
+        position = start
+        for stop in RAYS[start][direction][:distance]:
+            for index in edges[position][direction]:
+                if cells[index]:
+                    return stop, True
+            position = stop
+        return position, False
+
+    def slide(self, start, stop, pattern):
+        """
+        moves a piece in one write from the start center to
+        the stop center: its old footprint is cleared and
+        its pattern written over whatever lies at the stop.
+        The cells in between are empty, or the slide would
+        have stopped sooner, so they need no writes
+        """
+        cells = self._cells
+        journal = self._journal
+        keys = ZOBRIST_KEYS
+        recount = self._recount
+        h = self._hash
+        stop_cells = FOOTPRINTS[stop]
+        for index in FOOTPRINTS[start]:
+            old = cells[index]
+            if old and index not in stop_cells:
+                if journal is not None:
+                    journal.append((index, old))
+                h ^= keys[old][index]
+                cells[index] = EMPTY_CELL
+                recount(index, old, EMPTY_CELL)
+        for index, stone in zip(stop_cells, pattern):
+            old = cells[index]
+            if old != stone:
+                if journal is not None:
+                    journal.append((index, old))
+                h ^= keys[old][index] ^ keys[stone][index]
+                cells[index] = stone
+                recount(index, old, stone)
+        self._hash = h
+
+    def place(self, center, direction, pattern):
+        """
+        completes one step of a piece by writing its
+        pattern onto the footprint around the given
+        center and clearing the cells it left behind
+        when stepping there in the given direction
+        """
+        cells = self._cells
+        journal = self._journal
+        keys = ZOBRIST_KEYS
+        h = self._hash
+        for offset, stone in zip(FOOTPRINT, pattern):
+            index = center + offset
+            old = cells[index]
+            if old != stone:
+                if journal is not None:
+                    journal.append((index, old))
+                h ^= keys[old][index] ^ keys[stone][index]
+                cells[index] = stone
+                self._recount(index, old, stone)
+        for offset in WAKES[direction]:
+            index = center + offset
+            old = cells[index]
+            if old:
+                if journal is not None:
+                    journal.append((index, old))
+                h ^= keys[old][index]
+                cells[index] = EMPTY_CELL
+                self._recount(index, old, EMPTY_CELL)
+        self._hash = h
+
+    def is_ring(self, center, stone):
+        """
+        returns True if the given cell is the
+        center of a ring of the given stone
+        """
+        cells = self._cells
+        if cells[center] != EMPTY_CELL:
+            return False
+        for index in FOOTPRINTS[center]:
+            if index != center and cells[index] != stone:
+                return False
+        return True
+
+    def count_stones(self, stone):
+        """returns the number of stones of the given color"""
+        return self._cells.count(stone)
+
+    def get_cells(self):
+        """returns a copy of the raw cell contents"""
+        return bytes(self._cells)
+
+    def copy(self):
+        """returns an independent copy of the board"""
+        board = Board.__new__(Board)
+        board._cells = bytearray(self._cells)
+        board._journal = None
+        board._hash = self._hash
+        board._patterns = list(self._patterns)
+        board._features = list(self._features)
+        return board
+
+
+# width of the padded grid used by the bitboard engine
+_PADDED_SIZE = BOARD_SIZE + 2
+# bit of the padded grid holding each cell of the board
+_PADDED_BITS = tuple((index // BOARD_SIZE + 1) * _PADDED_SIZE + index % BOARD_SIZE + 1
+                     for index in range(CELL_COUNT))
+# cell held by each bit of the padded grid, None for the border
+_BIT_CELLS = [None] * _PADDED_SIZE * _PADDED_SIZE
+for _index, _bit in enumerate(_PADDED_BITS):
+    _BIT_CELLS[_bit] = _index
+del _index, _bit
+# bitboard masks are read relative to a 5 x 5 window whose
+# lowest corner lies two rows and two columns from the center
+_WINDOW_ORIGIN = 2 * _PADDED_SIZE + 2
+
+
+def _window_mask(cells):
+    """returns the window mask of the given (column, row) offsets"""
+    mask = 0
+    for c, r in cells:
+        mask |= 1 << (r + 2) * _PADDED_SIZE + c + 2
+    return mask
+
+
+# window bits of the cells of a piece, in display order
+_WINDOW_FOOTPRINT = tuple((r + 2) * _PADDED_SIZE + c + 2 for c, r in _FOOTPRINT_DELTAS.values())
+_FOOTPRINT_MASK = _window_mask(_FOOTPRINT_DELTAS.values())
+_CENTER_MASK = _window_mask([(0, 0)])
+_RING_MASK = _FOOTPRINT_MASK & ~_CENTER_MASK
+_FRONTIER_MASKS = {direction: _window_mask(_step_cells(direction, True)) for direction in DIRECTIONS}
+_WAKE_MASKS = {direction: _window_mask(_step_cells(direction, False)) for direction in DIRECTIONS}
+
+
+class BitBoard(BaseBoard):
+    """
+    Gess board holding the stones of each color as an
+    integer bit mask over a 22 x 22 grid. The board is
+    padded by an empty border, so a shifted mask never
+    wraps from one row into the next
+    """
+    def __init__(self, cells=None):
+        """
+        creates an empty board, or a board
+        holding a copy of the given cells
+        """
+        self._black = 0
+        self._white = 0
+        self._hash = 0
+        # the masks and hash at begin_undo, and the (index, old, new) contents of
+        # each cell changed since, so that only their pieces need counting back
+        self._saved = None
+        self._journal = None
+        # pattern number of the piece centered on each cell, updated with every change of the masks
+        self._patterns = [0] * CELL_COUNT
+        # evaluation features, updated with every change of the masks
+        self._features = [0] * FEATURE_COUNT
+        if cells is not None:
+            if len(cells) != CELL_COUNT:
+                raise ValueError('a board has exactly %d cells' % CELL_COUNT)
+            black = white = 0
+            for index, stone in enumerate(cells):
+                if stone == BLACK_STONE:
+                    black |= 1 << _PADDED_BITS[index]
+                elif stone == WHITE_STONE:
+                    white |= 1 << _PADDED_BITS[index]
+            self._commit(black, white)
+
+    def get(self, index):
+        """returns the contents of a cell"""
+        bit = _PADDED_BITS[index]
+        if self._black >> bit & 1:
+            return BLACK_STONE
+        if self._white >> bit & 1:
+            return WHITE_STONE
+        return EMPTY_CELL
+
+    def set(self, index, value):
+        """sets the contents of a cell"""
+        mask = 1 << _PADDED_BITS[index]
+        black = self._black & ~mask
+        white = self._white & ~mask
+        if value == BLACK_STONE:
+            black |= mask
+        elif value == WHITE_STONE:
+            white |= mask
+        self._commit(black, white)
+
+    def get_hash(self):
+        """returns the Zobrist hash of the stones on the board"""
+        return self._hash
+
+    def footprint(self, center):
+        """
+        returns the contents of the nine cells of
+        the piece centered on the given cell
+        """
+        black, white = self.lift(center)
+        return tuple(BLACK_STONE if black >> bit & 1 else WHITE_STONE if white >> bit & 1 else EMPTY_CELL
+                     for bit in _WINDOW_FOOTPRINT)
+
+    def lift(self, center):
+        """
+        returns the black and white window masks of the
+        piece centered on the given cell, as place expects
+        """
+        shift = _PADDED_BITS[center] - _WINDOW_ORIGIN
+        return self._black >> shift & _FOOTPRINT_MASK, self._white >> shift & _FOOTPRINT_MASK
+
+    def pattern(self, center):
+        """returns the pattern number of the piece centered on the given cell"""
+        return self._patterns[center]
+
+    def get_features(self):
+        """returns the FEATURE_COUNT evaluation features of the board as a tuple"""
+        return tuple(self._features)
+
+    def frontier_occupied(self, center, direction):
+        """
+        returns True if a step in the given direction
+        would bring the piece centered on the given
+        cell onto any stones
+        """
+        shift = _PADDED_BITS[center] - _WINDOW_ORIGIN
+        return (self._black | self._white) >> shift & _FRONTIER_MASKS[direction] != 0
+
+    def place(self, center, direction, pattern):
+        """
+        completes one step of a piece by writing its
+        pattern onto the footprint around the given
+        center and clearing the cells it left behind
+        when stepping there in the given direction
+        """
+        shift = _PADDED_BITS[center] - _WINDOW_ORIGIN
+        keep = ~((_FOOTPRINT_MASK | _WAKE_MASKS[direction]) << shift)
+        self._commit(self._black & keep | pattern[0] << shift, self._white & keep | pattern[1] << shift)
+
+    def slide_stop(self, start, direction, distance):
+        """
+        casts a ray of at most the given distance from the
+        start center in the given direction, and returns the
+        center where a slide would stop, with True if it
+        stops there because it lands on stones
+        """
+        occupied = self._black | self._white
+        frontier = _FRONTIER_MASKS[direction]
+        position = start
+        for stop in RAYS[start][direction][:distance]:
+            if occupied >> _PADDED_BITS[position] - _WINDOW_ORIGIN & frontier:
+                return stop, True
+            position = stop
+        return position, False
+
+    def slide(self, start, stop, pattern):
+        """
+        moves a piece in one write from the start center to
+        the stop center: its old footprint is cleared and
+        its pattern written over whatever lies at the stop
+        """
+        start_shift = _PADDED_BITS[start] - _WINDOW_ORIGIN
+        stop_shift = _PADDED_BITS[stop] - _WINDOW_ORIGIN
+        keep = ~(_FOOTPRINT_MASK << start_shift | _FOOTPRINT_MASK << stop_shift)
+        self._commit(self._black & keep | pattern[0] << stop_shift, self._white & keep | pattern[1] << stop_shift)
+
+    def _commit(self, black, white):
+        """
+        replaces the masks, toggling the hash keys of
+        the cells whose stones changed one bit at a time
+        and adding each change to the pattern numbers
+        and features, as Board does for a written cell
+        """
+        old_black, old_white = self._black, self._white
+        keys = ZOBRIST_KEYS
+        recount = self._recount
+        journal = self._journal
+        h = self._hash
+        changed = black ^ old_black | white ^ old_white
+        while changed:
+            low = changed & -changed
+            bit = low.bit_length() - 1
+            index = _BIT_CELLS[bit]
+            old = old_black >> bit & 1 | (old_white >> bit & 1) << 1
+            new = black >> bit & 1 | (white >> bit & 1) << 1
+            h ^= keys[old][index] ^ keys[new][index]
+            recount(index, old, new)
+            if journal is not None:
+                journal.append((index, old, new))
+            changed ^= low
+        self._black = black
+        self._white = white
+        self._hash = h
+
+    def is_ring(self, center, stone):
+        """
+        returns True if the given cell is the
+        center of a ring of the given stone
+        """
+        black, white = self.lift(center)
+        if stone == BLACK_STONE:
+            return black == _RING_MASK and not white & _CENTER_MASK
+        return white == _RING_MASK and not black & _CENTER_MASK
+
+    def begin_undo(self):
+        """starts recording the changes made to the board"""
+        self._saved = (self._black, self._white, self._hash)
+        self._journal = []
+
+    def end_undo(self):
+        """
+        stops recording, returning the record which undo
+        needs: the masks and hash from before the changes,
+        which are immutable integers, and the cells changed
+        """
+        record = self._saved + (self._journal,)
+        self._saved = None
+        self._journal = None
+        return record
+
+    def undo(self, record):
+        """
+        restores the board to how it was at begin_undo,
+        counting each changed cell back out of the pattern
+        numbers and features, latest first
+        """
+        black, white, h, journal = record
+        recount = self._recount
+        for index, old, new in reversed(journal):
+            recount(index, new, old)
+        self._black, self._white, self._hash = black, white, h
+
+    def count_stones(self, stone):
+        """returns the number of stones of the given color"""
+        return (self._black if stone == BLACK_STONE else self._white).bit_count()
+
+    def get_cells(self):
+        """returns the contents of every cell as bytes"""
+        return bytes(self.get(index) for index in range(CELL_COUNT))
+
+    def copy(self):
+        """returns an independent copy of the board"""
+        board = BitBoard()
+        board._black = self._black
+        board._white = self._white
+        board._hash = self._hash
+        board._patterns = list(self._patterns)
+        board._features = list(self._features)
+        return board
+
+
+# board engines a game may be played on, by name
+BOARD_ENGINES = {'array': Board, 'bitboard': BitBoard}
+
+
+class BoardView(Mapping):
+    """
+    Read and write view of a board which converts
+    on demand to the letter and number string keys
+    used by the original dictionary board
+    """
+    def __init__(self, board):
+        """initializes the view of the given board"""
+        self._board = board
+
+    def __getitem__(self, letter):
+        """returns the view of one column of the board"""
+        if len(letter) != 1 or letter not in LETTERS:
+            raise KeyError(letter)
+        return ColumnView(self._board, LETTERS.index(letter))
+
+    def __iter__(self):
+        """iterates over the column letters"""
+        return iter(LETTERS)
+
+    def __len__(self):
+        """returns the number of columns"""
+        return BOARD_SIZE
+
+
+class ColumnView(MutableMapping):
+    """
+    Read and write view of one column of a board,
+    keyed by row number strings from '1' to '20'
+    """
+    def __init__(self, board, column):
+        """initializes the view of the given column"""
+        self._board = board
+        self._column = column
+
+    def _index(self, number):
+        """converts a row number string into a cell index"""
+        if not isinstance(number, str) or not number.isdigit() or not 1 <= int(number) <= BOARD_SIZE:
+            raise KeyError(number)
+        return (int(number) - 1) * BOARD_SIZE + self._column
+
+    def __getitem__(self, number):
+        """returns the display character of a cell"""
+        return STONE_CHARS[self._board.get(self._index(number))]
+
+    def __setitem__(self, number, char):
+        """places a stone, given by its display character, on a cell"""
+        self._board.set(self._index(number), STONE_CHARS.index(char))
+
+    def __delitem__(self, number):
+        """cells cannot be removed from the board"""
+        raise TypeError('cells cannot be removed from the board')
+
+    def __iter__(self):
+        """iterates over the row number strings"""
+        return (str(number) for number in range(1, BOARD_SIZE + 1))
+
+    def __len__(self):
+        """returns the number of rows"""
+        return BOARD_SIZE
+
 
 class InvalidPieceException(Exception):
     """
@@ -19,87 +974,222 @@ class InvalidMoveException(Exception):
     pass
 
 
+class GessListener:
+    """
+    Base class of the listeners which may be registered
+    with a GessGame to follow its moves step by step.
+    Every method does nothing, so a listener overrides
+    only the events it cares about. A game without
+    listeners builds no events at all
+    """
+    def on_step(self, piece, iteration, direction):
+        """called after a piece has taken one step of its slide"""
+        pass
+
+    def on_frontier_hit(self, piece, direction, frontier):
+        """
+        called when the next step of a piece will land on
+        stones, with the contents of the cells it will cover
+        """
+        pass
+
+    def on_ring_status(self, ring, intact):
+        """called when the opponent's ring at the given address is checked"""
+        pass
+
+    def on_move_rejected(self, initial, final, reason):
+        """called when a proposed move is refused, with a short reason"""
+        pass
+
+    def on_move_committed(self, game, initial, final):
+        """called once a move has been made and the turn has passed"""
+        pass
+
+    def on_game_over(self, game):
+        """called when a move or a resignation finishes the game"""
+        pass
+
+
+class ConsoleListener(GessListener):
+    """
+    Listener printing the verbose trace which the
+    game used to print on every step of every move
+    """
+    def on_step(self, piece, iteration, direction):
+        """prints the piece and its address after each step"""
+        print('--')
+        print('step', iteration, direction, 'to', piece.get_center())
+        piece.display_piece()
+        piece.display_address()
+
+    def on_frontier_hit(self, piece, direction, frontier):
+        """prints the stones the piece is about to land on"""
+        print('field of view:', [STONE_CHARS[stone] for stone in frontier])
+        print('pieces recognized, board will be updated, but players will switch and movement ended')
+
+    def on_ring_status(self, ring, intact):
+        """prints whether the ring is intact"""
+        print('ring intact' if intact else 'ring broken', ring)
+
+    def on_move_rejected(self, initial, final, reason):
+        """prints why the move was refused"""
+        print('proposed move invalid:', initial, final, reason)
+
+    def on_move_committed(self, game, initial, final):
+        """prints the board and the state of the game"""
+        game.print_board()
+        print('CURRENT PLAYER:', game.get_current_player())
+        print('GAME STATE:', game.get_game_state())
+
+    def on_game_over(self, game):
+        """prints the final board and the result"""
+        game.print_board()
+        print('GAME STATE:', game.get_game_state())
+
+
+class LoggingListener(GessListener):
+    """
+    Listener sending every event to a logger from the
+    logging module, steps at DEBUG and moves at INFO
+    """
+    def __init__(self, logger=None):
+        """initializes the listener with a logger, by default the 'Gess' logger"""
+        self._logger = logger if logger is not None else logging.getLogger('Gess')
+
+    def on_step(self, piece, iteration, direction):
+        """logs each step at DEBUG"""
+        self._logger.debug('step %d %s to %s', iteration, direction, piece.get_center())
+
+    def on_frontier_hit(self, piece, direction, frontier):
+        """logs the stones about to be captured at DEBUG"""
+        self._logger.debug('frontier hit %s from %s: %s', direction, piece.get_center(),
+                           ''.join(STONE_CHARS[stone] for stone in frontier))
+
+    def on_ring_status(self, ring, intact):
+        """logs the ring check at DEBUG"""
+        self._logger.debug('ring %s %s', ring, 'intact' if intact else 'broken')
+
+    def on_move_rejected(self, initial, final, reason):
+        """logs the refused move at INFO"""
+        self._logger.info('move %s %s rejected: %s', initial, final, reason)
+
+    def on_move_committed(self, game, initial, final):
+        """logs the move at INFO"""
+        self._logger.info('move %s %s made, %s to move', initial, final, game.get_current_player())
+
+    def on_game_over(self, game):
+        """logs the result at INFO"""
+        self._logger.info('game over: %s', game.get_game_state())
+
+
+class MoveStats:
+    """
+    Opt-in counters and timers of the phases of a move,
+    which a GessGame fills in while stats are enabled.
+    Times are in nanoseconds from time.perf_counter_ns.
+    A game without stats does no timing at all
+    """
+    # the phases of a move which are counted and timed
+    PHASES = ('piece', 'frontier_scan', 'board_write', 'ring_check', 'game_state')
+
+    def __init__(self):
+        """initializes empty stats"""
+        self.reset()
+
+    def reset(self):
+        """sets every counter and timer back to zero"""
+        self._counts = dict.fromkeys(self.PHASES, 0)
+        self._times = dict.fromkeys(self.PHASES, 0)
+        # slide lengths of each direction, as {direction: {steps: moves}}
+        self._slides = {}
+        self._rejections = {}
+        self._moves = 0
+
+    def add_time(self, phase, nanoseconds, count=1):
+        """adds count occurrences of a phase taking the given time"""
+        self._counts[phase] += count
+        self._times[phase] += nanoseconds
+
+    def add_slide(self, direction, steps):
+        """records a slide of the given number of steps in a direction"""
+        lengths = self._slides.setdefault(direction, {})
+        lengths[steps] = lengths.get(steps, 0) + 1
+        self._moves += 1
+
+    def add_rejection(self, reason):
+        """records a move refused for the given reason"""
+        self._rejections[reason] = self._rejections.get(reason, 0) + 1
+
+    def snapshot(self):
+        """
+        returns a copy of the stats as a dictionary of
+        plain values: the moves made, the count, total
+        and mean nanoseconds of each phase, the slide
+        lengths of each direction and the rejections
+        counted by reason
+        """
+        return {'moves': self._moves,
+                'phases': {phase: {'count': self._counts[phase],
+                                   'total_ns': self._times[phase],
+                                   'mean_ns': self._times[phase] / self._counts[phase] if self._counts[phase] else 0.0}
+                           for phase in self.PHASES},
+                'slides': {direction: dict(lengths) for direction, lengths in self._slides.items()},
+                'rejections': dict(self._rejections)}
+
+
 class Piece:
     """
     Piece class which will be called by the
     make_move method of the Board class
     """
-    def __init__(self, center, board_state, player, opponent, own_rings, opponent_rings):
+    def __init__(self, center, board_state, player, opponent, own_rings, opponent_rings, listeners=(),
+                 stats=None):
         """
         initializes a piece class when called by
         Board class's make_move method
         takes as params the coordinate of the
         proposed piece's center, the complete
-        board state, and the player making the move
+        board state, the player making the move,
+        and optionally the listeners to tell of its steps
+        and the MoveStats to time its phases in
         """
+        self._listeners = listeners
+        self._stats = stats
+        self._piece = None
         try:
             self._board_state = board_state
             self._player = player
             self._opponent = opponent
-            # check if piece is centered on valid column, initialize center letter if so
-            if center[0] == 'a' or center[0] == 't':
+            # check if piece is centered on a valid cell, one whose piece lies entirely on the board
+            try:
+                self._address = address_to_index(center)
+            except ValueError:
                 raise InvalidPieceException
-            else:
-                self._center_letter = center[0]
-            # check if piece is centered on valid row, initialize center number if so
-            if center[1:] == '1' or center[1:] == '20':
+            if not is_interior(self._address):
                 raise InvalidPieceException
-            else:
-                self._center_number = center[1:]
-            # dictionary matching letters with an index for piece construction purposes
-            self._letter_index = {'a': 0, 'b': 1, 'c': 2, 'd': 3, 'e': 4,
-                                  'f': 5, 'g': 6, 'h': 7, 'i': 8, 'j': 9,
-                                  'k': 10, 'l': 11, 'm': 12, 'n': 13, 'o': 14,
-                                  'p': 15, 'q': 16, 'r': 17, 's': 18, 't': 19}
-            # set the letters for eastern and western columns of the piece
-            self._west_letter = list(self._letter_index.items())[self._letter_index[self._center_letter] - 1][0]
-            self._east_letter = list(self._letter_index.items())[self._letter_index[self._center_letter] + 1][0]
-            # set then numbers of the northern and southern rows of the the piece
-            self._north_number = str(int(self._center_number) + 1)
-            self._south_number = str(int(self._center_number) - 1)
-            # create piece map dictionary
-            self._piece = {'NW': self._board_state[self._west_letter][self._north_number],
-                           'N': self._board_state[self._center_letter][self._north_number],
-                           'NE': self._board_state[self._east_letter][self._north_number],
-                           'W': self._board_state[self._west_letter][self._center_number],
-                           'C': self._board_state[self._center_letter][self._center_number],
-                           'E': self._board_state[self._east_letter][self._center_number],
-                           'SW': self._board_state[self._west_letter][self._south_number],
-                           'S': self._board_state[self._center_letter][self._south_number],
-                           'SE': self._board_state[self._east_letter][self._south_number]}
-            # create piece address dictionary
-            self._address = {'NW': self._west_letter + self._north_number,
-                             'N': self._center_letter + self._north_number,
-                             'NE': self._east_letter + self._north_number,
-                             'W': self._west_letter + self._center_number,
-                             'C': self._center_letter + self._center_number,
-                             'E': self._east_letter + self._center_number,
-                             'SW': self._west_letter + self._south_number,
-                             'S': self._center_letter + self._south_number,
-                             'SE': self._east_letter + self._south_number}
-            # invalidate the piece if it contains black and white stones, otherwise create valid moves
-            if 'w' in self._piece.values() and 'b' in self._piece.values():
-                raise InvalidPieceException
-            else:
-                self._valid_moves = list(set([i[0] for i in self._piece.items() if i[1] != ' ']))
-                if 'C' in self._valid_moves:
-                    self._valid_moves = {i: 17 for i in self._piece}
-                else:
-                    self._valid_moves = {i: 3 for i in self._valid_moves}
-            # if piece belongs to current player, initialize center
-            if self._player[0].lower() not in list(set(self._piece.values())):
+            # look up the piece's stone pattern, which gives its valid moves
+            pattern = board_state.pattern(self._address)
+            self._valid_moves = PATTERN_MOVES[pattern]
+            # invalidate the piece unless it holds stones of the current player and no others
+            if PATTERN_STONES[pattern] != PLAYER_STONES[self._player]:
                 raise InvalidPieceException
             else:
+                # create piece map, the contents of the piece's nine cells in display order
+                self._piece = board_state.footprint(self._address)
                 self._center = center
+                self._origin = self._address
                 self._opponent_rings = opponent_rings
                 self._own_rings = own_rings
+                self._rings_after = None
+                # a player with a single ring may not move a piece overlapping it
                 if len(own_rings) == 1:
-                    self._invalid_centers = list(self.get_invalid_centers(self._own_rings[0]).values())
+                    self._invalid_centers = get_invalid_centers(next(iter(own_rings)))
                 else:
-                    self.invalid_centers = None
-                if self._center in self._invalid_centers:
+                    self._invalid_centers = frozenset()
+                if self._address in self._invalid_centers:
                     raise InvalidPieceException
                 else:
+                    self._pattern = board_state.lift(self._address)
                     self._valid_piece = True
         except InvalidPieceException:
             self._valid_piece = False
@@ -108,103 +1198,72 @@ class Piece:
         """returns the validity of the piece"""
         return self._valid_piece
 
+    def get_center(self):
+        """returns the address of the piece's present center"""
+        return index_to_address(self._address)
+
     def get_own_rings(self):
-        """returns the rings of the current player"""
+        """returns the set of ring centers of the current player"""
         return self._own_rings
 
     def get_opponent_rings(self):
-        """returns opponent rings"""
+        """returns the set of ring centers of the opponent"""
         return self._opponent_rings
 
     def get_invalid_centers(self, ring_center):
         """
         given the center coordinate of a ring,
-        return a list of invalid centers which
-        cannot be the cordinate of a piece
+        return the indices of the invalid centers
+        which cannot be the cordinate of a piece
         without breaking the ring
         """
-        ring_center_letter = ring_center[0]
-        ring_center_number = ring_center[1:]
-        far_west_letter = list(self._letter_index.items())[self._letter_index[ring_center_letter] - 2][0]
-        far_east_letter = list(self._letter_index.items())[self._letter_index[ring_center_letter] + 2][0]
-        far_north_number = str(int(ring_center_number) + 2)
-        far_south_number = str(int(ring_center_number) - 2)
-        near_west_letter = list(self._letter_index.items())[self._letter_index[ring_center_letter] - 1][0]
-        near_east_letter = list(self._letter_index.items())[self._letter_index[ring_center_letter] + 1][0]
-        near_north_number = str(int(ring_center_number) + 1)
-        near_south_number = str(int(ring_center_number) - 1)
-        invalid_centers = {'n11': far_west_letter + far_north_number,
-                           'n21': near_west_letter + far_north_number,
-                           'n31': ring_center_letter + far_north_number,
-                           'n41': near_east_letter + far_north_number,
-                           'n51': far_east_letter + far_north_number,
-                           'w11': far_west_letter + near_north_number,
-                           'w21': far_west_letter + ring_center_number,
-                           'w31': far_west_letter + near_south_number,
-                           'e11': far_east_letter + near_north_number,
-                           'e21': far_east_letter + ring_center_number,
-                           'e31': far_east_letter + near_south_number,
-                           's11': far_west_letter + far_south_number,
-                           's21': near_west_letter + far_south_number,
-                           's31': ring_center_letter + far_south_number,
-                           's41': near_east_letter + far_south_number,
-                           's51': far_east_letter + far_south_number,
-                           'n22': near_west_letter + near_north_number,
-                           'n32': ring_center_letter + near_north_number,
-                           'n42': near_east_letter + near_north_number,
-                           'w22': near_west_letter + ring_center_number,
-                           'e22': near_east_letter + ring_center_number,
-                           's22': near_west_letter + near_south_number,
-                           's32': ring_center_letter + near_south_number,
-                           's42': near_east_letter + near_south_number}
-        return invalid_centers
-
-    def update_rings(self):
-        """
-        Method which updates the location of
-        a ring if it is the moving piece. It
-        returns True if the ring remains intact
-        and False if the opponents ring is broken
-        """
-        if self._center in self._own_rings:
-            self._own_rings[0] = self._address['C']
-            self._center = self._own_rings[0]
-        ring_center_letter = self.get_opponent_rings()[0][0]
-        ring_center_number = self.get_opponent_rings()[0][1:]
-        west_letter = list(self._letter_index.items())[self._letter_index[ring_center_letter] - 1][0]
-        east_letter = list(self._letter_index.items())[self._letter_index[ring_center_letter] + 1][0]
-        north_number = str(int(ring_center_number) + 1)
-        south_number = str(int(ring_center_number) - 1)
-        supposed_loc = {'NW': self._board_state[west_letter][north_number],
-                        'N': self._board_state[ring_center_letter][north_number],
-                        'NE': self._board_state[east_letter][north_number],
-                        'W': self._board_state[west_letter][ring_center_number],
-                        'C': self._board_state[ring_center_letter][ring_center_number],
-                        'E': self._board_state[east_letter][ring_center_number],
-                        'SW': self._board_state[west_letter][south_number],
-                        'S': self._board_state[ring_center_letter][south_number],
-                        'SE': self._board_state[east_letter][south_number]}
-        ring_template = {'NW': self._opponent[0].lower(),
-                         'N': self._opponent[0].lower(),
-                         'NE': self._opponent[0].lower(),
-                         'W': self._opponent[0].lower(),
-                         'C': ' ',
-                         'E': self._opponent[0].lower(),
-                         'SW': self._opponent[0].lower(),
-                         'S': self._opponent[0].lower(),
-                         'SE': self._opponent[0].lower()}
-        intact = True
-        for i in supposed_loc.keys():
-            if supposed_loc[i] == ring_template[i]:
-                continue
-            else:
-                intact = False
-        if intact is False:
-            print('ring broken', ring_center_letter + ring_center_number)
-            return False
-        else:
-            print('ring intact', ring_center_letter + ring_center_number)
-            return True
+        return get_invalid_centers(address_to_index(ring_center))
+
+    def get_stop(self, direction, distance):
+        """
+        returns the center at which a slide of the given
+        distance in the given direction would stop, which
+        is after the first step landing on stones
+        """
+        return self._board_state.slide_stop(self._origin, direction, distance)[0]
+
+    def get_rings_after(self, stop):
+        """
+        returns the sets of ring centers of the player and
+        of the opponent once the piece has slid to the stop
+        center, without changing the board
+        """
+        return (rings_after_slide(self._board_state, self._origin, stop, self._piece,
+                                  self._own_rings, PLAYER_STONES[self._player]),
+                rings_after_slide(self._board_state, self._origin, stop, self._piece,
+                                  self._opponent_rings, PLAYER_STONES[self._opponent]))
+
+    def update_rings(self, rings_after=None):
+        """
+        Method which brings the ring sets of both
+        players up to date once the piece has moved,
+        examining only the rings around the cells
+        the move wrote, or sets them to the given
+        pair from get_rings_after. It returns True if
+        the opponent still has a ring and False if
+        their last ring is broken
+        """
+        if rings_after is None:
+            rings_after = self._rings_after
+        if rings_after is not None:
+            own_after, opponent_after = rings_after
+            for ring in sorted(self._opponent_rings - opponent_after):
+                for listener in self._listeners:
+                    listener.on_ring_status(index_to_address(ring), False)
+            self._own_rings.clear()
+            self._own_rings.update(own_after)
+            self._opponent_rings.clear()
+            self._opponent_rings.update(opponent_after)
+            self._rings_after = None
+        for listener in self._listeners:
+            for ring in sorted(self._opponent_rings):
+                listener.on_ring_status(index_to_address(ring), True)
+        return len(self._opponent_rings) > 0
 
     def get_valid_moves(self):
         """
@@ -225,18 +1284,20 @@ class Piece:
     def display_piece(self):
         """Displays the piece specified"""
         if self._piece is not None:
-            print(self._piece['NW'], self._piece['N'], self._piece['NE'])
-            print(self._piece['W'], self._piece['C'], self._piece['E'])
-            print(self._piece['SW'], self._piece['S'], self._piece['SE'])
+            chars = [STONE_CHARS[stone] for stone in self._piece]
+            print(chars[0], chars[1], chars[2])
+            print(chars[3], chars[4], chars[5])
+            print(chars[6], chars[7], chars[8])
         else:
             print('Not a piece')
 
     def display_address(self):
         """Displays the address of the piece"""
         if self._address is not None:
-            print(self._address['NW'], self._address['N'], self._address['NE'])
-            print(self._address['W'], self._address['C'], self._address['E'])
-            print(self._address['SW'], self._address['S'], self._address['SE'])
+            addresses = [index_to_address(self._address + offset) for offset in FOOTPRINT]
+            print(addresses[0], addresses[1], addresses[2])
+            print(addresses[3], addresses[4], addresses[5])
+            print(addresses[6], addresses[7], addresses[8])
         else:
             print('Not a piece')
 
@@ -246,41 +1307,9 @@ class Piece:
         as it moves across the board.
         Does not change the piece itself
         """
-        if direction == 'N':
-            self._center_number = str(int(self._center_number) + 1)
-        elif direction == 'NE':
-            self._center_number = str(int(self._center_number) + 1)
-            self._center_letter = list(self._letter_index.items())[self._letter_index[self._center_letter] + 1][0]
-        elif direction == 'E':
-            self._center_letter = list(self._letter_index.items())[self._letter_index[self._center_letter] + 1][0]
-        elif direction == 'SE':
-            self._center_number = str(int(self._center_number) - 1)
-            self._center_letter = list(self._letter_index.items())[self._letter_index[self._center_letter] + 1][0]
-        elif direction == 'S':
-            self._center_number = str(int(self._center_number) - 1)
-        elif direction == 'SW':
-            self._center_number = str(int(self._center_number) - 1)
-            self._center_letter = list(self._letter_index.items())[self._letter_index[self._center_letter] - 1][0]
-        elif direction == 'W':
-            self._center_letter = list(self._letter_index.items())[self._letter_index[self._center_letter] - 1][0]
-        elif direction == 'NW':
-            self._center_number = str(int(self._center_number) + 1)
-            self._center_letter = list(self._letter_index.items())[self._letter_index[self._center_letter] - 1][0]
-        else:
-            print('Not a direction')
-        self._west_letter = list(self._letter_index.items())[self._letter_index[self._center_letter] - 1][0]
-        self._east_letter = list(self._letter_index.items())[self._letter_index[self._center_letter] + 1][0]
-        self._north_number = str(int(self._center_number) + 1)
-        self._south_number = str(int(self._center_number) - 1)
-        self._address = {'NW': self._west_letter + self._north_number,
-                         'N': self._center_letter + self._north_number,
-                         'NE': self._east_letter + self._north_number,
-                         'W': self._west_letter + self._center_number,
-                         'C': self._center_letter + self._center_number,
-                         'E': self._east_letter + self._center_number,
-                         'SW': self._west_letter + self._south_number,
-                         'S': self._center_letter + self._south_number,
-                         'SE': self._east_letter + self._south_number}
+        if direction not in DIRECTIONS:
+            raise ValueError('not a direction: %r' % (direction,))
+        self._address += DIRECTIONS[direction]
 
     def update_board_state(self, direction):
         """
@@ -289,66 +1318,10 @@ class Piece:
         the new location of the piece, and by
         removing and trailing pieces in its wake
         """
-        # place piece layout down on its new footprint
-        self._board_state[self._address['NW'][0]][self._address['NW'][1:]] = self._piece['NW']
-        self._board_state[self._address['N'][0]][self._address['N'][1:]] = self._piece['N']
-        self._board_state[self._address['NE'][0]][self._address['NE'][1:]] = self._piece['NE']
-        self._board_state[self._address['W'][0]][self._address['W'][1:]] = self._piece['W']
-        self._board_state[self._address['C'][0]][self._address['C'][1:]] = self._piece['C']
-        self._board_state[self._address['E'][0]][self._address['E'][1:]] = self._piece['E']
-        self._board_state[self._address['SW'][0]][self._address['SW'][1:]] = self._piece['SW']
-        self._board_state[self._address['S'][0]][self._address['S'][1:]] = self._piece['S']
-        self._board_state[self._address['SE'][0]][self._address['SE'][1:]] = self._piece['SE']
-
-        # collect garbage in the wake of piece's move
-        north_front = str(int(self._north_number) + 1)
-        south_front = str(int(self._south_number) - 1)
-        east_front = list(self._letter_index.items())[self._letter_index[self._east_letter] + 1][0]
-        west_front = list(self._letter_index.items())[self._letter_index[self._west_letter] - 1][0]
-        if direction == 'N':
-            self._board_state[self._address['SW'][0]][south_front] = ' '
-            self._board_state[self._address['S'][0]][south_front] = ' '
-            self._board_state[self._address['SE'][0]][south_front] = ' '
-        elif direction == 'NE':
-            self._board_state[west_front][self._address['W'][1:]] = ' '
-            self._board_state[west_front][self._address['SW'][1:]] = ' '
-            self._board_state[west_front][south_front] = ' '
-            self._board_state[self._address['SW'][0]][south_front] = ' '
-            self._board_state[self._address['S'][0]][south_front] = ' '
-        elif direction == 'E':
-            self._board_state[west_front][self._address['NW'][1:]] = ' '
-            self._board_state[west_front][self._address['W'][1:]] = ' '
-            self._board_state[west_front][self._address['SW'][1:]] = ' '
-
-        elif direction == 'SE':
-            self._board_state[west_front][self._address['W'][1:]] = ' '
-            self._board_state[west_front][self._address['NW'][1:]] = ' '
-            self._board_state[west_front][north_front] = ' '
-            self._board_state[self._address['NW'][0]][north_front] = ' '
-            self._board_state[self._address['N'][0]][north_front] = ' '
-
-        elif direction == 'S':
-            self._board_state[self._address['NW'][0]][north_front] = ' '
-            self._board_state[self._address['N'][0]][north_front] = ' '
-            self._board_state[self._address['NE'][0]][north_front] = ' '
-        elif direction == 'SW':
-            self._board_state[east_front][self._address['E'][1:]] = ' '
-            self._board_state[east_front][self._address['NE'][1:]] = ' '
-            self._board_state[east_front][north_front] = ' '
-            self._board_state[self._address['NE'][0]][north_front] = ' '
-            self._board_state[self._address['N'][0]][north_front] = ' '
-        elif direction == 'W':
-            self._board_state[east_front][self._address['NE'][1:]] = ' '
-            self._board_state[east_front][self._address['E'][1:]] = ' '
-            self._board_state[east_front][self._address['SE'][1:]] = ' '
-        elif direction == 'NW':
-            self._board_state[east_front][self._address['E'][1:]] = ' '
-            self._board_state[east_front][self._address['SE'][1:]] = ' '
-            self._board_state[east_front][south_front] = ' '
-            self._board_state[self._address['SE'][0]][south_front] = ' '
-            self._board_state[self._address['S'][0]][south_front] = ' '
-        else:
-            print('Not a direction')
+        if direction not in WAKES:
+            raise ValueError('not a direction: %r' % (direction,))
+        # place piece layout down on its new footprint and collect garbage in its wake
+        self._board_state.place(self._address, direction, self._pattern)
 
     def frontier_scan(self, direction):
         """
@@ -357,304 +1330,620 @@ class Piece:
         False if there are no stones, and
         None if the direction is invalid
         """
-        collection_status = None
-        north_front = str(int(self._north_number) + 1)
-        south_front = str(int(self._south_number) - 1)
-        east_front = list(self._letter_index.items())[self._letter_index[self._east_letter] + 1][0]
-        west_front = list(self._letter_index.items())[self._letter_index[self._west_letter] - 1][0]
-        if direction == 'N':
-            frontier = [self._board_state[self._west_letter][north_front],
-                        self._board_state[self._center_letter][north_front],
-                        self._board_state[self._east_letter][north_front]]
-        elif direction == 'NE':
-            frontier = [self._board_state[self._center_letter][north_front],
-                        self._board_state[self._east_letter][north_front],
-                        self._board_state[east_front][north_front],
-                        self._board_state[east_front][self._north_number],
-                        self._board_state[east_front][self._center_number]]
-        elif direction == 'E':
-            frontier = [self._board_state[east_front][self._north_number],
-                        self._board_state[east_front][self._center_number],
-                        self._board_state[east_front][self._south_number]]
-
-        elif direction == 'SE':
-            frontier = [self._board_state[self._center_letter][south_front],
-                        self._board_state[self._east_letter][south_front],
-                        self._board_state[east_front][south_front],
-                        self._board_state[east_front][self._south_number],
-                        self._board_state[east_front][self._center_number]]
-        elif direction == 'S':
-            frontier = [self._board_state[self._west_letter][south_front],
-                        self._board_state[self._center_letter][south_front],
-                        self._board_state[self._east_letter][south_front]]
-        elif direction == 'SW':
-            frontier = [self._board_state[self._center_letter][south_front],
-                        self._board_state[self._west_letter][south_front],
-                        self._board_state[west_front][south_front],
-                        self._board_state[west_front][self._south_number],
-                        self._board_state[west_front][self._center_number]]
-        elif direction == 'W':
-            frontier = [self._board_state[west_front][self._north_number],
-                        self._board_state[west_front][self._center_number],
-                        self._board_state[west_front][self._south_number]]
-        elif direction == 'NW':
-            frontier = [self._board_state[self._center_letter][north_front],
-                        self._board_state[self._west_letter][north_front],
-                        self._board_state[west_front][north_front],
-                        self._board_state[west_front][self._north_number],
-                        self._board_state[west_front][self._center_number]]
+        if direction not in FRONTIERS:
+            return None
+        if self._stats is not None:
+            start = time.perf_counter_ns()
+            occupied = self._board_state.frontier_occupied(self._address, direction)
+            self._stats.add_time('frontier_scan', time.perf_counter_ns() - start)
         else:
-            print('Not a direction')
-            return collection_status
+            occupied = self._board_state.frontier_occupied(self._address, direction)
+        if occupied and self._listeners:
+            frontier = self._board_state.frontier(self._address, direction)
+            for listener in self._listeners:
+                listener.on_frontier_hit(self, direction, frontier)
+        return occupied
 
-        if 'b' in frontier or 'w' in frontier:
-            print("field of view:", frontier)
-            collection_status = True
-        else:
-            print("field of view:", frontier)
-            collection_status = False
-        return collection_status
+    def _reject(self, location, reason):
+        """tells the listeners why the move to location is refused"""
+        if self._stats is not None:
+            self._stats.add_rejection(reason)
+        for listener in self._listeners:
+            listener.on_move_rejected(self._center, location, reason)
 
     def move_piece(self, location):
         """validates and coordinates the movement of the piece"""
         success = True
+        try:
+            target = address_to_index(location)
+        except ValueError:
+            self._reject(location, 'not a board address')
+            success = False
+            return success
+        # signs of differences will determine the direction of the move
+        row_diff = self._address // BOARD_SIZE - target // BOARD_SIZE
+        col_diff = self._address % BOARD_SIZE - target % BOARD_SIZE
         # if final and initial position are identical
-        if location[0] == self._center_letter and location[1:] == self._center_number:
-            print('No move made: Final == Initial')
+        if target == self._address:
+            self._reject(location, 'final is the same as initial')
             success = False
             return success
         # if not identical, but in same column, i.e. same letter
-        elif location[0] == self._center_letter:
-            # sign of difference will determine whether move is north or south
-            diff = int(self._center_number) - int(location[1:])
+        elif col_diff == 0:
             # if move is north, and north is valid for this piece
-            if diff < 0 and 'N' in self._valid_moves.keys():
-                if abs(diff) > self._valid_moves['N']:
-                    print('proposed move invalid')
-                    success = False
-                    return success
-                desired_distance = min(abs(diff), self._valid_moves['N'])
+            if row_diff < 0 and 'N' in self._valid_moves:
                 direction = 'N'
             # if move is south, and south is valid for this piece
-            elif diff > 0 and 'S' in self._valid_moves.keys():
-                if abs(diff) > self._valid_moves['S']:
-                    print('proposed move invalid')
-                    success = False
-                    return success
-                desired_distance = min(abs(diff), self._valid_moves['S'])
+            elif row_diff > 0 and 'S' in self._valid_moves:
                 direction = 'S'
             # if the proposed direction is not a valid move
             else:
+                self._reject(location, 'direction not allowed')
                 raise InvalidMoveException
         # if not identical, but in same row, i.e. same number
-        elif location[1:] == self._center_number:
-            # sign of difference will determine whether move is east or west
-            diff = self._letter_index[self._center_letter] - self._letter_index[location[0]]
+        elif row_diff == 0:
             # if move is east, and east is valid for this piece
-            if diff < 0 and 'E' in self._valid_moves.keys():
-                if abs(diff) > self._valid_moves['E']:
-                    print('proposed move invalid')
-                    success = False
-                    return success
-                desired_distance = min(abs(diff), self._valid_moves['E'])
+            if col_diff < 0 and 'E' in self._valid_moves:
                 direction = 'E'
             # if move is west, and west is valid for this piece
-            elif diff > 0 and 'W' in self._valid_moves.keys():
-                if abs(diff) > self._valid_moves['W']:
-                    print('proposed move invalid')
-                    success = False
-                    return success
-                desired_distance = min(abs(diff), self._valid_moves['W'])
+            elif col_diff > 0 and 'W' in self._valid_moves:
                 direction = 'W'
             # if the proposed direction is not a valid move
             else:
+                self._reject(location, 'direction not allowed')
                 raise InvalidMoveException
         # if neither columns nor rows matches, we look for diagonal matches
         else:
-            # signs of differences will determine whether move is nw,ne,se,sw
-            row_diff = int(self._center_number) - int(location[1:])
-            col_diff = self._letter_index[self._center_letter] - self._letter_index[location[0]]
             # if magnitudes of differences are unequal, the move is not diagonal
             if abs(col_diff) != abs(row_diff):
+                self._reject(location, 'not a straight line')
                 raise InvalidMoveException
-            # magnitudes are equal, now check which direction
-            else:
-                # if northeast, and northeast is valid
-                if (row_diff < 0 > col_diff) and 'NE' in self._valid_moves:
-                    if abs(row_diff) > self._valid_moves['NE']:
-                        print('proposed move invalid')
-                        success = False
-                        return success
-                    desired_distance = min(abs(row_diff), self._valid_moves['NE'])
-                    direction = 'NE'
-                # if northwest, and northwest is valid
-                elif (row_diff < 0 < col_diff) and 'NW' in self._valid_moves:
-                    if abs(row_diff) > self._valid_moves['NW']:
-                        print('proposed move invalid')
-                        success = False
-                        return success
-                    desired_distance = min(abs(row_diff), self._valid_moves['NW'])
-                    direction = 'NW'
-                # if southeast, and southeast is valid
-                elif row_diff > 0 > col_diff and 'SE' in self._valid_moves:
-                    if abs(row_diff) > self._valid_moves['SE']:
-                        print('proposed move invalid')
-                        success = False
-                        return success
-                    desired_distance = min(abs(row_diff), self._valid_moves['SE'])
-                    direction = 'SE'
-                # if southwest, and southwest is valid
-                elif row_diff > 0 < col_diff and 'SW' in self._valid_moves:
-                    if abs(row_diff) > self._valid_moves['SW']:
-                        print('proposed move invalid')
-                        success = False
-                        return success
-                    desired_distance = min(abs(row_diff), self._valid_moves['SW'])
-                    direction = 'SW'
-                # if invalid direction or move is entered
-                else:
-                    print('something went wrong')
-                    success = False
-                    return success
-        for i in range(desired_distance):
-            print("--")
-            print("beginning of iteration", i)
-            if self.frontier_scan(direction):
-                self.update_address(direction)
-                self.update_rings()
-                self.update_board_state(direction)
-                print('pieces recognized, board will be updated, but players will switch and movement ended')
-                break
+            # if northeast, and northeast is valid
+            elif (row_diff < 0 > col_diff) and 'NE' in self._valid_moves:
+                direction = 'NE'
+            # if northwest, and northwest is valid
+            elif (row_diff < 0 < col_diff) and 'NW' in self._valid_moves:
+                direction = 'NW'
+            # if southeast, and southeast is valid
+            elif row_diff > 0 > col_diff and 'SE' in self._valid_moves:
+                direction = 'SE'
+            # if southwest, and southwest is valid
+            elif row_diff > 0 < col_diff and 'SW' in self._valid_moves:
+                direction = 'SW'
+            # if invalid direction or move is entered
             else:
-                self.update_address(direction)
-                self.update_rings()
-                self.update_board_state(direction)
-                print('no pieces recognized')
-                self.display_piece()
-                self.display_address()
-            print("end of iteration", i)
+                self._reject(location, 'direction not allowed')
+                success = False
+                return success
+        desired_distance = max(abs(row_diff), abs(col_diff))
+        # the piece may not travel further than its valid moves allow
+        if desired_distance > self._valid_moves[direction]:
+            self._reject(location, 'too far')
+            success = False
+            return success
+        # find where the slide stops with a single ray cast, as stones in the way end the movement
+        board = self._board_state
+        stats = self._stats
+        if stats is not None:
+            start = time.perf_counter_ns()
+        stop, captures = board.slide_stop(self._origin, direction, desired_distance)
+        if stats is not None:
+            steps = max(abs(stop // BOARD_SIZE - self._origin // BOARD_SIZE),
+                        abs(stop % BOARD_SIZE - self._origin % BOARD_SIZE))
+            now = time.perf_counter_ns()
+            stats.add_time('frontier_scan', now - start, steps)
+            start = now
+        # a final square on the edge rows is allowed as long as stones stop the
+        # slide short of it; a slide which runs out of board would leave it
+        if not captures and stop != target:
+            self._reject(location, 'off the board')
+            success = False
+            return success
+        # a player may not be left without a ring by their own move
+        rings_after = self.get_rings_after(stop)
+        if stats is not None:
+            now = time.perf_counter_ns()
+            stats.add_time('ring_check', now - start)
+        if not rings_after[0]:
+            self._reject(location, 'breaks own last ring')
+            success = False
+            return success
+        self._rings_after = rings_after
+        if captures and self._listeners:
+            frontier = board.frontier(stop - DIRECTIONS[direction], direction)
+            for listener in self._listeners:
+                listener.on_frontier_hit(self, direction, frontier)
+        # write the board once, rather than once per step
+        if stats is not None:
+            start = time.perf_counter_ns()
+            board.slide(self._origin, stop, self._pattern)
+            stats.add_time('board_write', time.perf_counter_ns() - start)
+            stats.add_slide(direction, steps)
+        else:
+            board.slide(self._origin, stop, self._pattern)
+        if self._listeners:
+            for i, position in enumerate(RAYS[self._origin][direction][:desired_distance]):
+                self._address = position
+                for listener in self._listeners:
+                    listener.on_step(self, i, direction)
+                if position == stop:
+                    break
+        self._address = stop
         return success
 
 
+def format_position(cells):
+    """
+    returns 400 cells, as from Board.get_cells, as compact
+    text: the rows from row 20 down to row 1, separated by
+    '/', with 'b' and 'w' for stones and a number for each
+    run of empty cells, so the starting position of an
+    empty row is simply '20'. Raises a ValueError for
+    anything but 400 empty, black or white cells
+    """
+    if len(cells) != CELL_COUNT:
+        raise ValueError('a position has exactly %d cells' % CELL_COUNT)
+    if max(cells, default=EMPTY_CELL) > WHITE_STONE or min(cells, default=EMPTY_CELL) < EMPTY_CELL:
+        raise ValueError('cells hold %d, %d or %d' % (EMPTY_CELL, BLACK_STONE, WHITE_STONE))
+    rows = []
+    for row in range(BOARD_SIZE - 1, -1, -1):
+        text, empty = [], 0
+        for stone in cells[row * BOARD_SIZE:(row + 1) * BOARD_SIZE]:
+            if stone:
+                if empty:
+                    text.append(str(empty))
+                    empty = 0
+                text.append(STONE_CHARS[stone])
+            else:
+                empty += 1
+        if empty:
+            text.append(str(empty))
+        rows.append(''.join(text))
+    return '/'.join(rows)
+
+
+def parse_position(text):
+    """
+    returns the 400 cells of a position written as text,
+    either as from format_position or as twenty rows of
+    twenty characters with '.' for an empty cell, rows
+    from row 20 down separated by '/' or line breaks.
+    Raises a ValueError if the text is not a position
+    """
+    rows = text.strip().replace('\n', '/').split('/')
+    if len(rows) != BOARD_SIZE:
+        raise ValueError('a position has exactly %d rows' % BOARD_SIZE)
+    cells = bytearray()
+    for number, row in zip(range(BOARD_SIZE, 0, -1), rows):
+        start = len(cells)
+        run = ''
+        for char in row.strip() + ' ':
+            if char.isdigit():
+                run += char
+                continue
+            if run:
+                cells.extend(bytes(int(run)))
+                run = ''
+            if char in 'bw':
+                cells.append(STONE_CHARS.index(char))
+            elif char == '.':
+                cells.append(EMPTY_CELL)
+            elif char != ' ':
+                raise ValueError('bad character %r in row %d' % (char, number))
+        if len(cells) - start != BOARD_SIZE:
+            raise ValueError('row %d does not hold exactly %d cells' % (number, BOARD_SIZE))
+    # rows are listed from row 20 down, cells are stored from row 1 up
+    return b''.join(bytes(cells[start:start + BOARD_SIZE]) for start in range(CELL_COUNT - BOARD_SIZE, -1, -BOARD_SIZE))
+
+
+# the evaluation features of one player, as counted by the boards: stones,
+# pieces, rings, near rings and a tuple of the stones in each region
+EvalFeatures = namedtuple('EvalFeatures', ['stones', 'pieces', 'rings', 'near_rings', 'regions'])
+# weight of each evaluation feature of a player, the same features of their
+# opponent counting against them. Stones in the four central regions earn
+# their region weight on top of the stone weight
+DEFAULT_WEIGHTS = {'stones': 10, 'pieces': 1, 'rings': 200, 'near_rings': 20,
+                   'regions': tuple(2 if 0 < region // REGIONS_PER_SIDE < REGIONS_PER_SIDE - 1
+                                    and 0 < region % REGIONS_PER_SIDE < REGIONS_PER_SIDE - 1 else 0
+                                    for region in range(REGION_COUNT))}
+
+
+class Evaluator:
+    """
+    Scores positions as the weighted sum of the features
+    which the boards keep up to date as cells are written,
+    so that a score takes the same time however many
+    stones are on the board
+    """
+    def __init__(self, weights=None):
+        """
+        initializes an evaluator with DEFAULT_WEIGHTS, any
+        of which may be replaced by the given dictionary
+        """
+        weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        if len(weights['regions']) != REGION_COUNT:
+            raise ValueError('there are exactly %d region weights' % REGION_COUNT)
+        own = [0] * FEATURES_PER_COLOR
+        own[FEATURE_STONES] = weights['stones']
+        own[FEATURE_PIECES] = weights['pieces']
+        own[FEATURE_RINGS] = weights['rings']
+        own[FEATURE_NEAR_RINGS] = weights['near_rings']
+        own[FEATURE_REGIONS:] = weights['regions']
+        other = [-weight for weight in own]
+        self._vectors = {'BLACK': tuple(own + other), 'WHITE': tuple(other + own)}
+
+    def get_weights(self, player):
+        """returns the weight of each of the FEATURE_COUNT board features for the given player"""
+        return self._vectors[player]
+
+    def evaluate(self, board, player):
+        """returns the score of the stones on the given board for the given player"""
+        return sum(map(mul, board.get_features(), self._vectors[player]))
+
+
+# evaluator used by GessGame.evaluate when none is given
+DEFAULT_EVALUATOR = Evaluator()
+
+# the verdict of GessGame.validate_move: one of the codes below, and the
+# address where the slide would stop, or None if it would not be made
+MoveCheck = namedtuple('MoveCheck', ['code', 'stop'])
+# codes of validate_move. A BLOCKED move is made, but lands on stones
+# and stops short of its final square
+MOVE_CODES = ('VALID', 'BLOCKED', 'GAME_OVER', 'BAD_ADDRESS', 'BAD_CENTER', 'MIXED_COLORS', 'NOT_YOUR_STONES',
+              'BREAKS_OWN_RING', 'SAME_SQUARE', 'NOT_STRAIGHT', 'DIRECTION_NOT_ALLOWED', 'TOO_FAR', 'OFF_BOARD')
+# the codes of the moves make_move makes
+ACCEPTED_CODES = frozenset(('VALID', 'BLOCKED'))
+# direction of each (column, row) step
+_STEP_DIRECTIONS = {delta: direction for direction, delta in _FOOTPRINT_DELTAS.items() if direction != 'C'}
+
+
+class Position:
+    """
+    Immutable snapshot of a game: the board as a tuple
+    of twenty rows of twenty cells, row 1 first, the
+    player to move, the game state and the rings of
+    each player. Being immutable, a position is forked
+    by simply sharing it, and the positions following
+    it share every row and ring set a move leaves alone
+    """
+    __slots__ = ('_rows', '_current_player', '_game_state', '_rings', '_hash')
+
+    def __init__(self, rows, current_player, game_state, rings, board_hash):
+        """
+        initializes a position from its rows as bytes, the
+        player to move, the game state, a dictionary of the
+        frozen sets of ring centers of each player, and the
+        Zobrist hash of the stones
+        """
+        self._rows = rows
+        self._current_player = current_player
+        self._game_state = game_state
+        self._rings = rings
+        self._hash = board_hash
+
+    def get(self, index):
+        """returns the contents of a cell"""
+        return self._rows[index // BOARD_SIZE][index % BOARD_SIZE]
+
+    def get_rows(self):
+        """returns the rows of the board, row 1 first, as bytes"""
+        return self._rows
+
+    def get_cells(self):
+        """returns the contents of the 400 cells, as from Board.get_cells"""
+        return b''.join(self._rows)
+
+    def get_current_player(self):
+        """returns the player to move"""
+        return self._current_player
+
+    def get_game_state(self):
+        """returns the game state"""
+        return self._game_state
+
+    def get_rings(self, player):
+        """returns the frozen set of the ring centers of a player"""
+        return self._rings[player]
+
+    def get_ring_addresses(self, player):
+        """returns the addresses of the centers of a player's rings"""
+        return [index_to_address(ring) for ring in sorted(self._rings[player])]
+
+    def get_hash(self):
+        """returns the Zobrist hash of the position, as GessGame.get_hash does"""
+        if self._current_player == 'WHITE':
+            return self._hash ^ ZOBRIST_WHITE_TO_MOVE
+        return self._hash
+
+    def play(self, initial, final, engine='array'):
+        """
+        returns the position following the given move,
+        sharing the rows and ring sets it leaves alone,
+        or None if the move is not valid. The move is made
+        on a scratch game kept by each thread, into which
+        only the rows differing from its last position
+        are written
+        """
+        game = _scratch_game(engine, self)
+        try:
+            if not game.make_move(initial, final):
+                return None
+        except InvalidMoveException:
+            return None
+        return game.snapshot()
+
+    def __eq__(self, other):
+        """returns True if the other position has the same stones, player to move and state"""
+        if not isinstance(other, Position):
+            return NotImplemented
+        return (self._hash == other._hash and self._rows == other._rows
+                and self._current_player == other._current_player and self._game_state == other._game_state)
+
+    def __hash__(self):
+        """returns the Zobrist hash, so positions can key dictionaries"""
+        return self.get_hash()
+
+
+# the game of each engine, per thread, on which Position.play makes its moves
+_scratch = threading.local()
+
+
+def _scratch_game(engine, position):
+    """
+    returns the scratch game of this thread on the given
+    engine, loaded with the position by writing only the
+    cells of the rows which differ from its last position
+    """
+    games = _scratch.__dict__.setdefault('games', {})
+    game = games.get(engine)
+    if game is None:
+        game = games[engine] = GessGame(engine, position)
+        return game
+    board = game._board
+    start = 0
+    for old, new in zip(game._position._rows, position._rows):
+        if old is not new and old != new:
+            for column, (before, after) in enumerate(zip(old, new)):
+                if before != after:
+                    board.set(start + column, after)
+        start += BOARD_SIZE
+    game._current_player = position._current_player
+    game._non_current_player = 'WHITE' if game._current_player == 'BLACK' else 'BLACK'
+    game._rings = {player: set(centers) for player, centers in position._rings.items()}
+    game._game_state = position._game_state
+    game._undo_stack = []
+    game._position = position
+    return game
+
+
+# the board and ring sets of the starting position on each engine, built
+# by the first game made on that engine and only ever copied
+_TEMPLATES = {}
+
+
+def _starting_template(engine):
+    """returns the board and ring sets of the starting position on the given engine"""
+    template = _TEMPLATES.get(engine)
+    if template is None:
+        board = BOARD_ENGINES[engine].from_rows(_STARTING_ROWS)
+        template = _TEMPLATES[engine] = (board, {player: find_rings(board, stone)
+                                                 for player, stone in PLAYER_STONES.items()})
+    return template
+
+
 class GessGame:
     """
     Class allowing users the
     ability to play go virtually.
-    Takes no parameters
+    Optionally takes the name of the board
+    engine to play on, 'array' or 'bitboard',
+    and a Position to start from
     """
-    def __init__(self):
-        self._board = {'a': {'1': ' ', '2': ' ', '3': ' ', '4': ' ', '5': ' ',
-                             '6': ' ', '7': ' ', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': ' ', '15': ' ',
-                             '16': ' ', '17': ' ', '18': ' ', '19': ' ', '20': ' '},
-                       'b': {'1': ' ', '2': ' ', '3': 'b', '4': ' ', '5': ' ',
-                             '6': ' ', '7': ' ', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': ' ', '15': ' ',
-                             '16': ' ', '17': ' ', '18': 'w', '19': ' ', '20': ' '},
-                       'c': {'1': ' ', '2': 'b', '3': 'b', '4': 'b', '5': ' ',
-                             '6': ' ', '7': 'b', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': 'w', '15': ' ',
-                             '16': ' ', '17': 'w', '18': 'w', '19': 'w', '20': ' '},
-                       'd': {'1': ' ', '2': ' ', '3': 'b', '4': ' ', '5': ' ',
-                             '6': ' ', '7': ' ', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': ' ', '15': ' ',
-                             '16': ' ', '17': ' ', '18': 'w', '19': ' ', '20': ' '},
-                       'e': {'1': ' ', '2': 'b', '3': ' ', '4': 'b', '5': ' ',
-                             '6': ' ', '7': ' ', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': ' ', '15': ' ',
-                             '16': ' ', '17': 'w', '18': ' ', '19': 'w', '20': ' '},
-                       'f': {'1': ' ', '2': ' ', '3': 'b', '4': ' ', '5': ' ',
-                             '6': ' ', '7': 'b', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': 'w', '15': ' ',
-                             '16': ' ', '17': ' ', '18': 'w', '19': ' ', '20': ' '},
-                       'g': {'1': ' ', '2': 'b', '3': ' ', '4': 'b', '5': ' ',
-                             '6': ' ', '7': ' ', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': ' ', '15': ' ',
-                             '16': ' ', '17': 'w', '18': ' ', '19': 'w', '20': ' '},
-                       'h': {'1': ' ', '2': 'b', '3': 'b', '4': 'b', '5': ' ',
-                             '6': ' ', '7': ' ', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': ' ', '15': ' ',
-                             '16': ' ', '17': 'w', '18': 'w', '19': 'w', '20': ' '},
-                       'i': {'1': ' ', '2': 'b', '3': 'b', '4': 'b', '5': ' ',
-                             '6': ' ', '7': 'b', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': 'w', '15': ' ',
-                             '16': ' ', '17': 'w', '18': 'w', '19': 'w', '20': ' '},
-                       'j': {'1': ' ', '2': 'b', '3': 'b', '4': 'b', '5': ' ',
-                             '6': ' ', '7': ' ', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': ' ', '15': ' ',
-                             '16': ' ', '17': 'w', '18': 'w', '19': 'w', '20': ' '},
-                       'k': {'1': ' ', '2': 'b', '3': 'b', '4': 'b', '5': ' ',
-                             '6': ' ', '7': ' ', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': ' ', '15': ' ',
-                             '16': ' ', '17': 'w', '18': 'w', '19': 'w', '20': ' '},
-                       'l': {'1': ' ', '2': 'b', '3': ' ', '4': 'b', '5': ' ',
-                             '6': ' ', '7': 'b', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': 'w', '15': ' ',
-                             '16': ' ', '17': 'w', '18': ' ', '19': 'w', '20': ' '},
-                       'm': {'1': ' ', '2': 'b', '3': 'b', '4': 'b', '5': ' ',
-                             '6': ' ', '7': ' ', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': ' ', '15': ' ',
-                             '16': ' ', '17': 'w', '18': 'w', '19': 'w', '20': ' '},
-                       'n': {'1': ' ', '2': 'b', '3': ' ', '4': 'b', '5': ' ',
-                             '6': ' ', '7': ' ', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': ' ', '15': ' ',
-                             '16': ' ', '17': 'w', '18': ' ', '19': 'w', '20': ' '},
-                       'o': {'1': ' ', '2': ' ', '3': 'b', '4': ' ', '5': ' ',
-                             '6': ' ', '7': 'b', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': 'w', '15': ' ',
-                             '16': ' ', '17': ' ', '18': 'w', '19': ' ', '20': ' '},
-                       'p': {'1': ' ', '2': 'b', '3': ' ', '4': 'b', '5': ' ',
-                             '6': ' ', '7': ' ', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': ' ', '15': ' ',
-                             '16': ' ', '17': 'w', '18': ' ', '19': 'w', '20': ' '},
-                       'q': {'1': ' ', '2': ' ', '3': 'b', '4': ' ', '5': ' ',
-                             '6': ' ', '7': ' ', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': ' ', '15': ' ',
-                             '16': ' ', '17': ' ', '18': 'w', '19': ' ', '20': ' '},
-                       'r': {'1': ' ', '2': 'b', '3': 'b', '4': 'b', '5': ' ',
-                             '6': ' ', '7': 'b', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': 'w', '15': ' ',
-                             '16': ' ', '17': 'w', '18': 'w', '19': 'w', '20': ' '},
-                       's': {'1': ' ', '2': ' ', '3': 'b', '4': ' ', '5': ' ',
-                             '6': ' ', '7': ' ', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': ' ', '15': ' ',
-                             '16': ' ', '17': ' ', '18': 'w', '19': ' ', '20': ' '},
-                       't': {'1': ' ', '2': ' ', '3': ' ', '4': ' ', '5': ' ',
-                             '6': ' ', '7': ' ', '8': ' ', '9': ' ', '10': ' ',
-                             '11': ' ', '12': ' ', '13': ' ', '14': ' ', '15': ' ',
-                             '16': ' ', '17': ' ', '18': ' ', '19': ' ', '20': ' '}
-                       }
+    def __init__(self, engine='array', position=None):
+        self._start(engine)
+        if position is not None:
+            self.restore(position)
+            return
+        # the starting position is copied from a template rather than built cell by cell
+        board, rings = _starting_template(engine)
+        self._board = board.copy()
         self._current_player = 'BLACK'
         self._non_current_player = 'WHITE'
-        self._ring_addresses = {'BLACK': ['l3'], 'WHITE': ['l18']}
+        # centers of every ring of each player, kept up to date move by move
+        self._rings = {player: set(centers) for player, centers in rings.items()}
         self._game_state = 'UNFINISHED'
 
+    def _start(self, engine):
+        """initializes everything about a game but its position"""
+        if engine not in BOARD_ENGINES:
+            raise ValueError('unknown board engine: %r' % (engine,))
+        self._engine = engine
+        # records of the moves made by push_move, most recent last
+        self._undo_stack = []
+        # listeners told of every step of every move
+        self._listeners = []
+        # counters and timers of the phases of each move, None while disabled
+        self._stats = None
+        # the position last snapshot or restored, whose rows later snapshots share
+        self._position = None
+
+    @classmethod
+    def new(cls, engine='array'):
+        """
+        returns a game at the starting position on the
+        given engine, the same as GessGame(engine): both
+        copy a template built the first time a game on
+        that engine is made, rather than building a board
+        """
+        return cls(engine)
+
+    @classmethod
+    def from_position(cls, position, side_to_move='BLACK', engine='array'):
+        """
+        returns a game starting from the given position,
+        with the given player to move and every ring found
+        afresh. The position is text, as parse_position
+        reads, or bytes: either the 400 cells of
+        Board.get_cells or the 100 bytes of
+        GessRecord.pack_position. Raises a ValueError
+        if it is none of these
+        """
+        if isinstance(position, str):
+            cells = parse_position(position)
+        elif len(position) == CELL_COUNT:
+            cells = bytes(position)
+            if max(cells, default=0) > WHITE_STONE:
+                raise ValueError('cells hold %d, %d or %d' % (EMPTY_CELL, BLACK_STONE, WHITE_STONE))
+        elif len(position) == CELL_COUNT // 4:
+            # imported here as GessRecord itself imports this module
+            from GessRecord import unpack_position
+            cells = unpack_position(position)
+            if WHITE_STONE + 1 in cells:
+                raise ValueError('packed cells hold %d, %d or %d' % (EMPTY_CELL, BLACK_STONE, WHITE_STONE))
+        else:
+            raise ValueError('a position is text, %d cells or %d packed bytes' % (CELL_COUNT, CELL_COUNT // 4))
+        game = cls.__new__(cls)
+        game._start(engine)
+        game.set_position(cells, side_to_move)
+        return game
+
+    def snapshot(self):
+        """
+        returns the present position as an immutable
+        Position. Rows and ring sets unchanged since the
+        last snapshot or restore are shared with it rather
+        than copied
+        """
+        cells = self._board.get_cells()
+        base = self._position
+        rows = tuple(cells[start:start + BOARD_SIZE] for start in range(0, CELL_COUNT, BOARD_SIZE))
+        rings = {player: frozenset(centers) for player, centers in self._rings.items()}
+        if base is not None:
+            rows = tuple(old if old == new else new for old, new in zip(base._rows, rows))
+            rings = {player: base._rings[player] if base._rings[player] == centers else centers
+                     for player, centers in rings.items()}
+        self._position = Position(rows, self._current_player, self._game_state, rings, self._board.get_hash())
+        return self._position
+
+    def restore(self, position):
+        """
+        replaces the present position with the given
+        Position, which is left unchanged, and forgets
+        the moves push_move could have taken back
+        """
+        self._board = BOARD_ENGINES[self._engine](position.get_cells())
+        self._current_player = position.get_current_player()
+        self._non_current_player = 'WHITE' if self._current_player == 'BLACK' else 'BLACK'
+        self._rings = {player: set(position.get_rings(player)) for player in PLAYER_STONES}
+        self._game_state = position.get_game_state()
+        self._undo_stack = []
+        self._position = position
+
+    def set_position(self, cells, current_player='BLACK'):
+        """
+        replaces the position with the contents of the
+        400 given cells, as from Board.get_cells, and the
+        given player to move, finding every ring afresh.
+        A player left without a ring has lost the game
+        """
+        if current_player not in PLAYER_STONES:
+            raise ValueError('unknown player: %r' % (current_player,))
+        self._board = BOARD_ENGINES[self._engine](cells)
+        self._current_player = current_player
+        self._non_current_player = 'WHITE' if current_player == 'BLACK' else 'BLACK'
+        self._rings = {player: find_rings(self._board, stone) for player, stone in PLAYER_STONES.items()}
+        if not self._rings[self._current_player]:
+            self._game_state = self._non_current_player + '_WON'
+        elif not self._rings[self._non_current_player]:
+            self._game_state = self._current_player + '_WON'
+        else:
+            self._game_state = 'UNFINISHED'
+        self._undo_stack = []
+        self._position = None
+
     def print_board(self):
         """
         prints out the present state of the board,
         which is invaluable when debugging.
         """
-        print(' ', 'a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j',
-              'k', 'l', 'm', 'n', 'o', 'p', 'q', 'r', 's', 't',
-              sep='  ')
-        for number in range(20, 0, -1):
-            if int(number) >= 10:
+        print(' ', *LETTERS, sep='  ')
+        for number in range(BOARD_SIZE, 0, -1):
+            if number >= 10:
                 print(number, end=' ')
             else:
                 print(f' {number}', end=' ')
-            for letter in ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j',
-                           'k', 'l', 'm', 'n', 'o', 'p', 'q', 'r', 's', 't']:
-                if letter != 't':
-                    print(self._board[letter][str(number)], end='  ')
-                else:
-                    print(self._board[letter][str(number)], number, end='\n')
-        print(' ', 'a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k',
-              'l', 'm', 'n', 'o', 'p', 'q', 'r', 's', 't', sep='  ')
+            row = (number - 1) * BOARD_SIZE
+            for column in range(BOARD_SIZE - 1):
+                print(STONE_CHARS[self._board.get(row + column)], end='  ')
+            print(STONE_CHARS[self._board.get(row + BOARD_SIZE - 1)], number, end='\n')
+        print(' ', *LETTERS, sep='  ')
+
+    def add_listener(self, listener):
+        """registers a GessListener to be told of the game's events"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """stops telling a registered listener of the game's events"""
+        self._listeners.remove(listener)
+
+    def enable_stats(self, stats=None):
+        """
+        starts counting and timing the phases of every
+        move, in the given MoveStats or in new ones, and
+        returns the MoveStats in use
+        """
+        self._stats = stats if stats is not None else MoveStats()
+        return self._stats
+
+    def disable_stats(self):
+        """stops counting and timing moves"""
+        self._stats = None
+
+    def get_stats(self):
+        """
+        returns a snapshot of the move stats as from
+        MoveStats.snapshot, or None if they are disabled
+        """
+        return None if self._stats is None else self._stats.snapshot()
 
     def get_board(self):
-        """returns the current state of the gess board"""
+        """
+        returns the current state of the gess board
+        as a view keyed by letter and row number string
+        """
+        return self._board.view()
+
+    def get_board_state(self):
+        """returns the board engine object itself"""
         return self._board
 
+    def get_engine(self):
+        """returns the name of the board engine in use"""
+        return self._engine
+
+    def get_hash(self):
+        """
+        returns the 64 bit Zobrist hash of the position,
+        covering the stones and the player to move
+        """
+        if self._current_player == 'WHITE':
+            return self._board.get_hash() ^ ZOBRIST_WHITE_TO_MOVE
+        return self._board.get_hash()
+
+    def get_ring_addresses(self, player):
+        """returns the addresses of the centers of a player's rings"""
+        return [index_to_address(ring) for ring in sorted(self._rings[player])]
+
+    def lookup_book(self, book):
+        """
+        returns the moves an opening book, such as a
+        GessBook.OpeningBook, holds for the present
+        position, most played first
+        """
+        if self._game_state != 'UNFINISHED':
+            return []
+        return book.lookup(self.get_hash())
+
     def get_current_player(self):
         """returns the player whose turn it is"""
         return self._current_player
@@ -681,8 +1970,8 @@ class GessGame:
             self._game_state = 'WHITE_WON'
         else:
             self._game_state = 'BLACK_WON'
-        print(self._game_state)
-        self.print_board()
+        for listener in self._listeners:
+            listener.on_game_over(self)
 
     def update_game_state(self, status, current_player):
         """updates game state"""
@@ -694,37 +1983,303 @@ class GessGame:
             else:
                 self._game_state = 'BLACK_WON'
 
+    def validate_move(self, initial, final):
+        """
+        returns a MoveCheck telling whether make_move would
+        make the given move, and where the piece would stop,
+        checking the same rules in the same order but without
+        writing to the board, building a piece or raising
+        """
+        if self._game_state != 'UNFINISHED':
+            return MoveCheck('GAME_OVER', None)
+        try:
+            start = address_to_index(initial)
+        except ValueError:
+            return MoveCheck('BAD_ADDRESS', None)
+        if not is_interior(start):
+            return MoveCheck('BAD_CENTER', None)
+        board = self._board
+        pattern = board.pattern(start)
+        stone = PLAYER_STONES[self._current_player]
+        if PATTERN_STONES[pattern] is None:
+            return MoveCheck('MIXED_COLORS', None)
+        if PATTERN_STONES[pattern] != stone:
+            return MoveCheck('NOT_YOUR_STONES', None)
+        own_rings = self._rings[self._current_player]
+        if len(own_rings) == 1 and start in get_invalid_centers(next(iter(own_rings))):
+            return MoveCheck('BREAKS_OWN_RING', None)
+        try:
+            target = address_to_index(final)
+        except ValueError:
+            return MoveCheck('BAD_ADDRESS', None)
+        if target == start:
+            return MoveCheck('SAME_SQUARE', None)
+        row_diff = target // BOARD_SIZE - start // BOARD_SIZE
+        col_diff = target % BOARD_SIZE - start % BOARD_SIZE
+        if row_diff and col_diff and abs(row_diff) != abs(col_diff):
+            return MoveCheck('NOT_STRAIGHT', None)
+        direction = _STEP_DIRECTIONS[(col_diff > 0) - (col_diff < 0), (row_diff > 0) - (row_diff < 0)]
+        valid_moves = PATTERN_MOVES[pattern]
+        if direction not in valid_moves:
+            return MoveCheck('DIRECTION_NOT_ALLOWED', None)
+        distance = max(abs(row_diff), abs(col_diff))
+        if distance > valid_moves[direction]:
+            return MoveCheck('TOO_FAR', None)
+        stop, captures = board.slide_stop(start, direction, distance)
+        if not captures and stop != target:
+            return MoveCheck('OFF_BOARD', None)
+        if not rings_after_slide(board, start, stop, pattern_footprint(pattern), own_rings, stone):
+            return MoveCheck('BREAKS_OWN_RING', None)
+        return MoveCheck('VALID' if stop == target else 'BLOCKED', _ADDRESSES[stop])
+
+    def get_features(self, player):
+        """returns the EvalFeatures of the given player, as kept by the board"""
+        features = self._board.get_features()
+        base = feature_slot(PLAYER_STONES[player], 0)
+        return EvalFeatures(features[base + FEATURE_STONES], features[base + FEATURE_PIECES],
+                            features[base + FEATURE_RINGS], features[base + FEATURE_NEAR_RINGS],
+                            features[base + FEATURE_REGIONS:base + FEATURES_PER_COLOR])
+
+    def evaluate(self, player=None, evaluator=None):
+        """
+        returns the score of the stones on the board for
+        the given player, by default the player to move,
+        from DEFAULT_EVALUATOR or the given Evaluator.
+        Whether the game is over is left to the caller
+        """
+        evaluator = DEFAULT_EVALUATOR if evaluator is None else evaluator
+        return evaluator.evaluate(self._board, player or self._current_player)
+
+    def legal_moves(self):
+        """
+        generator yielding every valid (initial, final)
+        pair of addresses for the current player, without
+        changing the game. A slide stops on the first step
+        which lands on stones, so each direction is only
+        followed up to that square; make_move would treat
+        any further final square the same way
+        """
+        for center, final, _ in self.generate_moves():
+            yield _ADDRESSES[center], _ADDRESSES[final]
+
+    def generate_moves(self):
+        """
+        generator yielding the same moves as legal_moves
+        as (initial index, final index, captures) tuples,
+        where captures is True if the slide ends on stones
+        """
+        if self._game_state != 'UNFINISHED':
+            return
+        board = self._board
+        stone = PLAYER_STONES[self._current_player]
+        own_rings = self._rings[self._current_player]
+        if len(own_rings) == 1:
+            invalid_centers = get_invalid_centers(next(iter(own_rings)))
+        else:
+            invalid_centers = frozenset()
+        # centers of the pieces which overlap one of the player's rings
+        near_own_rings = set()
+        for ring in own_rings:
+            near_own_rings |= _RING_REGIONS[ring]
+        pattern_of = board.pattern
+        for center in INTERIOR_CENTERS:
+            pattern = pattern_of(center)
+            if PATTERN_STONES[pattern] != stone or center in invalid_centers:
+                continue
+            rays = RAYS[center]
+            for direction, limit in PATTERN_DIRECTIONS[pattern]:
+                previous = center
+                for position in rays[direction][:limit]:
+                    blocked = board.frontier_occupied(previous, direction)
+                    previous = position
+                    # moves near the player's own rings must leave them a ring
+                    if ((center in near_own_rings or position in near_own_rings)
+                            and not rings_after_slide(board, center, position, pattern_footprint(pattern),
+                                                      own_rings, stone)):
+                        if blocked:
+                            break
+                        continue
+                    yield center, position, blocked
+                    if blocked:
+                        break
+
     def make_move(self, initial, final):
         """
         Not yet complete method which will update the board, current_player,
         and game state if called with valid initial and final conditions
         :param initial: proposed moving piece center coordinate
         :param final: proposed final location of center coordinate
-        :return: Not sure yet
+        :return: True if the move was made, False otherwise
         """
+        stats = self._stats
         if self.get_game_state() != 'UNFINISHED':
+            if stats is not None:
+                stats.add_rejection('game over')
             return False
+        listeners = tuple(self._listeners)
+        if stats is not None:
+            start = time.perf_counter_ns()
         moving_piece = Piece(initial,
-                             self.get_board(),
+                             self._board,
                              self.get_current_player(),
                              self.get_non_current_player(),
-                             self._ring_addresses[self.get_current_player()],
-                             self._ring_addresses[self.get_non_current_player()])
+                             self._rings[self.get_current_player()],
+                             self._rings[self.get_non_current_player()],
+                             listeners,
+                             stats)
+        if stats is not None:
+            stats.add_time('piece', time.perf_counter_ns() - start)
         if moving_piece.get_validity():
             results = moving_piece.move_piece(final)
             if results:
                 self._board = moving_piece.get_board_state()
-                self.print_board()
-                self.update_game_state(moving_piece.update_rings(), self._current_player)
+                if stats is not None:
+                    start = time.perf_counter_ns()
+                    opponent_has_ring = moving_piece.update_rings()
+                    now = time.perf_counter_ns()
+                    # the ring check of the move was counted when the piece moved
+                    stats.add_time('ring_check', now - start, 0)
+                    self.update_game_state(opponent_has_ring, self._current_player)
+                    stats.add_time('game_state', time.perf_counter_ns() - now)
+                else:
+                    self.update_game_state(moving_piece.update_rings(), self._current_player)
                 if self.get_game_state() == 'UNFINISHED':
                     self.switch_players()
-                    print('CURRENT PLAYER:', self.get_current_player())
-                    print('GAME STATE:', self.get_game_state())
+                    for listener in listeners:
+                        listener.on_move_committed(self, initial, final)
                 else:
-                    print('GAME STATE:', self.get_game_state())
+                    for listener in listeners:
+                        listener.on_game_over(self)
                 move_status = True
             else:
                 move_status = False
         else:
+            if stats is not None:
+                stats.add_rejection('not a valid piece')
+            for listener in listeners:
+                listener.on_move_rejected(initial, final, 'not a valid piece')
             move_status = False
         return move_status
+
+    def push_move(self, initial, final):
+        """
+        makes a move exactly as make_move does, while
+        recording the cells it writes, the ring sets
+        and the turn, so that pop_move can take it back.
+        Moves tried this way, as by a search, are not
+        told to the listeners nor counted in the stats.
+        Returns True if the move was made
+        """
+        saved = (self._current_player, self._non_current_player, self._game_state,
+                 {player: set(rings) for player, rings in self._rings.items()})
+        listeners, stats = self._listeners, self._stats
+        self._listeners, self._stats = [], None
+        self._board.begin_undo()
+        try:
+            moved = self.make_move(initial, final)
+        finally:
+            changes = self._board.end_undo()
+            self._listeners, self._stats = listeners, stats
+        if moved:
+            self._undo_stack.append((changes, saved))
+        return moved
+
+    def pop_move(self):
+        """
+        takes back the most recent move made by push_move.
+        Raises an IndexError if there is no move to take back
+        """
+        if not self._undo_stack:
+            raise IndexError('no move to take back')
+        changes, saved = self._undo_stack.pop()
+        self._board.undo(changes)
+        self._current_player, self._non_current_player, self._game_state, rings = saved
+        for player, centers in rings.items():
+            self._rings[player].clear()
+            self._rings[player].update(centers)
+
+
+# a search result kept by a TranspositionTable
+TableEntry = namedtuple('TableEntry', ['key', 'depth', 'value', 'flag', 'move'])
+
+
+class TranspositionTable:
+    """
+    Fixed capacity table of search results keyed by the
+    Zobrist hash of a position, which search and analysis
+    code can share. Each bucket holds two entries: a depth
+    preferred entry, replaced only by the same position or
+    by a result searched at least as deep, and an always
+    replaced entry taking whatever the first one turns away
+    """
+    # how the value of an entry relates to the true value of its position
+    EXACT = 0
+    LOWER_BOUND = 1
+    UPPER_BOUND = 2
+
+    def __init__(self, capacity=1 << 20):
+        """
+        initializes an empty table holding at
+        most the given number of entries
+        """
+        self._buckets = max(capacity // 2, 1)
+        self._entries = [None] * (self._buckets * 2)
+        self._probes = 0
+        self._hits = 0
+
+    def get_capacity(self):
+        """returns the number of entries the table can hold"""
+        return len(self._entries)
+
+    def probe(self, key):
+        """
+        returns the entry stored for the position with
+        the given hash, or None if there is no such entry
+        """
+        self._probes += 1
+        slot = key % self._buckets * 2
+        entries = self._entries
+        for entry in (entries[slot], entries[slot + 1]):
+            if entry is not None and entry.key == key:
+                self._hits += 1
+                return entry
+        return None
+
+    def store(self, key, depth, value, flag=EXACT, move=None):
+        """
+        stores the result of searching the position with
+        the given hash to the given depth, with the best
+        move found if any
+        """
+        entry = TableEntry(key, depth, value, flag, move)
+        slot = key % self._buckets * 2
+        preferred = self._entries[slot]
+        if preferred is None or preferred.key == key or depth >= preferred.depth:
+            self._entries[slot] = entry
+            # keep the displaced result of another position in the always replaced entry
+            if preferred is not None and preferred.key != key:
+                self._entries[slot + 1] = preferred
+            elif self._entries[slot + 1] is not None and self._entries[slot + 1].key == key:
+                self._entries[slot + 1] = None
+        else:
+            self._entries[slot + 1] = entry
+
+    def clear(self):
+        """removes every entry from the table"""
+        self._entries = [None] * len(self._entries)
+        self._probes = 0
+        self._hits = 0
+
+    def get_stats(self):
+        """
+        returns a dictionary of the number of
+        probes, hits and filled entries
+        """
+        return {'probes': self._probes,
+                'hits': self._hits,
+                'filled': sum(entry is not None for entry in self._entries),
+                'capacity': len(self._entries)}
+
+    def __len__(self):
+        """returns the number of filled entries"""
+        return sum(entry is not None for entry in self._entries)
@@ -0,0 +1,157 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Evaluates many Gess positions at once with vectorized NumPy operations
+
+from collections import namedtuple
+
+import numpy as np
+
+from Gess import (BOARD_SIZE, DEFAULT_EVALUATOR, EMPTY_CELL, BLACK_STONE, WHITE_STONE, FEATURE_COUNT,
+                  FEATURE_NEAR_RINGS, FEATURE_PIECES, FEATURE_REGIONS, FEATURE_RINGS, FEATURE_STONES,
+                  REGION_COUNT, REGION_SIZE, REGIONS_PER_SIDE, GessGame, feature_slot)
+
+# features of a batch of N positions. Arrays indexed by center have the shape
+# (N, 18, 18), entry [n, i, j] describing the piece centered on the cell in row
+# i + 1 and column j + 1 counted from zero at a1, so [n, 0, 0] is the piece on b2:
+#   valid_black, valid_white: the centers of valid pieces of each color under
+#       the rules of Piece: no mixed colors, at least one stone of the color,
+#       and not breaking the single ring of a player with only one
+#   rings_black, rings_white: the centers of each color's rings
+#   stones: (N, 2) black and white stone counts
+#   pieces: (N, 2) numbers of valid black and white pieces
+#   directions: (N, 2) directions summed over the valid pieces of each color,
+#       eight for a piece with a center stone, otherwise one per stone
+BatchFeatures = namedtuple('BatchFeatures', ['valid_black', 'valid_white', 'rings_black', 'rings_white',
+                                             'stones', 'pieces', 'directions'])
+
+# number of cells along each side of the grid of centers
+_CENTERS = BOARD_SIZE - 2
+
+
+def games_to_array(games):
+    """
+    returns an (N, 20, 20) int8 array of the positions of
+    the given games or boards, entry [n, row, column] holding
+    the contents of the cell on that row and column counted
+    from zero at a1, as 0 empty, 1 black or 2 white
+    """
+    boards = [game.get_board_state() if isinstance(game, GessGame) else game for game in games]
+    array = np.empty((len(boards), BOARD_SIZE, BOARD_SIZE), dtype=np.int8)
+    for n, board in enumerate(boards):
+        array[n] = np.frombuffer(board.get_cells(), dtype=np.int8).reshape(BOARD_SIZE, BOARD_SIZE)
+    return array
+
+
+def array_to_games(array, current_player='BLACK', engine='array'):
+    """
+    returns a list of new GessGames, one per position of
+    an (N, 20, 20) array, each with the given player to move
+    """
+    array = _check(array)
+    games = []
+    for position in array:
+        games.append(GessGame.from_position(position.astype(np.uint8).tobytes(), current_player, engine))
+    return games
+
+
+def _check(array):
+    """returns the positions as an int8 array, raising a ValueError if they are malformed"""
+    array = np.asarray(array, dtype=np.int8)
+    if array.ndim != 3 or array.shape[1:] != (BOARD_SIZE, BOARD_SIZE):
+        raise ValueError('positions must have the shape (N, %d, %d)' % (BOARD_SIZE, BOARD_SIZE))
+    if array.size and (array.min() < EMPTY_CELL or array.max() > WHITE_STONE):
+        raise ValueError('cells must be 0, 1 or 2')
+    return array
+
+
+def _window_sum(mask, size):
+    """
+    returns, for every center of the 18 x 18 grid, the sum of
+    mask over the size x size square centered on it. Squares
+    running past the edge of the board count only the cells on it
+    """
+    radius = size // 2
+    padded = np.pad(mask.astype(np.int16), ((0, 0), (radius - 1, radius - 1), (radius - 1, radius - 1)))
+    total = np.zeros((mask.shape[0], _CENTERS, _CENTERS), dtype=np.int16)
+    for dr in range(size):
+        for dc in range(size):
+            total += padded[:, dr:dr + _CENTERS, dc:dc + _CENTERS]
+    return total
+
+
+def evaluate_batch(array):
+    """
+    returns the BatchFeatures of every position of an
+    (N, 20, 20) array of positions, all computed at once
+    """
+    array = _check(array)
+    black = array == BLACK_STONE
+    white = array == WHITE_STONE
+    black_counts = _window_sum(black, 3)
+    white_counts = _window_sum(white, 3)
+    centers = array[:, 1:-1, 1:-1]
+    black_center = centers == BLACK_STONE
+    white_center = centers == WHITE_STONE
+    # a ring is eight stones of one color around an empty center
+    rings_black = (black_counts == 8) & (centers == EMPTY_CELL)
+    rings_white = (white_counts == 8) & (centers == EMPTY_CELL)
+    # a player with a single ring may not move a piece overlapping it, except the ring itself
+    valid = []
+    for own_counts, other_counts, rings in ((black_counts, white_counts, rings_black),
+                                            (white_counts, black_counts, rings_white)):
+        near_ring = _window_sum(np.pad(rings, ((0, 0), (1, 1), (1, 1))), 5) > 0
+        single_ring = rings.sum(axis=(1, 2)) == 1
+        forbidden = near_ring & ~rings & single_ring[:, None, None]
+        valid.append((own_counts > 0) & (other_counts == 0) & ~forbidden)
+    valid_black, valid_white = valid
+    stones = np.stack([black.sum(axis=(1, 2)), white.sum(axis=(1, 2))], axis=1)
+    pieces = np.stack([valid_black.sum(axis=(1, 2)), valid_white.sum(axis=(1, 2))], axis=1)
+    # a piece with a center stone may move in every direction, otherwise only towards its stones
+    black_directions = np.where(black_center, 8, black_counts)
+    white_directions = np.where(white_center, 8, white_counts)
+    directions = np.stack([(black_directions * valid_black).sum(axis=(1, 2)),
+                           (white_directions * valid_white).sum(axis=(1, 2))], axis=1)
+    return BatchFeatures(valid_black, valid_white, rings_black, rings_white, stones, pieces, directions)
+
+
+def board_features_batch(array):
+    """
+    returns an (N, FEATURE_COUNT) array of the evaluation
+    features of every position of an (N, 20, 20) array,
+    laid out as Board.get_features returns them
+    """
+    array = _check(array)
+    features = np.zeros((array.shape[0], FEATURE_COUNT), dtype=np.int64)
+    centers = array[:, 1:-1, 1:-1]
+    masks = {stone: array == stone for stone in (BLACK_STONE, WHITE_STONE)}
+    counts = {stone: _window_sum(mask, 3) for stone, mask in masks.items()}
+    for stone, other in ((BLACK_STONE, WHITE_STONE), (WHITE_STONE, BLACK_STONE)):
+        # pieces hold only this color, and rings and near rings are pieces around an empty center
+        pieces = (counts[stone] > 0) & (counts[other] == 0)
+        hollow = pieces & (centers == EMPTY_CELL)
+        regions = masks[stone].reshape(-1, REGIONS_PER_SIDE, REGION_SIZE, REGIONS_PER_SIDE, REGION_SIZE)
+        features[:, feature_slot(stone, FEATURE_STONES)] = masks[stone].sum(axis=(1, 2))
+        features[:, feature_slot(stone, FEATURE_PIECES)] = pieces.sum(axis=(1, 2))
+        features[:, feature_slot(stone, FEATURE_RINGS)] = (hollow & (counts[stone] == 8)).sum(axis=(1, 2))
+        features[:, feature_slot(stone, FEATURE_NEAR_RINGS)] = (hollow & (counts[stone] == 7)).sum(axis=(1, 2))
+        start = feature_slot(stone, FEATURE_REGIONS)
+        features[:, start:start + REGION_COUNT] = regions.sum(axis=(2, 4)).reshape(len(array), -1)
+    return features
+
+
+def score_batch(array, player='BLACK', evaluator=None):
+    """
+    returns an (N,) array scoring every position for the given
+    player as GessGame.evaluate does, from DEFAULT_EVALUATOR or
+    the given Evaluator. Unlike GessGame.evaluate, a player
+    without a ring has lost, which scores below any other
+    position, and their opponent above any other
+    """
+    evaluator = DEFAULT_EVALUATOR if evaluator is None else evaluator
+    features = board_features_batch(array)
+    score = features @ np.array(evaluator.get_weights(player), dtype=np.int64)
+    rings = features[:, [feature_slot(BLACK_STONE, FEATURE_RINGS), feature_slot(WHITE_STONE, FEATURE_RINGS)]]
+    own, other = (rings[:, 0], rings[:, 1]) if player == 'BLACK' else (rings[:, 1], rings[:, 0])
+    lost = np.iinfo(np.int32).max
+    score = np.where(other == 0, lost, score)
+    return np.where(own == 0, -lost, score)
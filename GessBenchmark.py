@@ -0,0 +1,272 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Repeatable benchmarks of the move engine, saved as JSON and compared against a baseline
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import time
+from collections import namedtuple
+
+from Gess import GessGame, Piece, address_to_index, get_invalid_centers, BOARD_SIZE, DIRECTIONS, INTERIOR_CENTERS
+from GessRecord import GameRecorder, replay
+from GessSelfPlay import play_game, random_policy, game_seed
+
+# the timing of one benchmark: its name, whether it is a 'micro' or 'macro'
+# benchmark, the operations timed in each repeat, and the best and median
+# seconds per operation over the repeats
+BenchmarkResult = namedtuple('BenchmarkResult', ['name', 'kind', 'number', 'best', 'median'])
+# a benchmark which got slower: its name, the baseline and current best
+# seconds per operation, and how many times slower it now is
+Regression = namedtuple('Regression', ['name', 'baseline', 'current', 'ratio'])
+
+# how much slower than the baseline a benchmark may be before it is flagged
+DEFAULT_THRESHOLD = 0.10
+# seed of the games used by the macrobenchmarks
+_SEED = 0x6E55
+
+
+def _time(operation, number, repeat):
+    """
+    returns the seconds per call of operation, called
+    number times in each of repeat timed loops
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        timings.append((time.perf_counter() - start) / number)
+    return timings
+
+
+def _result(name, kind, number, timings):
+    """returns the BenchmarkResult of the given timings"""
+    return BenchmarkResult(name, kind, number, min(timings), statistics.median(timings))
+
+
+def _ring_sets(game):
+    """returns a new set of the ring centers of each player of the game"""
+    return {player: {address_to_index(ring) for ring in game.get_ring_addresses(player)}
+            for player in ('BLACK', 'WHITE')}
+
+
+def _start_piece(game, center='c3'):
+    """returns a piece of the player to move with its own copy of the board and rings"""
+    rings = _ring_sets(game)
+    return Piece(center, game.get_board_state().copy(), game.get_current_player(),
+                 game.get_non_current_player(), rings[game.get_current_player()],
+                 rings[game.get_non_current_player()])
+
+
+def bench_piece_init(engine, number, repeat):
+    """times building a piece on the starting position"""
+    game = GessGame(engine)
+    board = game.get_board_state()
+    rings = _ring_sets(game)
+    own, opponent = rings['BLACK'], rings['WHITE']
+    return _time(lambda: Piece('c3', board, 'BLACK', 'WHITE', own, opponent), number, repeat)
+
+
+def bench_frontier_scan(engine, number, repeat):
+    """times scanning every direction of a piece in turn"""
+    piece = _start_piece(GessGame(engine), 'f3')
+    directions = list(piece.get_valid_moves())
+    return _time(lambda: [piece.frontier_scan(direction) for direction in directions], number, repeat)
+
+
+def bench_update_board_state(engine, number, repeat):
+    """times a piece stepping north and back south, one step per operation"""
+    piece = _start_piece(GessGame(engine), 'c3')
+
+    def step():
+        piece.update_address('N')
+        piece.update_board_state('N')
+        piece.update_address('S')
+        piece.update_board_state('S')
+    return [timing / 2 for timing in _time(step, number, repeat)]
+
+
+def bench_update_rings(engine, number, repeat):
+    """
+    times finding and bringing up to date the ring sets
+    of a move breaking the mover's ring, put back between
+    operations so that every update changes them
+    """
+    piece = _start_piece(GessGame(engine), 'j3')
+    stop = address_to_index('j6')
+    own_rings = set(piece.get_own_rings())
+
+    def update():
+        piece.get_own_rings().update(own_rings)
+        piece.update_rings(piece.get_rings_after(stop))
+    return _time(update, number, repeat)
+
+
+def bench_slide_stop(engine, number, repeat):
+    """times casting the longest ray of every direction of every piece of the player to move"""
+    game = GessGame(engine)
+    board = game.get_board_state()
+    centers = sorted({initial for initial, _, _ in game.generate_moves()})
+    casts = [(center, direction, BOARD_SIZE) for center in centers for direction in DIRECTIONS]
+    return [timing / len(casts)
+            for timing in _time(lambda: [board.slide_stop(*cast) for cast in casts], number, repeat)]
+
+
+def bench_slide(engine, number, repeat):
+    """times a piece sliding three rows north and back south, one slide per operation"""
+    board = GessGame(engine).get_board_state().copy()
+    start, stop = address_to_index('c3'), address_to_index('c6')
+    pattern = board.lift(start)
+
+    def slide():
+        board.slide(start, stop, pattern)
+        board.slide(stop, start, pattern)
+    return [timing / 2 for timing in _time(slide, number, repeat)]
+
+
+def bench_get_invalid_centers(engine, number, repeat):
+    """times looking up the invalid centers of every interior cell"""
+    centers = list(INTERIOR_CENTERS)
+    return [timing / len(centers)
+            for timing in _time(lambda: [get_invalid_centers(center) for center in centers], number, repeat)]
+
+
+def _recorded_games(engine, games, moves):
+    """returns records of seeded random games of at most the given number of moves"""
+    records = []
+    for game_id in range(games):
+        rng = random.Random(game_seed(_SEED, game_id))
+        game = GessGame(engine)
+        recorder = GameRecorder(game)
+        for _ in range(moves):
+            legal = list(game.legal_moves())
+            if not legal or game.get_game_state() != 'UNFINISHED':
+                break
+            recorder.make_move(*rng.choice(legal))
+        records.append(recorder.get_record())
+    return records
+
+
+def bench_replay(engine, number, repeat):
+    """times replaying a recorded game through make_move, per game"""
+    records = _recorded_games(engine, 8, 100)
+    return [timing / len(records)
+            for timing in _time(lambda: [replay(record, engine) for record in records], number, repeat)]
+
+
+def bench_self_play(engine, number, repeat):
+    """times a seeded game of random self-play, per game"""
+    return _time(lambda: play_game(0, game_seed(_SEED, 0), random_policy, random_policy, 60, engine),
+                 number, repeat)
+
+
+# the benchmarks as (name, kind, function, operations per repeat)
+BENCHMARKS = (
+    ('piece_init', 'micro', bench_piece_init, 2000),
+    ('frontier_scan', 'micro', bench_frontier_scan, 2000),
+    ('update_board_state', 'micro', bench_update_board_state, 2000),
+    ('update_rings', 'micro', bench_update_rings, 2000),
+    ('slide_stop', 'micro', bench_slide_stop, 200),
+    ('slide', 'micro', bench_slide, 2000),
+    ('get_invalid_centers', 'micro', bench_get_invalid_centers, 100),
+    ('replay', 'macro', bench_replay, 2),
+    ('self_play', 'macro', bench_self_play, 2),
+)
+
+
+def run_benchmarks(engine='array', repeat=5, scale=1.0, names=None):
+    """
+    runs the benchmarks, or only those named, and returns
+    their BenchmarkResults. scale multiplies the number of
+    operations timed in each repeat
+    """
+    results = []
+    for name, kind, function, number in BENCHMARKS:
+        if names is not None and name not in names:
+            continue
+        number = max(int(number * scale), 1)
+        results.append(_result(name, kind, number, function(engine, number, repeat)))
+    return results
+
+
+def to_json(results, engine='array'):
+    """returns a dictionary of the results and the machine they ran on, ready for json.dump"""
+    return {'engine': engine,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': {result.name: result._asdict() for result in results}}
+
+
+def machine_differences(baseline, current):
+    """
+    returns the names of the fields describing the machine,
+    'python' and 'platform', on which two dictionaries, as
+    from to_json, differ, so that their timings may not be
+    comparable
+    """
+    return [field for field in ('python', 'platform') if baseline.get(field) != current.get(field)]
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    returns a Regression for every benchmark present in
+    both dictionaries, as from to_json, whose best time
+    is more than threshold slower than the baseline's.
+    Raises a ValueError if they timed different engines
+    """
+    if baseline.get('engine') != current.get('engine'):
+        raise ValueError('baseline timed the %s engine, not the %s engine'
+                         % (baseline.get('engine'), current.get('engine')))
+    regressions = []
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            continue
+        before, after = baseline['results'][name]['best'], result['best']
+        if before > 0 and after > before * (1 + threshold):
+            regressions.append(Regression(name, before, after, after / before))
+    return regressions
+
+
+def main():
+    """runs the benchmarks from the command line, optionally saving and comparing them"""
+    parser = argparse.ArgumentParser(description='Benchmark the Gess move engine.')
+    parser.add_argument('--engine', choices=('array', 'bitboard'), default='array', help='board engine')
+    parser.add_argument('--repeat', type=int, default=5, help='timed repeats of each benchmark')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiplier of the operations per repeat')
+    parser.add_argument('--only', nargs='*', default=None, help='names of the benchmarks to run')
+    parser.add_argument('--output', default=None, help='file to save the results to as JSON')
+    parser.add_argument('--compare', default=None, help='JSON results to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='fraction slower than the baseline which counts as a regression')
+    args = parser.parse_args()
+    results = run_benchmarks(args.engine, args.repeat, args.scale, args.only)
+    for result in results:
+        print('%-20s %-5s best %10.2f us  median %10.2f us' % (result.name, result.kind,
+                                                               result.best * 1e6, result.median * 1e6))
+    current = to_json(results, args.engine)
+    if args.output:
+        with open(args.output, 'w') as stream:
+            json.dump(current, stream, indent=2)
+    if args.compare:
+        with open(args.compare) as stream:
+            baseline = json.load(stream)
+        try:
+            regressions = compare(baseline, current, args.threshold)
+        except ValueError as error:
+            print('CANNOT COMPARE:', error)
+            return 2
+        for field in machine_differences(baseline, current):
+            print('WARNING: baseline %s %s differs from %s' % (field, baseline.get(field), current[field]))
+        for regression in regressions:
+            print('REGRESSION %s: %.2f us -> %.2f us (%.2fx)' % (regression.name, regression.baseline * 1e6,
+                                                                 regression.current * 1e6, regression.ratio))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
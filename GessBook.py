@@ -0,0 +1,205 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Opening book of Gess built from recorded games, stored sorted on disk for fast lookup
+
+import argparse
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+
+from Gess import GessGame, InvalidMoveException
+from GessRecord import read_records, replay, center_code, center_address, square_code, square_address
+
+# a move of the book: its (initial, final) addresses and the games in which
+# the player making it went on to win, to draw or leave unfinished, and to lose
+BookMove = namedtuple('BookMove', ['initial', 'final', 'wins', 'draws', 'losses'])
+
+# first bytes of a book file, followed by the format version and entry count
+BOOK_MAGIC = b'GBOK'
+BOOK_VERSION = 1
+_FILE_HEADER = struct.Struct('<4sB3xQ')
+# each entry holds the position hash, the codes of the move's center and
+# final square as in GessRecord, and the wins, draws and losses. Entries are sorted by hash, so
+# the file is its own index
+_ENTRY = struct.Struct('<QHHIII')
+
+
+def build_book(records, max_ply=20, min_games=1):
+    """
+    returns a book as a dictionary from the hash of each
+    position met in the first max_ply moves of the given
+    GameRecords to a dictionary from (initial, final) to
+    [wins, draws, losses] for the player to move, keeping
+    only the moves played in at least min_games games
+    """
+    book = {}
+    for record in records:
+        # the game before its first move, from the record's own start
+        game = replay(record._replace(moves=[]))
+        for initial, final in record.moves[:max_ply]:
+            player = game.get_current_player()
+            key = game.get_hash()
+            # only moves the rules still allow are counted, and a refused move ends the game
+            try:
+                if not game.make_move(initial, final):
+                    break
+            except InvalidMoveException:
+                break
+            if record.result == player + '_WON':
+                outcome = 0
+            elif record.result == 'UNFINISHED':
+                outcome = 1
+            else:
+                outcome = 2
+            stats = book.setdefault(key, {}).setdefault((initial, final), [0, 0, 0])
+            stats[outcome] += 1
+    if min_games > 1:
+        for key in list(book):
+            moves = {move: stats for move, stats in book[key].items() if sum(stats) >= min_games}
+            if moves:
+                book[key] = moves
+            else:
+                del book[key]
+    return book
+
+
+def write_book(path, book):
+    """writes a book, as from build_book, to a file of sorted entries"""
+    entries = sorted((key, center_code(initial), square_code(final), *stats)
+                     for key, moves in book.items() for (initial, final), stats in moves.items())
+    with open(path, 'wb') as stream:
+        stream.write(_FILE_HEADER.pack(BOOK_MAGIC, BOOK_VERSION, len(entries)))
+        for entry in entries:
+            stream.write(_ENTRY.pack(*entry))
+
+
+def _book_move(entry):
+    """returns the BookMove of an unpacked entry"""
+    _, initial, final, wins, draws, losses = entry
+    return BookMove(center_address(initial), square_address(final), wins, draws, losses)
+
+
+def _popularity(move):
+    """returns the key ordering book moves from the most played and most successful"""
+    games = move.wins + move.draws + move.losses
+    return -games, -(move.wins + move.draws / 2) / games, move.initial, move.final
+
+
+class OpeningBook:
+    """
+    Read only opening book file. A book no larger than
+    max_memory bytes, or any book when max_memory is
+    None, is loaded into a dictionary. A larger book is
+    mapped into memory and searched through a sparse
+    index of every so many hashes, sized to fit max_memory
+    """
+    def __init__(self, path, max_memory=None):
+        """opens the book at path, raising a ValueError if it is not a book"""
+        with open(path, 'rb') as stream:
+            header = stream.read(_FILE_HEADER.size)
+            if len(header) != _FILE_HEADER.size:
+                raise ValueError('not an opening book')
+            magic, version, count = _FILE_HEADER.unpack(header)
+            if magic != BOOK_MAGIC or version != BOOK_VERSION:
+                raise ValueError('not an opening book of version %d' % BOOK_VERSION)
+            if os.fstat(stream.fileno()).st_size != _FILE_HEADER.size + count * _ENTRY.size:
+                raise ValueError('opening book is truncated')
+            self._count = count
+            self._entries = None
+            self._map = None
+            if max_memory is None or count * _ENTRY.size <= max_memory:
+                self._entries = {}
+                for entry in _ENTRY.iter_unpack(stream.read()):
+                    self._entries.setdefault(entry[0], []).append(_book_move(entry))
+                for moves in self._entries.values():
+                    moves.sort(key=_popularity)
+            elif count:
+                self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+                # one index key per stride entries, eight bytes each
+                self._stride = max(1, -(-count * 8 // max(max_memory, 8)))
+                self._fences = array('Q', (_ENTRY.unpack_from(self._map, self._offset(number))[0]
+                                           for number in range(0, count, self._stride)))
+
+    def _offset(self, number):
+        """returns the byte offset of an entry"""
+        return _FILE_HEADER.size + number * _ENTRY.size
+
+    def __len__(self):
+        """returns the number of (position, move) entries"""
+        return self._count
+
+    def is_loaded(self):
+        """returns True if the whole book is held in memory"""
+        return self._entries is not None
+
+    def lookup(self, key):
+        """
+        returns the BookMoves of the position with the given
+        hash, as from GessGame.get_hash, most played first,
+        or an empty list if the position is not in the book
+        """
+        if self._entries is not None:
+            return list(self._entries.get(key, ()))
+        if self._map is None:
+            return []
+        # the first entry with this key lies in the block after the last fence below it
+        block = max(bisect_left(self._fences, key) - 1, 0)
+        number = block * self._stride
+        moves = []
+        while number < self._count:
+            entry = _ENTRY.unpack_from(self._map, self._offset(number))
+            if entry[0] > key:
+                break
+            if entry[0] == key:
+                moves.append(_book_move(entry))
+            number += 1
+        moves.sort(key=_popularity)
+        return moves
+
+    def best_move(self, key):
+        """returns the most played (initial, final) move of a position, or None"""
+        moves = self.lookup(key)
+        return (moves[0].initial, moves[0].final) if moves else None
+
+    def close(self):
+        """releases the book"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._entries = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    """builds a book from an archive, or shows the book moves of the start, from the command line"""
+    parser = argparse.ArgumentParser(description='Build or probe a Gess opening book.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='build a book from a game archive')
+    build.add_argument('archive', help='binary archive written by GessRecord.RecordWriter')
+    build.add_argument('book', help='book file to write')
+    build.add_argument('--max-ply', type=int, default=20, help='moves of each game to enter')
+    build.add_argument('--min-games', type=int, default=1, help='games a move needs to be kept')
+    probe = commands.add_parser('probe', help='show the book moves of the starting position')
+    probe.add_argument('book', help='book file to read')
+    args = parser.parse_args()
+    if args.command == 'build':
+        with open(args.archive, 'rb') as stream:
+            book = build_book(read_records(stream), args.max_ply, args.min_games)
+        write_book(args.book, book)
+        print('positions:', len(book), 'moves:', sum(len(moves) for moves in book.values()))
+    else:
+        with OpeningBook(args.book) as book:
+            for move in book.lookup(GessGame().get_hash()):
+                print('%s-%s' % (move.initial, move.final), 'won %d drawn %d lost %d' % move[2:])
+
+
+if __name__ == '__main__':
+    main()
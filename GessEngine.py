@@ -0,0 +1,290 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Computer opponent which searches Gess positions with alpha-beta
+
+import time
+from collections import namedtuple
+
+from Gess import (TranspositionTable,
+                  address_to_index, index_to_address, get_invalid_centers)
+
+# score of a won position, less the number of plies needed to reach it
+WIN_SCORE = 100000
+# scores above this are wins or losses found by the search
+MATE_BOUND = WIN_SCORE - 1000
+# how many plies of ring breaking moves the quiescence search may chain
+QUIESCENCE_DEPTH = 2
+
+# the outcome of a search: the best move as an (initial, final) pair, its
+# score for the player to move, the deepest completed iteration, the nodes
+# searched, the seconds taken, the nodes searched per second, and the
+# principal variation as a list of (initial, final) pairs
+SearchResult = namedtuple('SearchResult', ['move', 'value', 'depth', 'nodes', 'elapsed', 'nps', 'pv'])
+
+
+def _value_to_table(value, ply):
+    """
+    returns a score to store in the table, counting the
+    plies of a win or loss from this node, not the root
+    """
+    if value > MATE_BOUND:
+        return value + ply
+    if value < -MATE_BOUND:
+        return value - ply
+    return value
+
+
+def _value_from_table(value, ply):
+    """
+    returns a score read from the table, counting the
+    plies of a win or loss from the root again
+    """
+    if value > MATE_BOUND:
+        return value - ply
+    if value < -MATE_BOUND:
+        return value + ply
+    return value
+
+
+class _SearchAborted(Exception):
+    """
+    Exception which is raised inside the search
+    when it runs out of time or nodes
+    """
+    pass
+
+
+class GessEngine:
+    """
+    Computer opponent choosing moves for the player to move
+    in a GessGame. Searches with negamax alpha-beta and
+    iterative deepening, trying ring threats and captures
+    first, and extending the leaves with the moves which
+    could break a ring
+    """
+    def __init__(self, game, table=None, book=None, evaluator=None):
+        """
+        initializes an engine playing the given game,
+        optionally sharing a TranspositionTable, playing
+        from an opening book, such as a GessBook.OpeningBook,
+        while it has the position, and scoring positions
+        with an Evaluator other than DEFAULT_EVALUATOR
+        """
+        self._game = game
+        self._table = table if table is not None else TranspositionTable()
+        self._book = book
+        self._evaluator = evaluator
+        self._nodes = 0
+        self._deadline = None
+        self._node_limit = None
+
+    def get_table(self):
+        """returns the transposition table used by the engine"""
+        return self._table
+
+    def book_move(self):
+        """
+        returns the most played legal book move of the
+        present position as an (initial, final) pair,
+        or None if there is no book or no such move
+        """
+        if self._book is None:
+            return None
+        game = self._game
+        for move in game.lookup_book(self._book):
+            # a hash collision could suggest a move which is not legal here
+            if game.push_move(move.initial, move.final):
+                game.pop_move()
+                return move.initial, move.final
+        return None
+
+    def evaluate(self, player):
+        """
+        returns a static score of the position for the
+        given player from the features the board keeps,
+        as GessGame.evaluate gives it
+        """
+        return self._game.evaluate(player, self._evaluator)
+
+    def search(self, max_time=None, max_nodes=None, max_depth=32):
+        """
+        searches the current position, deepening one ply
+        at a time until the wall clock time in seconds,
+        the number of nodes or the depth runs out, and
+        returns a SearchResult for the deepest completed
+        iteration. Returns a result whose move is None
+        if the game is over or there are no moves. A book
+        move is played at once, as a result of depth 0
+        """
+        game = self._game
+        player = game.get_current_player()
+        self._nodes = 0
+        start = time.perf_counter()
+        move = self.book_move()
+        if move is not None:
+            return SearchResult(move, 0, 0, 0, time.perf_counter() - start, 0.0, [move])
+        self._deadline = None if max_time is None else start + max_time
+        self._node_limit = max_nodes
+        best_move, best_value, depth_reached, pv = None, 0, 0, []
+        root_moves = self._ordered_moves(None)
+        if root_moves and game.get_game_state() == 'UNFINISHED':
+            best_move = root_moves[0]
+            for depth in range(1, max_depth + 1):
+                line = []
+                try:
+                    value = self._negamax(depth, -WIN_SCORE - 1, WIN_SCORE + 1, 0, player, line)
+                except _SearchAborted:
+                    break
+                best_move, best_value, depth_reached, pv = line[0] if line else best_move, value, depth, line
+                # a forced win or loss will not change with more depth
+                if abs(value) > MATE_BOUND:
+                    break
+        elapsed = time.perf_counter() - start
+        nps = self._nodes / elapsed if elapsed > 0 else 0.0
+        if best_move is not None:
+            best_move = (index_to_address(best_move[0]), index_to_address(best_move[1]))
+        pv = [(index_to_address(initial), index_to_address(final)) for initial, final in pv]
+        return SearchResult(best_move, best_value, depth_reached, self._nodes, elapsed, nps, pv)
+
+    def _check_budget(self):
+        """raises _SearchAborted once the time or node budget is spent"""
+        if self._node_limit is not None and self._nodes >= self._node_limit:
+            raise _SearchAborted
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise _SearchAborted
+
+    def _ring_threat_centers(self):
+        """
+        returns the centers whose pieces would overlap
+        one of the opponent's rings, so that ending a
+        move there may break it
+        """
+        game = self._game
+        centers = set()
+        for ring in game.get_ring_addresses(game.get_non_current_player()):
+            ring_center = address_to_index(ring)
+            centers |= get_invalid_centers(ring_center)
+            centers.add(ring_center)
+        return centers
+
+    def _ordered_moves(self, first):
+        """
+        returns the moves of the player to move as (initial,
+        final) index pairs: the given move first, then the
+        moves which end on an opponent's ring, then the
+        captures, then the rest
+        """
+        threats = self._ring_threat_centers()
+        head, ring_moves, captures, quiet = [], [], [], []
+        for initial, final, captures_stones in self._game.generate_moves():
+            move = (initial, final)
+            if move == first:
+                head.append(move)
+            elif final in threats:
+                ring_moves.append(move)
+            elif captures_stones:
+                captures.append(move)
+            else:
+                quiet.append(move)
+        return head + ring_moves + captures + quiet
+
+    def _terminal_value(self, player, ply):
+        """
+        returns the score of a finished game for the given
+        player, preferring quicker wins and slower losses
+        """
+        winner = 'BLACK' if self._game.get_game_state() == 'BLACK_WON' else 'WHITE'
+        return WIN_SCORE - ply if winner == player else ply - WIN_SCORE
+
+    def _negamax(self, depth, alpha, beta, ply, player, line):
+        """
+        returns the score of the position for the given
+        player, who is to move, searched to the given
+        depth, and fills line with the principal variation
+        """
+        self._nodes += 1
+        # a node costs about a millisecond, far more than reading the clock
+        self._check_budget()
+        game = self._game
+        if game.get_game_state() != 'UNFINISHED':
+            return self._terminal_value(player, ply)
+        if depth <= 0:
+            return self._quiescence(alpha, beta, ply, player, QUIESCENCE_DEPTH)
+        key = game.get_hash()
+        entry = self._table.probe(key)
+        first = None
+        if entry is not None:
+            first = entry.move
+            if entry.depth >= depth and ply > 0:
+                value = _value_from_table(entry.value, ply)
+                if entry.flag == TranspositionTable.EXACT:
+                    return value
+                if entry.flag == TranspositionTable.LOWER_BOUND and value >= beta:
+                    return value
+                if entry.flag == TranspositionTable.UPPER_BOUND and value <= alpha:
+                    return value
+        moves = self._ordered_moves(first)
+        if not moves:
+            # a player who cannot move has lost
+            return ply - WIN_SCORE
+        opponent = game.get_non_current_player()
+        original_alpha = alpha
+        best_value, best_move = -WIN_SCORE - 1, None
+        for move in moves:
+            if not game.push_move(index_to_address(move[0]), index_to_address(move[1])):
+                continue
+            child_line = []
+            try:
+                value = -self._negamax(depth - 1, -beta, -alpha, ply + 1, opponent, child_line)
+            finally:
+                game.pop_move()
+            if value > best_value:
+                best_value, best_move = value, move
+                if value > alpha:
+                    alpha = value
+                    line[:] = [move] + child_line
+                    if alpha >= beta:
+                        break
+        if best_move is None:
+            return ply - WIN_SCORE
+        if best_value <= original_alpha:
+            flag = TranspositionTable.UPPER_BOUND
+        elif best_value >= beta:
+            flag = TranspositionTable.LOWER_BOUND
+        else:
+            flag = TranspositionTable.EXACT
+        self._table.store(key, depth, _value_to_table(best_value, ply), flag, best_move)
+        return best_value
+
+    def _quiescence(self, alpha, beta, ply, player, depth):
+        """
+        returns the score of a leaf for the given player,
+        who is to move, after trying the moves which may
+        break one of the opponent's rings
+        """
+        self._check_budget()
+        stand_pat = self.evaluate(player)
+        if stand_pat >= beta or depth == 0:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+        game = self._game
+        threats = self._ring_threat_centers()
+        opponent = game.get_non_current_player()
+        for initial, final, _ in game.generate_moves():
+            if final not in threats:
+                continue
+            if not game.push_move(index_to_address(initial), index_to_address(final)):
+                continue
+            self._nodes += 1
+            try:
+                if game.get_game_state() != 'UNFINISHED':
+                    value = WIN_SCORE - ply - 1
+                else:
+                    value = -self._quiescence(-beta, -alpha, ply + 1, opponent, depth - 1)
+            finally:
+                game.pop_move()
+            if value > alpha:
+                alpha = value
+                if alpha >= beta:
+                    break
+        return alpha
@@ -0,0 +1,467 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Computer opponent which searches Gess positions with Monte Carlo tree search
+
+import argparse
+import math
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from Gess import (GessGame, INTERIOR_CENTERS, PATTERN_DIRECTIONS, PATTERN_STONES, PLAYER_STONES, RAYS,
+                  address_to_index, get_invalid_centers, index_to_address)
+
+# weight of exploration against the win rate in the UCT formula
+DEFAULT_EXPLORATION = math.sqrt(2)
+# moves a playout makes before the position is scored instead of played out
+DEFAULT_PLAYOUT_DEPTH = 40
+# playouts searched when no budget is given
+DEFAULT_PLAYOUTS = 1000
+# lead in the score of DEFAULT_EVALUATOR, about twenty stones, which a
+# player must have at the end of a playout to be scored as nearly certain to win
+_SCORE_SCALE = 200
+# random moves a playout tries before generating every move of the position
+_PLAYOUT_TRIES = 16
+# random moves a heuristic playout samples to choose from
+_HEURISTIC_SAMPLES = 4
+# how often, in playouts, the search checks the clock
+_CHECK_INTERVAL = 16
+# number of the parent of a root node
+NO_NODE = -1
+
+# a move of the root: the (initial, final) pair, the playouts through it and
+# the share of them won by the player to move
+RootMove = namedtuple('RootMove', ['move', 'visits', 'win_rate'])
+# the outcome of a search: the most visited move as an (initial, final) pair,
+# its win rate for the player to move, the playouts made, the seconds taken,
+# the playouts per second, and the RootMoves from the most visited
+MCTSResult = namedtuple('MCTSResult', ['move', 'win_rate', 'playouts', 'elapsed', 'pps', 'root_moves'])
+
+
+class NodePool:
+    """
+    Nodes of a search tree, held in parallel lists and
+    addressed by number. Released nodes go on a free
+    list and are handed out again, so a tree kept from
+    move to move reuses the same memory
+    """
+    def __init__(self):
+        """initializes an empty pool"""
+        self.parent = []
+        self.move = []
+        self.key = []
+        self.mover = []
+        self.children = []
+        self.untried = []
+        self.visits = []
+        self.wins = []
+        self._free = []
+
+    def __len__(self):
+        """returns the number of nodes in use"""
+        return len(self.parent) - len(self._free)
+
+    def get_capacity(self):
+        """returns the number of nodes allocated, in use or free"""
+        return len(self.parent)
+
+    def allocate(self, parent, move, key, mover):
+        """
+        returns a fresh node reached from parent by move,
+        an (initial, final) index pair, made by mover and
+        leading to the position with the given hash. Its
+        moves are generated when it is first expanded
+        """
+        if self._free:
+            node = self._free.pop()
+            self.parent[node] = parent
+            self.move[node] = move
+            self.key[node] = key
+            self.mover[node] = mover
+            self.children[node] = []
+            self.untried[node] = None
+            self.visits[node] = 0
+            self.wins[node] = 0.0
+            return node
+        self.parent.append(parent)
+        self.move.append(move)
+        self.key.append(key)
+        self.mover.append(mover)
+        self.children.append([])
+        self.untried.append(None)
+        self.visits.append(0)
+        self.wins.append(0.0)
+        return len(self.parent) - 1
+
+    def release(self, node):
+        """returns a node and all of its descendants to the free list"""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            stack.extend(self.children[node])
+            self.children[node] = None
+            self.untried[node] = None
+            self._free.append(node)
+
+    def detach(self, node):
+        """makes a node a root, releasing the rest of the tree it was part of"""
+        parent = self.parent[node]
+        if parent == NO_NODE:
+            return
+        self.children[parent].remove(node)
+        while self.parent[parent] != NO_NODE:
+            parent = self.parent[parent]
+        self.release(parent)
+        self.parent[node] = NO_NODE
+
+
+def _opponent(player):
+    """returns the other player"""
+    return 'WHITE' if player == 'BLACK' else 'BLACK'
+
+
+def _score(game):
+    """
+    returns the chance black wins an unfinished playout,
+    judged from the score of the position for black
+    """
+    return 0.5 + 0.5 * math.tanh(game.evaluate('BLACK') / _SCORE_SCALE)
+
+
+class MCTS:
+    """
+    Computer opponent choosing moves for the player to move
+    in a GessGame by Monte Carlo tree search: it descends
+    the tree by UCT, adds one node per playout, and plays
+    out with random or lightly guided moves. The tree is
+    kept between searches, and a later search from a
+    position already in it carries on from that node
+    """
+    def __init__(self, game, exploration=DEFAULT_EXPLORATION, playout='random',
+                 playout_depth=DEFAULT_PLAYOUT_DEPTH, seed=None, pool=None):
+        """
+        initializes a search of the given game, playing out
+        with 'random' or 'heuristic' moves, the latter
+        preferring moves toward the opponent's rings and
+        captures. A NodePool may be shared between searches
+        """
+        if playout not in ('random', 'heuristic'):
+            raise ValueError('unknown playout policy: %s' % playout)
+        self._game = game
+        self._exploration = exploration
+        self._heuristic = playout == 'heuristic'
+        self._playout_depth = playout_depth
+        self._rng = random.Random(seed)
+        self._pool = pool if pool is not None else NodePool()
+        self._root = NO_NODE
+
+    def get_pool(self):
+        """returns the node pool of the tree"""
+        return self._pool
+
+    def _find_root(self):
+        """
+        makes the node of the present position the root,
+        keeping its subtree if it is the root or one or
+        two moves below it, and starting afresh otherwise
+        """
+        pool = self._pool
+        game = self._game
+        key = game.get_hash()
+        root = self._root
+        if root != NO_NODE:
+            if pool.key[root] == key:
+                return root
+            for child in pool.children[root]:
+                for node in [child] + pool.children[child]:
+                    if pool.key[node] == key:
+                        pool.detach(node)
+                        self._root = node
+                        return node
+            pool.release(root)
+        self._root = pool.allocate(NO_NODE, None, key, game.get_non_current_player())
+        return self._root
+
+    def search(self, max_time=None, max_playouts=None):
+        """
+        searches the present position until the wall clock
+        time in seconds or the number of playouts runs out,
+        or for DEFAULT_PLAYOUTS playouts if neither is given,
+        and returns an MCTSResult. Returns a result whose
+        move is None if the game is over or there are no moves
+        """
+        if max_time is None and max_playouts is None:
+            max_playouts = DEFAULT_PLAYOUTS
+        start = time.perf_counter()
+        deadline = None if max_time is None else start + max_time
+        root = self._find_root()
+        playouts = 0
+        if self._game.get_game_state() == 'UNFINISHED':
+            while max_playouts is None or playouts < max_playouts:
+                if deadline is not None and playouts % _CHECK_INTERVAL == 0 and time.perf_counter() >= deadline:
+                    break
+                self._iterate(root)
+                playouts += 1
+                if not self._pool.children[root] and not self._pool.untried[root]:
+                    # the player to move has no moves
+                    break
+        elapsed = time.perf_counter() - start
+        return _result(self.root_stats(), playouts, elapsed)
+
+    def root_stats(self):
+        """
+        returns a dictionary from each searched move of the
+        root, as an (initial, final) pair of addresses, to
+        its visits and the wins of the player to move
+        """
+        pool = self._pool
+        if self._root == NO_NODE:
+            return {}
+        stats = {}
+        for child in pool.children[self._root]:
+            initial, final = pool.move[child]
+            stats[index_to_address(initial), index_to_address(final)] = (pool.visits[child], pool.wins[child])
+        return stats
+
+    def _iterate(self, root):
+        """
+        makes one playout: descends from the root by UCT,
+        expands one new node, plays out from it, takes the
+        moves back and updates the nodes on the path
+        """
+        game = self._game
+        pool = self._pool
+        rng = self._rng
+        node = root
+        depth = 0
+        while game.get_game_state() == 'UNFINISHED':
+            untried = pool.untried[node]
+            if untried is None:
+                untried = pool.untried[node] = [(initial, final) for initial, final, _ in game.generate_moves()]
+            if untried:
+                # move a random untried move to the end and take it
+                chosen = rng.randrange(len(untried))
+                untried[chosen], untried[-1] = untried[-1], untried[chosen]
+                move = untried.pop()
+                mover = game.get_current_player()
+                if not game.push_move(index_to_address(move[0]), index_to_address(move[1])):
+                    continue
+                depth += 1
+                child = pool.allocate(node, move, game.get_hash(), mover)
+                pool.children[node].append(child)
+                node = child
+                break
+            if not pool.children[node]:
+                break
+            node = self._select(node)
+            move = pool.move[node]
+            game.push_move(index_to_address(move[0]), index_to_address(move[1]))
+            depth += 1
+        if game.get_game_state() == 'BLACK_WON':
+            score = 1.0
+        elif game.get_game_state() == 'WHITE_WON':
+            score = 0.0
+        elif pool.untried[node] == [] and not pool.children[node]:
+            # a player who cannot move has lost
+            score = 0.0 if game.get_current_player() == 'BLACK' else 1.0
+        else:
+            score = self._playout()
+        for _ in range(depth):
+            game.pop_move()
+        while node != NO_NODE:
+            pool.visits[node] += 1
+            pool.wins[node] += score if pool.mover[node] == 'BLACK' else 1.0 - score
+            node = pool.parent[node]
+
+    def _select(self, node):
+        """returns the child of a node with the highest UCT value"""
+        pool = self._pool
+        visits, wins = pool.visits, pool.wins
+        log_visits = math.log(visits[node])
+        exploration = self._exploration
+        best, best_value = NO_NODE, -1.0
+        for child in pool.children[node]:
+            value = wins[child] / visits[child] + exploration * math.sqrt(log_visits / visits[child])
+            if value > best_value:
+                best, best_value = child, value
+        return best
+
+    def _playout(self):
+        """
+        plays random moves from the present position until
+        the game ends or the playout depth is reached, takes
+        them back, and returns the chance black won
+        """
+        game = self._game
+        moves = 0
+        score = None
+        while moves < self._playout_depth:
+            if game.get_game_state() != 'UNFINISHED':
+                break
+            if not self._playout_move():
+                # a player who cannot move has lost
+                score = 0.0 if game.get_current_player() == 'BLACK' else 1.0
+                break
+            moves += 1
+        if score is None:
+            if game.get_game_state() == 'BLACK_WON':
+                score = 1.0
+            elif game.get_game_state() == 'WHITE_WON':
+                score = 0.0
+            else:
+                score = _score(game)
+        for _ in range(moves):
+            game.pop_move()
+        return score
+
+    def _sample_move(self, board, centers):
+        """
+        returns a random (center, direction, distance) of a
+        piece among the given centers, or None if the piece
+        drawn cannot move
+        """
+        rng = self._rng
+        center = rng.choice(centers)
+        directions = PATTERN_DIRECTIONS[board.pattern(center)]
+        if not directions:
+            return None
+        direction, limit = rng.choice(directions)
+        limit = min(limit, len(RAYS[center][direction]))
+        if not limit:
+            return None
+        return center, direction, rng.randint(1, limit)
+
+    def _playout_move(self):
+        """
+        pushes a random move of the player to move, drawn
+        without generating every move, and returns False
+        if the player has no move at all. A drawn slide
+        may stop short on stones, as make_move allows
+        """
+        game = self._game
+        board = game.get_board_state()
+        stone = PLAYER_STONES[game.get_current_player()]
+        pattern_of = board.pattern
+        centers = [center for center in INTERIOR_CENTERS if PATTERN_STONES[pattern_of(center)] == stone]
+        if centers:
+            if self._heuristic:
+                threats = set()
+                for ring in game.get_ring_addresses(game.get_non_current_player()):
+                    ring_center = address_to_index(ring)
+                    threats |= get_invalid_centers(ring_center)
+                    threats.add(ring_center)
+            for _ in range(_PLAYOUT_TRIES):
+                if self._heuristic:
+                    candidates = [self._sample_move(board, centers) for _ in range(_HEURISTIC_SAMPLES)]
+                    candidates = [candidate for candidate in candidates if candidate is not None]
+                    if not candidates:
+                        continue
+                    stops = [board.slide_stop(*candidate) for candidate in candidates]
+                    ranked = sorted(range(len(candidates)),
+                                    key=lambda number: (stops[number][0] not in threats, not stops[number][1]))
+                    center, direction, distance = candidates[ranked[0]]
+                else:
+                    sampled = self._sample_move(board, centers)
+                    if sampled is None:
+                        continue
+                    center, direction, distance = sampled
+                final = RAYS[center][direction][distance - 1]
+                if game.push_move(index_to_address(center), index_to_address(final)):
+                    return True
+        # every draw was refused, as when only moves keeping a last ring are left
+        moves = [(initial, final) for initial, final, _ in game.generate_moves()]
+        if not moves:
+            return False
+        initial, final = self._rng.choice(moves)
+        return game.push_move(index_to_address(initial), index_to_address(final))
+
+
+def _result(stats, playouts, elapsed):
+    """returns the MCTSResult of the given root statistics"""
+    root_moves = sorted((RootMove(move, visits, wins / visits if visits else 0.0)
+                         for move, (visits, wins) in stats.items()),
+                        key=lambda root_move: (-root_move.visits, -root_move.win_rate, root_move.move))
+    best = root_moves[0] if root_moves else None
+    return MCTSResult(best.move if best else None, best.win_rate if best else 0.0, playouts, elapsed,
+                      playouts / elapsed if elapsed > 0 else 0.0, root_moves)
+
+
+def _search_worker(position, seed, max_time, max_playouts, exploration, playout, playout_depth, engine):
+    """
+    searches a Position inside a worker process and
+    returns its playouts and root statistics, which are
+    small enough to send back without pickling the tree
+    """
+    game = GessGame(engine, position)
+    search = MCTS(game, exploration, playout, playout_depth, seed)
+    result = search.search(max_time, max_playouts)
+    return result.playouts, search.root_stats()
+
+
+def parallel_search(game, workers=None, max_time=None, max_playouts=None, seed=0,
+                    exploration=DEFAULT_EXPLORATION, playout='random',
+                    playout_depth=DEFAULT_PLAYOUT_DEPTH, engine='array'):
+    """
+    searches the present position of a game with one
+    independent tree per worker process, each given the
+    whole time budget and an even share of the playouts,
+    and returns an MCTSResult of their summed root visits
+    and wins. The game itself is left unchanged
+    """
+    workers = workers or os.cpu_count() or 1
+    if max_time is None and max_playouts is None:
+        max_playouts = DEFAULT_PLAYOUTS
+    shares = [None] * workers
+    if max_playouts is not None:
+        shares = [max_playouts // workers + (worker < max_playouts % workers) for worker in range(workers)]
+    position = game.snapshot()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_search_worker, position, random.Random('%d:%d' % (seed, worker)).getrandbits(64),
+                                   max_time, share, exploration, playout, playout_depth, engine)
+                   for worker, share in enumerate(shares) if share is None or share > 0]
+        merged = {}
+        playouts = 0
+        for future in futures:
+            worker_playouts, stats = future.result()
+            playouts += worker_playouts
+            for move, (visits, wins) in stats.items():
+                total = merged.get(move, (0, 0.0))
+                merged[move] = (total[0] + visits, total[1] + wins)
+    return _result(merged, playouts, time.perf_counter() - start)
+
+
+def main():
+    """searches the starting position, or plays a game of searches, from the command line"""
+    parser = argparse.ArgumentParser(description='Search Gess positions with Monte Carlo tree search.')
+    parser.add_argument('--time', type=float, default=None, help='seconds to search each move')
+    parser.add_argument('--playouts', type=int, default=None, help='playouts to search each move')
+    parser.add_argument('--workers', type=int, default=1, help='worker processes, each searching its own tree')
+    parser.add_argument('--playout', choices=('random', 'heuristic'), default='random', help='playout policy')
+    parser.add_argument('--moves', type=int, default=1, help='moves to play from the starting position')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the search')
+    parser.add_argument('--engine', choices=('array', 'bitboard'), default='array', help='board engine')
+    args = parser.parse_args()
+    game = GessGame(args.engine)
+    search = MCTS(game, playout=args.playout, seed=args.seed)
+    for _ in range(args.moves):
+        if game.get_game_state() != 'UNFINISHED':
+            break
+        if args.workers > 1:
+            result = parallel_search(game, args.workers, args.time, args.playouts, args.seed,
+                                     playout=args.playout, engine=args.engine)
+        else:
+            result = search.search(args.time, args.playouts)
+        if result.move is None:
+            break
+        print('%s %s-%s' % (game.get_current_player(), *result.move),
+              'win rate %.3f' % result.win_rate, 'playouts %d' % result.playouts,
+              'seconds %.2f' % result.elapsed, 'playouts per second %.1f' % result.pps)
+        game.make_move(*result.move)
+    print('game state:', game.get_game_state(), 'nodes:', len(search.get_pool()))
+
+
+if __name__ == '__main__':
+    main()
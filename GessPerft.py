@@ -0,0 +1,142 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Counts the leaves of the Gess move tree to check move generation and time it
+
+import argparse
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from Gess import GessGame, index_to_address
+
+# leaf counts of the starting position by depth, for the checks of check_reference
+REFERENCE_COUNTS = {1: 554, 2: 305870, 3: 167959040}
+
+# the outcome of a count: the depth, the leaves counted, the leaves below
+# each root move as a dictionary from (initial, final) address pairs, or
+# None when not divided, the seconds taken and the leaves per second
+PerftResult = namedtuple('PerftResult', ['depth', 'nodes', 'divide', 'elapsed', 'nps'])
+
+
+def perft(game, depth, bulk=True):
+    """
+    returns the number of positions reached by every
+    sequence of depth legal moves from the present position
+    of the game, which is left unchanged. A finished game
+    has no moves and so no leaves below it. With bulk,
+    the moves of the last ply are counted without being made
+    """
+    if depth == 0:
+        return 1
+    if bulk and depth == 1:
+        return sum(1 for _ in game.generate_moves())
+    nodes = 0
+    for initial, final, _ in list(game.generate_moves()):
+        if not game.push_move(index_to_address(initial), index_to_address(final)):
+            raise AssertionError('generated move %s-%s was refused'
+                                 % (index_to_address(initial), index_to_address(final)))
+        try:
+            nodes += perft(game, depth - 1, bulk)
+        finally:
+            game.pop_move()
+    return nodes
+
+
+def _divide_worker(position, move, depth, bulk, engine):
+    """counts the leaves below one root move inside a worker process"""
+    game = GessGame(engine, position)
+    if not game.push_move(*move):
+        raise AssertionError('generated move %s-%s was refused' % move)
+    return move, perft(game, depth - 1, bulk)
+
+
+def divide(game, depth, workers=1, bulk=True, engine='array'):
+    """
+    returns a dictionary from each root move, as an
+    (initial, final) pair of addresses, to the leaves
+    below it at the given depth. With more than one
+    worker, the subtrees are counted in worker processes
+    """
+    moves = list(game.legal_moves())
+    if depth <= 0:
+        return {}
+    if workers <= 1:
+        counts = {}
+        for move in moves:
+            if not game.push_move(*move):
+                raise AssertionError('generated move %s-%s was refused' % move)
+            try:
+                counts[move] = perft(game, depth - 1, bulk)
+            finally:
+                game.pop_move()
+        return counts
+    position = game.snapshot()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_divide_worker, position, move, depth, bulk, engine) for move in moves]
+        return dict(future.result() for future in futures)
+
+
+def run_perft(game, depth, split=False, workers=None, bulk=True, engine='array'):
+    """
+    counts the leaves of the game at the given depth,
+    divided by root move and across worker processes
+    if asked, and returns a PerftResult
+    """
+    start = time.perf_counter()
+    if split or (workers or 1) > 1:
+        counts = divide(game, depth, workers or os.cpu_count() or 1, bulk, engine)
+        nodes = sum(counts.values())
+    else:
+        counts = None
+        nodes = perft(game, depth, bulk)
+    elapsed = time.perf_counter() - start
+    return PerftResult(depth, nodes, counts if split else None, elapsed, nodes / elapsed if elapsed > 0 else 0.0)
+
+
+def check_reference(depth, nodes):
+    """
+    returns True if the count matches the reference count
+    of the starting position at that depth, False if it
+    does not, or None if there is no reference for that depth
+    """
+    if depth not in REFERENCE_COUNTS:
+        return None
+    return REFERENCE_COUNTS[depth] == nodes
+
+
+def main():
+    """counts the move tree from the command line, checking the starting position against the references"""
+    parser = argparse.ArgumentParser(description='Count the leaves of the Gess move tree.')
+    parser.add_argument('depth', type=int, help='plies to count')
+    parser.add_argument('--divide', action='store_true', help='show the leaves below each root move')
+    parser.add_argument('--workers', type=int, default=1, help='worker processes sharing the root moves')
+    parser.add_argument('--no-bulk', action='store_true', help='make the moves of the last ply too')
+    parser.add_argument('--store', default=None, help='position store written by GessStore.PositionWriter')
+    parser.add_argument('--record', type=int, default=0, help='number of the record of the store to count')
+    parser.add_argument('--engine', choices=('array', 'bitboard'), default='array', help='board engine')
+    args = parser.parse_args()
+    if args.store is not None:
+        from GessStore import PositionStore
+        with PositionStore(args.store) as store:
+            game = GessGame(args.engine, store.get_position(args.record))
+    else:
+        game = GessGame(args.engine)
+    result = run_perft(game, args.depth, args.divide, args.workers, not args.no_bulk, args.engine)
+    if result.divide is not None:
+        for (initial, final), nodes in sorted(result.divide.items()):
+            print('%s-%s %d' % (initial, final, nodes))
+    print('depth:', result.depth, 'nodes:', result.nodes, 'seconds: %.2f' % result.elapsed,
+          'nodes per second: %.1f' % result.nps)
+    if args.store is None:
+        matched = check_reference(result.depth, result.nodes)
+        if matched is False:
+            print('MISMATCH: expected', REFERENCE_COUNTS[result.depth])
+            return 1
+        if matched:
+            print('matches reference')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
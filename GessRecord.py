@@ -0,0 +1,345 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Compact binary and text records of games of Gess, written and read as streams
+
+import struct
+from collections import namedtuple
+
+from Gess import (BOARD_SIZE, CELL_COUNT, STONE_CHARS, GessGame, InvalidMoveException, address_to_index,
+                  index_to_address, is_interior)
+
+# a recorded game: the 400 cells it started from, as from Board.get_cells, or
+# None for the usual starting position, the player who moved first, the game
+# state at the end, and its moves as (initial, final) address pairs
+GameRecord = namedtuple('GameRecord', ['start', 'first_player', 'result', 'moves'])
+
+# first bytes of a binary archive, followed by the format version
+ARCHIVE_MAGIC = b'GESS'
+ARCHIVE_VERSION = 1
+# results, in the order of their codes
+RESULTS = ('UNFINISHED', 'BLACK_WON', 'WHITE_WON')
+# bits of one center, which is one of the 18 x 18 interior cells, or of
+# one final square, which may also be one of the edge cells a blocked
+# slide is allowed to name
+_CENTER_BITS = 9
+_MOVE_BITS = 2 * _CENTER_BITS
+# each game begins with a flags byte and its number of moves. The flags hold
+# the result in the low two bits, then whether white moved first and whether
+# the start position follows, packed at two bits per cell
+_GAME_HEADER = struct.Struct('<BI')
+_WHITE_FIRST = 4
+_CUSTOM_START = 8
+_POSITION_BYTES = CELL_COUNT // 4
+
+_STANDARD_START = GessGame().get_board_state().get_cells()
+# the number of codes taken by the centers, after which the edge cells are numbered
+_CENTER_CODES = (BOARD_SIZE - 2) * (BOARD_SIZE - 2)
+# the edge cells in code order, and the code of each
+_EDGE_CELLS = tuple(index for index in range(CELL_COUNT) if not is_interior(index))
+_EDGE_CODES = {index: _CENTER_CODES + number for number, index in enumerate(_EDGE_CELLS)}
+
+
+def center_code(address):
+    """returns the 9 bit code of an interior center, raising a ValueError for any other"""
+    index = address_to_index(address)
+    if not is_interior(index):
+        raise ValueError('%s is not the center of a piece' % (address,))
+    row, column = divmod(index, BOARD_SIZE)
+    return (row - 1) * (BOARD_SIZE - 2) + column - 1
+
+
+def center_address(code):
+    """returns the address of the center with the given 9 bit code"""
+    row, column = divmod(code, BOARD_SIZE - 2)
+    if row >= BOARD_SIZE - 2:
+        raise ValueError('bad center code %d' % code)
+    return index_to_address((row + 1) * BOARD_SIZE + column + 1)
+
+
+def square_code(address):
+    """
+    returns the 9 bit code of the final square of a move:
+    the center code of an interior cell, or a code after
+    every center for a cell on the edge, where a slide
+    stopped short by stones may name its final square
+    """
+    index = address_to_index(address)
+    if is_interior(index):
+        return center_code(address)
+    return _EDGE_CODES[index]
+
+
+def square_address(code):
+    """returns the address of the final square with the given 9 bit code"""
+    if _CENTER_CODES <= code < _CENTER_CODES + len(_EDGE_CELLS):
+        return index_to_address(_EDGE_CELLS[code - _CENTER_CODES])
+    return center_address(code)
+
+
+def pack_moves(moves):
+    """
+    returns the given (initial, final) address pairs
+    packed end to end at 18 bits a move, padded with
+    zero bits to a whole number of bytes
+    """
+    packed = 0
+    for shift, (initial, final) in enumerate(moves):
+        code = center_code(initial) << _CENTER_BITS | square_code(final)
+        packed |= code << shift * _MOVE_BITS
+    return packed.to_bytes((len(moves) * _MOVE_BITS + 7) // 8, 'little')
+
+
+def unpack_moves(data, count):
+    """returns the count (initial, final) address pairs packed in data"""
+    packed = int.from_bytes(data, 'little')
+    mask = (1 << _CENTER_BITS) - 1
+    moves = []
+    for _ in range(count):
+        moves.append((center_address(packed >> _CENTER_BITS & mask), square_address(packed & mask)))
+        packed >>= _MOVE_BITS
+    return moves
+
+
+# the four cells held by each byte of a packed position
+_UNPACKED = tuple(bytes((byte & 3, byte >> 2 & 3, byte >> 4 & 3, byte >> 6)) for byte in range(256))
+
+
+def pack_position(cells):
+    """returns 400 cells packed four to a byte, the first cell in the lowest bits"""
+    return bytes(a | b << 2 | c << 4 | d << 6 for a, b, c, d in zip(cells[0::4], cells[1::4], cells[2::4], cells[3::4]))
+
+
+def unpack_position(data):
+    """returns the 400 cells packed in data by pack_position"""
+    return b''.join([_UNPACKED[byte] for byte in data])
+
+
+class RecordWriter:
+    """
+    Writes game records one after another to a binary
+    stream, such as a file opened with 'wb', starting
+    with the archive header. Nothing is kept in memory
+    once a record has been written
+    """
+    def __init__(self, stream):
+        """initializes the writer and writes the archive header"""
+        self._stream = stream
+        self._stream.write(ARCHIVE_MAGIC + bytes([ARCHIVE_VERSION]))
+        self._count = 0
+
+    def write(self, record):
+        """writes one GameRecord"""
+        flags = RESULTS.index(record.result)
+        if record.first_player == 'WHITE':
+            flags |= _WHITE_FIRST
+        start = record.start if record.start != _STANDARD_START else None
+        if start is not None:
+            flags |= _CUSTOM_START
+        self._stream.write(_GAME_HEADER.pack(flags, len(record.moves)))
+        if start is not None:
+            self._stream.write(pack_position(start))
+        self._stream.write(pack_moves(record.moves))
+        self._count += 1
+
+    def get_count(self):
+        """returns the number of records written"""
+        return self._count
+
+
+def _read_exactly(stream, size):
+    """reads size bytes, raising a ValueError if the stream ends first"""
+    data = stream.read(size)
+    if len(data) != size:
+        raise ValueError('archive is truncated')
+    return data
+
+
+def read_header(stream):
+    """
+    reads the archive header from the start of a binary
+    stream, raising a ValueError if it is not an archive
+    """
+    header = stream.read(len(ARCHIVE_MAGIC) + 1)
+    if header[:len(ARCHIVE_MAGIC)] != ARCHIVE_MAGIC:
+        raise ValueError('not a Gess archive')
+    if header[len(ARCHIVE_MAGIC)] != ARCHIVE_VERSION:
+        raise ValueError('unsupported archive version %d' % header[len(ARCHIVE_MAGIC)])
+
+
+def _read_game_header(stream):
+    """
+    reads the header of the next game, returning its flags
+    and number of moves, or None at the end of the stream
+    """
+    game_header = stream.read(_GAME_HEADER.size)
+    if not game_header:
+        return None
+    if len(game_header) != _GAME_HEADER.size:
+        raise ValueError('archive is truncated')
+    flags, count = _GAME_HEADER.unpack(game_header)
+    if flags & 3 >= len(RESULTS):
+        raise ValueError('bad result code %d' % (flags & 3))
+    return flags, count
+
+
+def _record_size(flags, count):
+    """returns the bytes following the header of a game with the given flags and moves"""
+    return (_POSITION_BYTES if flags & _CUSTOM_START else 0) + (count * _MOVE_BITS + 7) // 8
+
+
+def read_record(stream):
+    """
+    reads the next GameRecord from a binary stream
+    positioned at the start of a game, returning None
+    at the end of the stream
+    """
+    header = _read_game_header(stream)
+    if header is None:
+        return None
+    flags, count = header
+    start = unpack_position(_read_exactly(stream, _POSITION_BYTES)) if flags & _CUSTOM_START else None
+    moves = unpack_moves(_read_exactly(stream, (count * _MOVE_BITS + 7) // 8), count)
+    return GameRecord(start, 'WHITE' if flags & _WHITE_FIRST else 'BLACK', RESULTS[flags & 3], moves)
+
+
+def skip_record(stream):
+    """
+    moves a seekable binary stream past the next game
+    without decoding it, returning its number of moves,
+    or None at the end of the stream
+    """
+    header = _read_game_header(stream)
+    if header is None:
+        return None
+    stream.seek(_record_size(*header), 1)
+    return header[1]
+
+
+def read_records(stream):
+    """
+    generator yielding each GameRecord of a binary
+    archive in turn, reading only one game at a time.
+    Raises a ValueError if the stream is not an archive
+    or ends part way through a game
+    """
+    read_header(stream)
+    while True:
+        record = read_record(stream)
+        if record is None:
+            return
+        yield record
+
+
+def replay(record, engine='array'):
+    """
+    returns a new GessGame with the moves of the record
+    made on it, raising a ValueError if any is refused
+    """
+    if record.start is not None or record.first_player != 'BLACK':
+        game = GessGame.from_position(record.start if record.start is not None else _STANDARD_START,
+                                      record.first_player, engine)
+    else:
+        game = GessGame.new(engine)
+    for number, (initial, final) in enumerate(record.moves, 1):
+        try:
+            moved = game.make_move(initial, final)
+        except InvalidMoveException:
+            moved = False
+        if not moved:
+            raise ValueError('move %d, %s %s, was refused' % (number, initial, final))
+    return game
+
+
+def replay_records(stream, engine='array'):
+    """
+    generator replaying every game of a binary archive
+    and yielding each GameRecord with the GessGame it
+    ends in, one game at a time
+    """
+    for record in read_records(stream):
+        yield record, replay(record, engine)
+
+
+class GameRecorder:
+    """
+    Plays moves on a game, as make_move does, while
+    keeping the moves made so that the game can be
+    written out as a GameRecord
+    """
+    def __init__(self, game):
+        """initializes a recorder starting from the present position of the game"""
+        self._game = game
+        self._start = game.get_board_state().get_cells()
+        self._first_player = game.get_current_player()
+        self._moves = []
+
+    def make_move(self, initial, final):
+        """makes the move on the game and records it if it was made"""
+        moved = self._game.make_move(initial, final)
+        if moved:
+            self._moves.append((initial, final))
+        return moved
+
+    def get_record(self):
+        """returns the GameRecord of the moves made so far"""
+        start = self._start if self._start != _STANDARD_START else None
+        return GameRecord(start, self._first_player, self._game.get_game_state(), list(self._moves))
+
+
+def format_record(record):
+    """
+    returns a game record as text in the style of PGN:
+    tag lines, the start position if it is not the usual
+    one as 20 rows from row 20 down, then the numbered moves
+    """
+    lines = ['[Result "%s"]' % record.result, '[FirstPlayer "%s"]' % record.first_player]
+    if record.start is not None:
+        for row in range(BOARD_SIZE - 1, -1, -1):
+            cells = record.start[row * BOARD_SIZE:(row + 1) * BOARD_SIZE]
+            lines.append('[Row%d "%s"]' % (row + 1, ''.join(STONE_CHARS[stone] for stone in cells).replace(' ', '.')))
+    lines.append('')
+    turns = []
+    for number in range(0, len(record.moves), 2):
+        turn = ['%d.' % (number // 2 + 1)] + ['%s-%s' % move for move in record.moves[number:number + 2]]
+        turns.append(' '.join(turn))
+    text = ' '.join(turns)
+    lines.append(text + ' ' + record.result if text else record.result)
+    return '\n'.join(lines) + '\n'
+
+
+def parse_record(text):
+    """
+    returns the GameRecord written as text by
+    format_record, raising a ValueError if it is malformed
+    """
+    tags = {}
+    moves = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith('['):
+            name, _, value = line[1:-1].partition(' ')
+            tags[name] = value.strip('"')
+        elif line:
+            for token in line.split():
+                if token[-1] == '.' or token in RESULTS:
+                    continue
+                initial, _, final = token.partition('-')
+                if not final:
+                    raise ValueError('bad move %r' % token)
+                center_code(initial)
+                square_code(final)
+                moves.append((initial, final))
+    result = tags.get('Result', 'UNFINISHED')
+    first_player = tags.get('FirstPlayer', 'BLACK')
+    if result not in RESULTS or first_player not in ('BLACK', 'WHITE'):
+        raise ValueError('bad tags %r' % tags)
+    start = None
+    if 'Row1' in tags:
+        cells = bytearray()
+        for row in range(1, BOARD_SIZE + 1):
+            text_row = tags.get('Row%d' % row, '')
+            if len(text_row) != BOARD_SIZE:
+                raise ValueError('bad row %d' % row)
+            cells.extend(STONE_CHARS.index(char) for char in text_row.replace('.', ' '))
+        start = bytes(cells)
+    return GameRecord(start, first_player, result, moves)
@@ -0,0 +1,133 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Plays many games of Gess against itself across worker processes
+
+import argparse
+import os
+import random
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from Gess import GessGame, index_to_address
+
+# the outcome of one self-play game: its number, the seed its moves were drawn
+# from, the game state reported by get_game_state, the number of moves made and
+# the final position as the 400 bytes of Board.get_cells
+SelfPlayResult = namedtuple('SelfPlayResult', ['game_id', 'seed', 'winner', 'moves', 'position'])
+
+
+def random_policy(game, rng):
+    """returns a legal move chosen uniformly at random, or None if there is none"""
+    moves = list(game.legal_moves())
+    return rng.choice(moves) if moves else None
+
+
+def capture_policy(game, rng):
+    """
+    returns a random capturing move if there is one,
+    otherwise a random legal move, or None if there
+    is no legal move
+    """
+    moves = list(game.generate_moves())
+    if not moves:
+        return None
+    captures = [move for move in moves if move[2]]
+    initial, final, _ = rng.choice(captures or moves)
+    return index_to_address(initial), index_to_address(final)
+
+
+# move policies which can be chosen by name
+POLICIES = {'random': random_policy, 'capture': capture_policy}
+
+
+def game_seed(seed, game_id):
+    """
+    returns the seed of the given game of a run, which
+    depends only on the seed of the run and the game number
+    """
+    return random.Random('%d:%d' % (seed, game_id)).getrandbits(64)
+
+
+def play_game(game_id, seed, black_policy, white_policy, max_moves, engine='array'):
+    """
+    plays one game to the end, or until max_moves moves
+    have been made or the player to move has no moves,
+    and returns its SelfPlayResult
+    """
+    rng = random.Random(seed)
+    game = GessGame.new(engine)
+    policies = {'BLACK': black_policy, 'WHITE': white_policy}
+    moves = 0
+    while moves < max_moves and game.get_game_state() == 'UNFINISHED':
+        # the policy generates the moves once, and has none to choose from when the player cannot move
+        move = policies[game.get_current_player()](game, rng)
+        if move is None or not game.make_move(*move):
+            break
+        moves += 1
+    return SelfPlayResult(game_id, seed, game.get_game_state(), moves, game.get_board_state().get_cells())
+
+
+def _play_batch(game_ids, seed, black_policy, white_policy, max_moves, engine):
+    """
+    plays a batch of games inside a worker process and
+    returns their results, which are small enough to
+    send back without pickling any game objects
+    """
+    return [play_game(game_id, game_seed(seed, game_id), black_policy, white_policy, max_moves, engine)
+            for game_id in game_ids]
+
+
+def play_games(count, workers=None, seed=0, black_policy=random_policy, white_policy=random_policy,
+               max_moves=200, batch_size=16, engine='array'):
+    """
+    generator playing count games across a pool of worker
+    processes and yielding each SelfPlayResult as its batch
+    finishes. Policies must be picklable functions taking
+    the game and a random.Random and returning an (initial,
+    final) move, or None if the player has no move. At
+    most two batches per worker are in flight, so memory
+    stays flat however many games are played
+    """
+    workers = workers or os.cpu_count() or 1
+    batches = (range(start, min(start + batch_size, count)) for start in range(0, count, batch_size))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for batch in batches:
+            pending.add(executor.submit(_play_batch, batch, seed, black_policy, white_policy, max_moves, engine))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        for future in pending:
+            yield from future.result()
+
+
+def main():
+    """runs self-play from the command line and prints a summary"""
+    parser = argparse.ArgumentParser(description='Play games of Gess against itself.')
+    parser.add_argument('--games', type=int, default=100, help='number of games to play')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes, default one per core')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the run')
+    parser.add_argument('--max-moves', type=int, default=200, help='moves after which a game is abandoned')
+    parser.add_argument('--batch-size', type=int, default=16, help='games sent to a worker at once')
+    parser.add_argument('--black', choices=POLICIES, default='random', help='move policy of black')
+    parser.add_argument('--white', choices=POLICIES, default='random', help='move policy of white')
+    parser.add_argument('--engine', choices=('array', 'bitboard'), default='array', help='board engine')
+    args = parser.parse_args()
+    start = time.perf_counter()
+    winners = Counter()
+    moves = 0
+    for result in play_games(args.games, args.workers, args.seed, POLICIES[args.black], POLICIES[args.white],
+                             args.max_moves, args.batch_size, args.engine):
+        winners[result.winner] += 1
+        moves += result.moves
+    elapsed = time.perf_counter() - start
+    print('games:', args.games, 'moves:', moves, 'seconds: %.2f' % elapsed)
+    print('games per second: %.1f' % (args.games / elapsed), 'moves per second: %.1f' % (moves / elapsed))
+    for state, games in sorted(winners.items()):
+        print(state, games)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,435 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Asyncio server hosting many games of Gess over a newline delimited JSON protocol
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from Gess import STONE_CHARS, GessGame
+
+# seconds a game may go without a request before it is removed
+DEFAULT_IDLE_TIMEOUT = 600.0
+# seconds between sweeps for idle games
+_SWEEP_INTERVAL = 5.0
+# messages queued for a connection before it is dropped as too slow
+_QUEUE_LIMIT = 1024
+# longest line accepted, in bytes, which must hold every legal move of a game
+_LINE_LIMIT = 1 << 20
+
+# the outcome of a load test: the games hosted, the moves sent and refused,
+# the seconds taken, the moves per second, and the median and 99th percentile
+# seconds between sending a move and its reply
+LoadResult = namedtuple('LoadResult', ['games', 'moves', 'refused', 'elapsed', 'moves_per_second',
+                                       'median_latency', 'p99_latency'])
+
+
+def game_message(game_id, game):
+    """
+    returns the JSON ready description of a game: its
+    id, the 400 cells from a1 as ' ', 'b' and 'w', the
+    player to move and the game state
+    """
+    return {'game': game_id,
+            'cells': ''.join(STONE_CHARS[stone] for stone in game.get_board_state().get_cells()),
+            'current_player': game.get_current_player(),
+            'state': game.get_game_state()}
+
+
+class Session:
+    """
+    One hosted game, with the connections subscribed
+    to its updates. Moves are made one at a time
+    """
+    def __init__(self, game_id, engine='array'):
+        """initializes a session with a new game"""
+        self.game_id = game_id
+        self.game = GessGame.new(engine)
+        self.lock = asyncio.Lock()
+        self.subscribers = set()
+        self.last_used = time.monotonic()
+
+    def touch(self):
+        """marks the session as used now"""
+        self.last_used = time.monotonic()
+
+
+class _Connection:
+    """
+    A client connection, whose replies and updates go
+    through a bounded queue drained by a writer task, so
+    that a slow client never holds up a game
+    """
+    def __init__(self, writer):
+        """initializes the connection and starts its writer task"""
+        self._writer = writer
+        self._queue = asyncio.Queue(_QUEUE_LIMIT)
+        self._task = asyncio.ensure_future(self._drain())
+        self.subscriptions = set()
+
+    def send(self, message):
+        """queues a message, closing the connection if the client has fallen too far behind"""
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.close()
+
+    async def _drain(self):
+        """writes queued messages until the connection is closed"""
+        try:
+            while True:
+                message = await self._queue.get()
+                if message is None:
+                    break
+                self._writer.write(json.dumps(message, separators=(',', ':')).encode() + b'\n')
+                if self._queue.empty():
+                    await self._writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._writer.close()
+
+    def close(self):
+        """stops the writer task and closes the connection"""
+        self._task.cancel()
+        self._writer.close()
+
+
+class GessServer:
+    """
+    Hosts games for many clients at once. Each line a
+    client sends is a JSON request with an 'op' and an
+    optional 'id', which is copied into the reply:
+      create: starts a game and replies with it
+      move: makes the move 'initial' to 'final' in 'game'
+      resign: resigns 'game' for the player to move
+      state: replies with 'game'
+      moves: replies with the legal moves of 'game'
+      subscribe, unsubscribe: starts or stops sending the
+        connection an 'update' event after each move of 'game'
+    Replies have 'ok' set, and 'error' when it is False.
+    Moves are made on a thread pool so that the event
+    loop is never held up, one at a time for each game
+    """
+    def __init__(self, idle_timeout=DEFAULT_IDLE_TIMEOUT, engine='array', workers=None):
+        """initializes a server with no games"""
+        self._sessions = {}
+        self._ids = itertools.count(1)
+        self._idle_timeout = idle_timeout
+        self._engine = engine
+        self._executor = ThreadPoolExecutor(workers)
+        self._server = None
+        self._sweeper = None
+        # the task answering each open connection
+        self._connections = {}
+
+    def get_session_count(self):
+        """returns the number of games being hosted"""
+        return len(self._sessions)
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        """
+        starts listening on the given TCP host and port, or
+        on the Unix socket at path if one is given, and
+        returns the asyncio server
+        """
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._serve, path, limit=_LINE_LIMIT)
+        else:
+            self._server = await asyncio.start_server(self._serve, host, port, limit=_LINE_LIMIT)
+        self._sweeper = asyncio.ensure_future(self._sweep())
+        return self._server
+
+    async def stop(self):
+        """stops listening, closes every connection and drops every game"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        tasks = list(self._connections.values())
+        for connection in list(self._connections):
+            connection.close()
+        # the tasks end on their own once they read the end of their closed streams
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._sessions.clear()
+        self._executor.shutdown(wait=False)
+
+    def evict_idle(self, now=None):
+        """
+        removes the games unused for longer than the idle
+        timeout, telling their subscribers, and returns
+        the number removed
+        """
+        now = time.monotonic() if now is None else now
+        idle = [session for session in self._sessions.values()
+                if now - session.last_used > self._idle_timeout and not session.lock.locked()]
+        for session in idle:
+            del self._sessions[session.game_id]
+            for connection in session.subscribers:
+                connection.subscriptions.discard(session.game_id)
+                connection.send({'event': 'evicted', 'game': session.game_id})
+        return len(idle)
+
+    async def _sweep(self):
+        """evicts idle games every few seconds"""
+        while True:
+            await asyncio.sleep(min(_SWEEP_INTERVAL, self._idle_timeout))
+            self.evict_idle()
+
+    async def _serve(self, reader, writer):
+        """answers the requests of one client until it disconnects"""
+        connection = _Connection(writer)
+        self._connections[connection] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError('request is not an object')
+                except ValueError as error:
+                    connection.send({'ok': False, 'error': 'bad request: %s' % error})
+                    continue
+                reply = await self.handle(request, connection)
+                if 'id' in request:
+                    reply['id'] = request['id']
+                connection.send(reply)
+        finally:
+            for game_id in connection.subscriptions:
+                session = self._sessions.get(game_id)
+                if session is not None:
+                    session.subscribers.discard(connection)
+            self._connections.pop(connection, None)
+            connection.send(None)
+
+    def _session(self, request):
+        """returns the session named by a request, raising a KeyError if there is none"""
+        game_id = request.get('game')
+        # game ids are integers, and anything else, even unhashable, names no game
+        session = self._sessions.get(game_id) if type(game_id) is int else None
+        if session is None:
+            raise KeyError('no such game: %r' % (request.get('game'),))
+        session.touch()
+        return session
+
+    async def handle(self, request, connection=None):
+        """returns the reply to one request from the given connection"""
+        op = request.get('op')
+        try:
+            if op == 'create':
+                game_id = next(self._ids)
+                session = Session(game_id, self._engine)
+                self._sessions[game_id] = session
+                if connection is not None and request.get('subscribe'):
+                    session.subscribers.add(connection)
+                    connection.subscriptions.add(game_id)
+                return dict(game_message(game_id, session.game), ok=True)
+            session = self._session(request)
+            if op == 'move':
+                if not isinstance(request.get('initial'), str) or not isinstance(request.get('final'), str):
+                    return {'ok': False, 'error': 'a move needs an initial and a final address'}
+                return await self._move(session, request['initial'], request['final'])
+            if op == 'resign':
+                async with session.lock:
+                    if session.game.get_game_state() != 'UNFINISHED':
+                        return {'ok': False, 'error': 'the game is over'}
+                    session.game.resign_game()
+                    self._publish(session, None)
+                    return dict(game_message(session.game_id, session.game), ok=True)
+            if op == 'state':
+                async with session.lock:
+                    return dict(game_message(session.game_id, session.game), ok=True)
+            if op == 'moves':
+                async with session.lock:
+                    moves = await asyncio.get_running_loop().run_in_executor(
+                        self._executor, lambda: list(session.game.legal_moves()))
+                return {'ok': True, 'game': session.game_id, 'moves': moves}
+            if op == 'subscribe' and connection is not None:
+                async with session.lock:
+                    session.subscribers.add(connection)
+                    connection.subscriptions.add(session.game_id)
+                    return dict(game_message(session.game_id, session.game), ok=True)
+            if op == 'unsubscribe' and connection is not None:
+                session.subscribers.discard(connection)
+                connection.subscriptions.discard(session.game_id)
+                return {'ok': True, 'game': session.game_id}
+            return {'ok': False, 'error': 'unknown op: %r' % (op,)}
+        except KeyError as error:
+            return {'ok': False, 'error': error.args[0]}
+
+    async def _move(self, session, initial, final):
+        """makes a move on the thread pool and tells the subscribers"""
+        async with session.lock:
+            try:
+                moved = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, session.game.make_move, initial, final)
+            except Exception as error:
+                # the rules raise for some malformed moves, which are refused all the same
+                return {'ok': False, 'error': 'invalid move: %s' % (type(error).__name__,)}
+            if not moved:
+                return {'ok': False, 'error': 'invalid move'}
+            self._publish(session, (initial, final))
+            return dict(game_message(session.game_id, session.game), ok=True)
+
+    def _publish(self, session, move):
+        """sends an update of the game to its subscribers"""
+        if not session.subscribers:
+            return
+        message = dict(game_message(session.game_id, session.game), event='update', move=move)
+        for connection in list(session.subscribers):
+            connection.send(message)
+
+
+def _scripts(count, moves, seed):
+    """
+    returns count lists of the first moves of seeded
+    random games, played here so that the load falls
+    on making moves rather than on finding them
+    """
+    scripts = []
+    for number in range(count):
+        rng = random.Random('%d:%d' % (seed, number))
+        game = GessGame()
+        script = []
+        while len(script) < moves and game.get_game_state() == 'UNFINISHED':
+            legal = list(game.legal_moves())
+            if not legal:
+                break
+            move = rng.choice(legal)
+            game.make_move(*move)
+            script.append(move)
+        scripts.append(script)
+    return scripts
+
+
+class _Client:
+    """one load generator connection, sending a request and awaiting its reply"""
+    def __init__(self, reader, writer):
+        """initializes the client on an open connection"""
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count()
+
+    async def call(self, request):
+        """sends a request and returns its reply, skipping any update events"""
+        request['id'] = next(self._ids)
+        self._writer.write(json.dumps(request).encode() + b'\n')
+        await self._writer.drain()
+        while True:
+            reply = json.loads(await self._reader.readline())
+            if reply.get('id') == request['id']:
+                return reply
+
+
+async def run_load(host='127.0.0.1', port=None, path=None, games=1000, moves=10, connections=100, seed=0):
+    """
+    load generator playing the given number of games
+    against a running server, spread over the given
+    number of connections. Each connection creates all
+    of its games, so that every game is hosted at once,
+    then plays their moves in turn from a set of seeded
+    random games, and a LoadResult is returned
+    """
+    scripts = _scripts(min(games, 32), moves, seed)
+    latencies = []
+    counts = {'games': 0, 'moves': 0, 'refused': 0}
+
+    async def connection_games(first, count):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=_LINE_LIMIT)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=_LINE_LIMIT)
+        client = _Client(reader, writer)
+        try:
+            playing = []
+            for number in range(first, first + count):
+                reply = await client.call({'op': 'create'})
+                playing.append((reply['game'], scripts[number % len(scripts)]))
+                counts['games'] += 1
+            for ply in range(moves):
+                for game_id, script in playing:
+                    if ply >= len(script):
+                        continue
+                    initial, final = script[ply]
+                    start = time.perf_counter()
+                    reply = await client.call({'op': 'move', 'game': game_id, 'initial': initial, 'final': final})
+                    latencies.append(time.perf_counter() - start)
+                    counts['moves'] += 1
+                    if not reply['ok']:
+                        counts['refused'] += 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    shares = [games // connections + (number < games % connections) for number in range(connections)]
+    firsts = [sum(shares[:number]) for number in range(connections)]
+    await asyncio.gather(*(connection_games(first, share) for first, share in zip(firsts, shares) if share))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    median = latencies[len(latencies) // 2] if latencies else 0.0
+    p99 = latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)] if latencies else 0.0
+    return LoadResult(counts['games'], counts['moves'], counts['refused'], elapsed,
+                      counts['moves'] / elapsed if elapsed > 0 else 0.0, median, p99)
+
+
+async def _serve_forever(args):
+    """runs the server until interrupted"""
+    server = GessServer(args.idle_timeout, args.engine, args.workers)
+    listener = await server.start(args.host, args.port, args.unix)
+    print('serving on', args.unix or listener.sockets[0].getsockname())
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+async def _self_load(args):
+    """starts a server in this process and runs the load generator against it"""
+    server = GessServer(args.idle_timeout, args.engine, args.workers)
+    listener = await server.start(args.host, 0, args.unix)
+    port = None if args.unix else listener.sockets[0].getsockname()[1]
+    try:
+        result = await run_load(args.host, port, args.unix, args.games, args.moves, args.connections, args.seed)
+        print('games:', result.games, 'moves:', result.moves, 'refused:', result.refused,
+              'hosted:', server.get_session_count())
+        print('seconds: %.2f' % result.elapsed, 'moves per second: %.1f' % result.moves_per_second)
+        print('latency median: %.2f ms' % (result.median_latency * 1e3), 'p99: %.2f ms' % (result.p99_latency * 1e3))
+    finally:
+        await server.stop()
+
+
+def main():
+    """runs the server, or a local load test of it, from the command line"""
+    parser = argparse.ArgumentParser(description='Host games of Gess over newline delimited JSON.')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on')
+    parser.add_argument('--port', type=int, default=7444, help='TCP port to listen on')
+    parser.add_argument('--unix', default=None, help='Unix socket path to listen on instead of TCP')
+    parser.add_argument('--idle-timeout', type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help='seconds after which an unused game is removed')
+    parser.add_argument('--engine', choices=('array', 'bitboard'), default='array', help='board engine')
+    parser.add_argument('--workers', type=int, default=None, help='threads making moves')
+    parser.add_argument('--load', action='store_true', help='run a local load test instead of serving')
+    parser.add_argument('--games', type=int, default=10000, help='games played by the load test')
+    parser.add_argument('--moves', type=int, default=4, help='moves per game of the load test')
+    parser.add_argument('--connections', type=int, default=200, help='connections opened by the load test')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the load test')
+    args = parser.parse_args()
+    try:
+        asyncio.run(_self_load(args) if args.load else _serve_forever(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: File of fixed size packed Gess positions, read back through mmap without copying
+
+import mmap
+import struct
+
+from Gess import (BOARD_SIZE, CELL_COUNT, PLAYER_STONES, ZOBRIST_KEYS, Board, Position,
+                  find_rings, index_to_address)
+from GessRecord import RESULTS, pack_position, unpack_position
+
+# first bytes of a position store, followed by the format version and record size
+STORE_MAGIC = b'GPOS'
+STORE_VERSION = 1
+_FILE_HEADER = struct.Struct('<4sBxH')
+# ring centers kept in each record for each player. A player with more rings
+# has them found again from the cells when they are read
+RING_SLOTS = 4
+# each record holds the cells at two bits each, a flags byte with white to
+# move in the lowest bit and the game state code above it, a byte with the
+# ring counts of black and white in its low and high halves, then the ring
+# slots of black and of white as little endian 16 bit cell indices
+_POSITION_BYTES = CELL_COUNT // 4
+_FLAGS = _POSITION_BYTES
+_RING_COUNTS = _POSITION_BYTES + 1
+_RINGS = struct.Struct('<%dH' % (2 * RING_SLOTS))
+RECORD_SIZE = _POSITION_BYTES + 2 + _RINGS.size
+_NO_RING = 0xFFFF
+_PLAYERS = ('BLACK', 'WHITE')
+
+
+def pack_record(cells, current_player, game_state, rings):
+    """
+    returns the fixed size record of a position from its
+    400 cells, the player to move, the game state and a
+    dictionary of the ring centers of each player
+    """
+    flags = (current_player == 'WHITE') | RESULTS.index(game_state) << 1
+    counts = [min(len(rings[player]), 15) for player in _PLAYERS]
+    slots = []
+    for player in _PLAYERS:
+        centers = sorted(rings[player])[:RING_SLOTS]
+        slots.extend(centers + [_NO_RING] * (RING_SLOTS - len(centers)))
+    return pack_position(cells) + bytes((flags, counts[0] | counts[1] << 4)) + _RINGS.pack(*slots)
+
+
+class PositionWriter:
+    """
+    Appends fixed size position records to a file,
+    writing the file header first if the file is new
+    """
+    def __init__(self, path):
+        """opens the file at path for appending"""
+        self._stream = open(path, 'ab')
+        if self._stream.tell() == 0:
+            self._stream.write(_FILE_HEADER.pack(STORE_MAGIC, STORE_VERSION, RECORD_SIZE))
+        self._count = 0
+
+    def write(self, position):
+        """appends a Position or the present position of a GessGame"""
+        if not isinstance(position, Position):
+            position = position.snapshot()
+        rings = {player: position.get_rings(player) for player in _PLAYERS}
+        self._stream.write(pack_record(position.get_cells(), position.get_current_player(),
+                                       position.get_game_state(), rings))
+        self._count += 1
+
+    def write_cells(self, cells, current_player='BLACK', game_state='UNFINISHED', rings=None):
+        """
+        appends a position given by its 400 cells, finding
+        the rings from the cells unless they are given
+        """
+        if rings is None:
+            board = Board(cells)
+            rings = {player: find_rings(board, stone) for player, stone in PLAYER_STONES.items()}
+        self._stream.write(pack_record(cells, current_player, game_state, rings))
+        self._count += 1
+
+    def get_count(self):
+        """returns the number of records written"""
+        return self._count
+
+    def close(self):
+        """flushes and closes the file"""
+        self._stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PositionStore:
+    """
+    Read only access to a file of position records by
+    record number, mapped into memory. Records come back
+    as memoryview slices of the mapping, and only the
+    accessors named for a richer form build one. Every
+    memoryview must be released before the store is closed
+    """
+    def __init__(self, path):
+        """maps the file at path, raising a ValueError if it is not a position store"""
+        with open(path, 'rb') as stream:
+            self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        if len(self._map) < _FILE_HEADER.size:
+            self.close()
+            raise ValueError('not a position store')
+        magic, version, size = _FILE_HEADER.unpack_from(self._map)
+        if magic != STORE_MAGIC or version != STORE_VERSION or size != RECORD_SIZE:
+            self.close()
+            raise ValueError('not a position store of version %d' % STORE_VERSION)
+        self._count = (len(self._map) - _FILE_HEADER.size) // RECORD_SIZE
+
+    def __len__(self):
+        """returns the number of records"""
+        return self._count
+
+    def record(self, number):
+        """returns the raw bytes of a record as a memoryview, without copying"""
+        if not -self._count <= number < self._count:
+            raise IndexError('record %d out of range' % number)
+        start = _FILE_HEADER.size + (number % self._count) * RECORD_SIZE
+        return self._view[start:start + RECORD_SIZE]
+
+    def scan(self, start=0, stop=None):
+        """generator yielding the memoryview of each record in turn"""
+        stop = self._count if stop is None else min(stop, self._count)
+        offset = _FILE_HEADER.size + start * RECORD_SIZE
+        view = self._view
+        for _ in range(start, stop):
+            yield view[offset:offset + RECORD_SIZE]
+            offset += RECORD_SIZE
+
+    def get_cells(self, number):
+        """returns the 400 cells of a record"""
+        return record_cells(self.record(number))
+
+    def get_current_player(self, number):
+        """returns the player to move in a record"""
+        return record_current_player(self.record(number))
+
+    def get_game_state(self, number):
+        """returns the game state of a record"""
+        return record_game_state(self.record(number))
+
+    def get_ring_addresses(self, number, player):
+        """returns the addresses of the ring centers of a player in a record"""
+        return [index_to_address(ring) for ring in sorted(record_rings(self.record(number), player))]
+
+    def get_position(self, number):
+        """returns a record as a Position"""
+        return record_position(self.record(number))
+
+    def to_dict(self, number):
+        """returns the board of a record as the dictionary of dictionaries of Board.to_dict"""
+        return Board(self.get_cells(number)).to_dict()
+
+    def close(self):
+        """unmaps the file"""
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def record_cells(record):
+    """returns the 400 cells of a record"""
+    return unpack_position(record[:_POSITION_BYTES])
+
+
+def record_current_player(record):
+    """returns the player to move in a record"""
+    return _PLAYERS[record[_FLAGS] & 1]
+
+
+def record_game_state(record):
+    """returns the game state of a record"""
+    return RESULTS[record[_FLAGS] >> 1]
+
+
+def record_rings(record, player):
+    """
+    returns the frozen set of the ring centers of a
+    player in a record, found from its cells if there
+    were more rings than slots
+    """
+    side = _PLAYERS.index(player)
+    count = record[_RING_COUNTS] >> 4 * side & 15
+    if count > RING_SLOTS:
+        return frozenset(find_rings(Board(record_cells(record)), PLAYER_STONES[player]))
+    slots = _RINGS.unpack_from(record, _POSITION_BYTES + 2)[side * RING_SLOTS:side * RING_SLOTS + count]
+    return frozenset(slots)
+
+
+def record_position(record):
+    """returns a record as a Position"""
+    cells = record_cells(record)
+    board_hash = 0
+    for index, stone in enumerate(cells):
+        if stone:
+            board_hash ^= ZOBRIST_KEYS[stone][index]
+    rows = tuple(cells[start:start + BOARD_SIZE] for start in range(0, CELL_COUNT, BOARD_SIZE))
+    rings = {player: record_rings(record, player) for player in _PLAYERS}
+    return Position(rows, record_current_player(record), record_game_state(record), rings, board_hash)
@@ -0,0 +1,193 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Replays the games of a record archive across worker processes to check they are still legal
+
+import argparse
+import json
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from Gess import GessGame, InvalidMoveException
+from GessRecord import read_header, read_record, skip_record
+
+# a run of consecutive games of an archive: its number, the byte offset of
+# its first game, the number of that game counted from zero, and its length
+Shard = namedtuple('Shard', ['shard_id', 'offset', 'first_game', 'games'])
+# a game which no longer replays as recorded: its number in the archive, the
+# number of the first refused move counted from one, or None if every move
+# was made but the game ended differently, that move, and the recorded and
+# replayed game states
+Mismatch = namedtuple('Mismatch', ['game', 'move_number', 'move', 'expected', 'actual'])
+# the outcome of a shard: its number, the games and moves replayed and the
+# mismatches found
+ShardResult = namedtuple('ShardResult', ['shard_id', 'games', 'moves', 'mismatches'])
+# the outcome of a validation: the games and moves checked, every mismatch in
+# archive order, the shards replayed by this run and those carried over from
+# the checkpoint, the seconds taken, and the games and moves per second
+# replayed by this run
+ValidationReport = namedtuple('ValidationReport', ['games', 'moves', 'mismatches', 'shards_run', 'shards_resumed',
+                                                   'elapsed', 'games_per_second', 'moves_per_second'])
+
+
+def split_archive(path, shard_size=1000):
+    """
+    returns the shards of the archive at the given path,
+    each of up to shard_size games, found by reading only
+    the header of each game
+    """
+    shards = []
+    with open(path, 'rb') as stream:
+        read_header(stream)
+        game = 0
+        while True:
+            offset = stream.tell()
+            if skip_record(stream) is None:
+                break
+            if game % shard_size == 0:
+                shards.append(Shard(len(shards), offset, game, 0))
+            shards[-1] = shards[-1]._replace(games=shards[-1].games + 1)
+            game += 1
+    return shards
+
+
+def validate_record(record, game_number, engine='array'):
+    """
+    replays one GameRecord and returns the Mismatch it
+    shows, or None if every move is still made and the
+    game ends in the recorded state. A move the rules
+    now refuse or hold invalid is a Mismatch at that move
+    """
+    game = GessGame.new(engine)
+    if record.start is not None or record.first_player != 'BLACK':
+        game.set_position(record.start if record.start is not None else game.get_board_state().get_cells(),
+                          record.first_player)
+    for number, (initial, final) in enumerate(record.moves, 1):
+        try:
+            moved = game.make_move(initial, final)
+        except InvalidMoveException:
+            moved = False
+        if not moved:
+            return Mismatch(game_number, number, (initial, final), record.result, game.get_game_state())
+    if game.get_game_state() != record.result:
+        return Mismatch(game_number, None, None, record.result, game.get_game_state())
+    return None
+
+
+def validate_shard(path, shard, engine='array'):
+    """
+    replays every game of a shard inside a worker
+    process and returns its ShardResult
+    """
+    mismatches = []
+    moves = 0
+    with open(path, 'rb') as stream:
+        stream.seek(shard.offset)
+        for game_number in range(shard.first_game, shard.first_game + shard.games):
+            record = read_record(stream)
+            moves += len(record.moves)
+            mismatch = validate_record(record, game_number, engine)
+            if mismatch is not None:
+                mismatches.append(mismatch)
+    return ShardResult(shard.shard_id, shard.games, moves, mismatches)
+
+
+def _load_checkpoint(checkpoint, identity):
+    """
+    returns the shard results saved in the checkpoint
+    file, keyed by shard number, or nothing if there is
+    no checkpoint or it belongs to another run
+    """
+    if checkpoint is None or not os.path.exists(checkpoint):
+        return {}
+    with open(checkpoint) as stream:
+        saved = json.load(stream)
+    if saved.get('identity') != identity:
+        return {}
+    results = {}
+    for shard_id, games, moves, mismatches in saved['shards']:
+        results[shard_id] = ShardResult(shard_id, games, moves,
+                                        [Mismatch(game, number, tuple(move) if move else None, expected, actual)
+                                         for game, number, move, expected, actual in mismatches])
+    return results
+
+
+def _save_checkpoint(checkpoint, identity, results):
+    """
+    writes the finished shard results to the checkpoint
+    file, replacing it in one step so that an interrupted
+    run never leaves half a checkpoint behind
+    """
+    temporary = checkpoint + '.tmp'
+    with open(temporary, 'w') as stream:
+        json.dump({'identity': identity, 'shards': [list(result) for result in results.values()]}, stream)
+    os.replace(temporary, checkpoint)
+
+
+def validate_archive(path, workers=None, shard_size=1000, checkpoint=None, engine='array'):
+    """
+    replays every game of the archive at the given path
+    across a pool of worker processes and returns a
+    ValidationReport. With a checkpoint path, each shard
+    is saved there as it finishes, and a later run over
+    the same archive replays only the shards not yet done
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = split_archive(path, shard_size)
+    identity = [os.path.abspath(path), os.path.getsize(path), shard_size]
+    results = _load_checkpoint(checkpoint, identity)
+    resumed = len(results)
+    todo = [shard for shard in shards if shard.shard_id not in results]
+    start = time.perf_counter()
+    games = moves = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        remaining = iter(todo)
+        while True:
+            for shard in remaining:
+                pending.add(executor.submit(validate_shard, path, shard, engine))
+                if len(pending) >= workers * 2:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                results[result.shard_id] = result
+                games += result.games
+                moves += result.moves
+            if checkpoint is not None:
+                _save_checkpoint(checkpoint, identity, results)
+    elapsed = time.perf_counter() - start
+    mismatches = [mismatch for shard_id in sorted(results) for mismatch in results[shard_id].mismatches]
+    return ValidationReport(sum(result.games for result in results.values()),
+                            sum(result.moves for result in results.values()),
+                            mismatches, len(todo), resumed, elapsed,
+                            games / elapsed if elapsed > 0 else 0.0,
+                            moves / elapsed if elapsed > 0 else 0.0)
+
+
+def main():
+    """validates an archive from the command line and prints a summary"""
+    parser = argparse.ArgumentParser(description='Replay an archive of Gess games to check they are still legal.')
+    parser.add_argument('archive', help='binary archive written by GessRecord.RecordWriter')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes, default one per core')
+    parser.add_argument('--shard-size', type=int, default=1000, help='games in each shard')
+    parser.add_argument('--checkpoint', default=None, help='file recording finished shards, to resume from')
+    parser.add_argument('--engine', choices=('array', 'bitboard'), default='array', help='board engine')
+    args = parser.parse_args()
+    report = validate_archive(args.archive, args.workers, args.shard_size, args.checkpoint, args.engine)
+    print('games:', report.games, 'moves:', report.moves, 'mismatches:', len(report.mismatches))
+    print('shards run:', report.shards_run, 'resumed:', report.shards_resumed, 'seconds: %.2f' % report.elapsed)
+    print('games per second: %.1f' % report.games_per_second, 'moves per second: %.1f' % report.moves_per_second)
+    for mismatch in report.mismatches:
+        if mismatch.move_number is None:
+            print('game', mismatch.game, 'ended', mismatch.actual, 'not', mismatch.expected)
+        else:
+            print('game', mismatch.game, 'move', mismatch.move_number, '%s-%s' % mismatch.move, 'refused')
+    return 1 if report.mismatches else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
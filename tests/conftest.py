@@ -0,0 +1,8 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Lets the tests import the modules at the top of the repository
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,86 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Checks the features and scores of a batch of positions against those of each game
+
+import random
+import unittest
+
+from Gess import BOARD_SIZE, PLAYER_STONES, GessGame, Piece, find_rings, index_to_address
+
+try:
+    import GessBatch
+except ImportError:
+    GessBatch = None
+
+# number of seeded positions and the most random moves played to reach each
+POSITIONS = 12
+MOVES = 100
+
+
+def _positions():
+    """returns games left after seeded random moves"""
+    games = []
+    for seed in range(POSITIONS):
+        rng = random.Random(seed)
+        game = GessGame()
+        for _ in range(rng.randrange(MOVES)):
+            moves = list(game.legal_moves())
+            if not moves:
+                break
+            game.make_move(*rng.choice(moves))
+        games.append(game)
+    return games
+
+
+@unittest.skipIf(GessBatch is None, 'NumPy is not installed')
+class BatchFeaturesTest(unittest.TestCase):
+    """Checks evaluate_batch finds the same pieces, rings and stones as the game"""
+    @classmethod
+    def setUpClass(cls):
+        cls.games = _positions()
+        cls.features = GessBatch.evaluate_batch(GessBatch.games_to_array(cls.games))
+
+    def test_pieces_and_rings_match(self):
+        for n, game in enumerate(self.games):
+            board = game.get_board_state()
+            for column, player in enumerate(('BLACK', 'WHITE')):
+                with self.subTest(position=n, player=player):
+                    opponent = 'WHITE' if player == 'BLACK' else 'BLACK'
+                    stone = PLAYER_STONES[player]
+                    valid = self.features.valid_black if player == 'BLACK' else self.features.valid_white
+                    rings = self.features.rings_black if player == 'BLACK' else self.features.rings_white
+                    own_rings, opponent_rings = find_rings(board, stone), find_rings(board, PLAYER_STONES[opponent])
+                    pieces = directions = 0
+                    for i in range(BOARD_SIZE - 2):
+                        for j in range(BOARD_SIZE - 2):
+                            index = (i + 1) * BOARD_SIZE + j + 1
+                            piece = Piece(index_to_address(index), board, player, opponent, own_rings, opponent_rings)
+                            self.assertEqual(bool(valid[n, i, j]), piece.get_validity(), index_to_address(index))
+                            self.assertEqual(bool(rings[n, i, j]), index in own_rings, index_to_address(index))
+                            if piece.get_validity():
+                                pieces += 1
+                                directions += len([key for key in piece.get_valid_moves() if key != 'C'])
+                    self.assertEqual(self.features.pieces[n, column], pieces)
+                    self.assertEqual(self.features.directions[n, column], directions)
+                    self.assertEqual(self.features.stones[n, column], board.count_stones(stone))
+
+    def test_board_features_and_scores_match(self):
+        array = GessBatch.games_to_array(self.games)
+        features = GessBatch.board_features_batch(array)
+        for player in ('BLACK', 'WHITE'):
+            scores = GessBatch.score_batch(array, player)
+            for n, game in enumerate(self.games):
+                with self.subTest(position=n, player=player):
+                    self.assertEqual(tuple(features[n]), game.get_board_state().get_features())
+                    if all(game.get_ring_addresses(side) for side in ('BLACK', 'WHITE')):
+                        self.assertEqual(scores[n], game.evaluate(player))
+
+    def test_array_round_trip(self):
+        array = GessBatch.games_to_array(self.games)
+        games = GessBatch.array_to_games(array)
+        self.assertEqual([game.get_hash() for game in games],
+                         [game.get_board_state().get_hash() for game in self.games])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Checks benchmark results are only compared against a baseline of the same engine
+
+import unittest
+
+from GessBenchmark import compare, machine_differences
+
+
+def _results(engine, best, python='3.11.0', platform='Linux'):
+    """returns a dictionary, as from to_json, of one benchmark with the given best time"""
+    return {'engine': engine, 'python': python, 'platform': platform,
+            'results': {'slide': {'name': 'slide', 'kind': 'micro', 'number': 1, 'best': best, 'median': best}}}
+
+
+class CompareTest(unittest.TestCase):
+    """Checks regressions are found only between comparable runs"""
+    def test_regression_found(self):
+        regressions = compare(_results('array', 1.0), _results('array', 1.5))
+        self.assertEqual([regression.name for regression in regressions], ['slide'])
+        self.assertEqual(compare(_results('array', 1.0), _results('array', 1.05)), [])
+
+    def test_other_engine_is_refused(self):
+        with self.assertRaises(ValueError):
+            compare(_results('array', 1.0), _results('bitboard', 1.0))
+
+    def test_other_machine_is_reported(self):
+        self.assertEqual(machine_differences(_results('array', 1.0), _results('array', 1.0)), [])
+        self.assertEqual(machine_differences(_results('array', 1.0), _results('array', 1.0, python='3.12.1')),
+                         ['python'])
+
+
+if __name__ == '__main__':
+    unittest.main()
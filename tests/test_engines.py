@@ -0,0 +1,80 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Plays the same seeded games on every board engine and compares them move by move
+
+import random
+import unittest
+
+from Gess import BOARD_ENGINES, INTERIOR_CENTERS, GessGame, InvalidMoveException, index_to_address
+
+# number of seeded games and the moves tried in each
+GAMES = 12
+MOVES = 80
+
+
+def _attempt(game, initial, final):
+    """returns the outcome of a move: made, refused or invalid"""
+    try:
+        return game.make_move(initial, final)
+    except InvalidMoveException:
+        return 'invalid'
+
+
+class EngineAgreementTest(unittest.TestCase):
+    """Checks the bitboard engine plays exactly like the array engine"""
+    def assertSameGame(self, games, message):
+        reference = games[0]
+        for game in games[1:]:
+            self.assertEqual(game.get_board_state().get_cells(), reference.get_board_state().get_cells(), message)
+            self.assertEqual(game.get_hash(), reference.get_hash(), message)
+            board, reference_board = game.get_board_state(), reference.get_board_state()
+            self.assertEqual(board.get_features(), reference_board.get_features(), message)
+            self.assertEqual([board.pattern(center) for center in INTERIOR_CENTERS],
+                             [reference_board.pattern(center) for center in INTERIOR_CENTERS], message)
+            for player in ('BLACK', 'WHITE'):
+                self.assertEqual(sorted(game.get_ring_addresses(player)),
+                                 sorted(reference.get_ring_addresses(player)), message)
+            self.assertEqual(game.get_game_state(), reference.get_game_state(), message)
+            self.assertEqual(game.get_current_player(), reference.get_current_player(), message)
+
+    def test_seeded_games_agree(self):
+        for seed in range(GAMES):
+            with self.subTest(seed=seed):
+                rng = random.Random(seed)
+                games = [GessGame(engine) for engine in BOARD_ENGINES]
+                for number in range(MOVES):
+                    moves = [list(game.legal_moves()) for game in games]
+                    for other in moves[1:]:
+                        self.assertEqual(sorted(other), sorted(moves[0]), 'move %d' % number)
+                    if not moves[0] or games[0].get_game_state() != 'UNFINISHED':
+                        break
+                    if rng.random() < 0.2:
+                        # any pair of squares, which is usually refused or invalid
+                        initial, final = index_to_address(rng.randrange(400)), index_to_address(rng.randrange(400))
+                    else:
+                        initial, final = rng.choice(moves[0])
+                    outcomes = [_attempt(game, initial, final) for game in games]
+                    self.assertEqual(len(set(outcomes)), 1, 'move %d, %s-%s' % (number, initial, final))
+                    self.assertSameGame(games, 'move %d, %s-%s' % (number, initial, final))
+
+    def test_push_and_pop_agree(self):
+        rng = random.Random(GAMES)
+        games = [GessGame(engine) for engine in BOARD_ENGINES]
+        depth = 0
+        for number in range(MOVES):
+            if depth and rng.random() < 0.3:
+                for game in games:
+                    game.pop_move()
+                depth -= 1
+            else:
+                moves = list(games[0].legal_moves())
+                if not moves:
+                    break
+                move = rng.choice(moves)
+                self.assertTrue(all(game.push_move(*move) for game in games))
+                depth += 1
+            self.assertSameGame(games, 'step %d' % number)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Tests of GessGame construction, and of its listeners and stats around hypothetical moves
+
+import random
+import unittest
+
+from Gess import BOARD_ENGINES, PLAYER_STONES, GessGame, GessListener, find_rings, _STARTING_ROWS
+from GessEngine import GessEngine
+
+
+class RecordingListener(GessListener):
+    """Listener keeping the name of every event it is told of"""
+    def __init__(self):
+        self.events = []
+
+    def on_step(self, piece, iteration, direction):
+        self.events.append('step')
+
+    def on_frontier_hit(self, piece, direction, frontier):
+        self.events.append('frontier_hit')
+
+    def on_ring_status(self, ring, intact):
+        self.events.append('ring_status')
+
+    def on_move_rejected(self, initial, final, reason):
+        self.events.append('rejected')
+
+    def on_move_committed(self, game, initial, final):
+        self.events.append('committed')
+
+    def on_game_over(self, game):
+        self.events.append('game_over')
+
+
+class HypotheticalMoveTest(unittest.TestCase):
+    """Checks listeners and stats see real moves only"""
+    def test_push_and_pop_are_silent(self):
+        game = GessGame()
+        listener = RecordingListener()
+        game.add_listener(listener)
+        self.assertTrue(game.push_move('c3', 'c6'))
+        self.assertFalse(game.push_move('c3', 'c3'))
+        game.pop_move()
+        self.assertEqual(listener.events, [])
+
+    def test_search_is_silent(self):
+        game = GessGame()
+        listener = RecordingListener()
+        game.add_listener(listener)
+        GessEngine(game).search(max_depth=1)
+        self.assertEqual(listener.events, [])
+
+    def test_search_is_not_counted(self):
+        game = GessGame()
+        game.enable_stats()
+        GessEngine(game).search(max_depth=1)
+        self.assertEqual(game.get_stats()['moves'], 0)
+        self.assertTrue(game.make_move('c3', 'c6'))
+        self.assertEqual(game.get_stats()['moves'], 1)
+
+    def test_real_move_is_told(self):
+        game = GessGame()
+        listener = RecordingListener()
+        game.add_listener(listener)
+        self.assertTrue(game.make_move('c3', 'c6'))
+        self.assertEqual(listener.events.count('committed'), 1)
+
+
+class StartingPositionTest(unittest.TestCase):
+    """Checks games copied from the starting template stay apart"""
+    def test_games_share_nothing(self):
+        for engine in BOARD_ENGINES:
+            first, second = GessGame(engine), GessGame(engine)
+            fresh = BOARD_ENGINES[engine].from_rows(_STARTING_ROWS)
+            self.assertTrue(first.make_move('c3', 'c6'))
+            first.resign_game()
+            self.assertEqual(second.get_board_state().get_cells(), fresh.get_cells())
+            self.assertEqual(second.get_board_state().get_features(), fresh.get_features())
+            self.assertEqual(second._rings, {player: find_rings(fresh, stone)
+                                             for player, stone in PLAYER_STONES.items()})
+            self.assertEqual(second.get_game_state(), 'UNFINISHED')
+
+
+class PositionPlayTest(unittest.TestCase):
+    """Checks Position.play agrees with make_move, however positions are revisited"""
+    def test_play_matches_make_move(self):
+        for engine in BOARD_ENGINES:
+            rng = random.Random(17)
+            game = GessGame(engine)
+            positions = [game.snapshot()]
+            for _ in range(40):
+                moves = list(game.legal_moves())
+                if not moves:
+                    break
+                # a move from an earlier position first, so the scratch game has to go back
+                earlier = rng.choice(positions)
+                reference = GessGame(engine, earlier)
+                branch = rng.choice(list(reference.legal_moves()))
+                reference.make_move(*branch)
+                self.assertEqual(earlier.play(*branch, engine=engine), reference.snapshot())
+                move = rng.choice(moves)
+                played = positions[-1].play(*move, engine=engine)
+                game.make_move(*move)
+                self.assertEqual(played, game.snapshot())
+                self.assertEqual(played.get_rings('BLACK'), frozenset(game._rings['BLACK']))
+                self.assertEqual(played.get_rings('WHITE'), frozenset(game._rings['WHITE']))
+                positions.append(played)
+            self.assertTrue(any(old is new for old, new in zip(positions[0].get_rows(), positions[1].get_rows())))
+
+    def test_invalid_move_plays_to_none(self):
+        start = GessGame().snapshot()
+        for engine in BOARD_ENGINES:
+            # refused, and raising InvalidMoveException in make_move
+            self.assertIsNone(start.play('c3', 'c3', engine=engine))
+            self.assertIsNone(start.play('b4', 'b5', engine=engine))
+            self.assertEqual(start.play('c3', 'c6', engine=engine), GessGame(engine).snapshot().play('c3', 'c6'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Checks the Monte Carlo tree search keeps its tree from move to move
+
+import unittest
+
+from Gess import GessGame
+from GessMCTS import MCTS, NO_NODE
+
+# playouts of each search
+PLAYOUTS = 200
+
+
+def _roots(pool):
+    """returns the nodes in use which have no parent"""
+    return [node for node in range(pool.get_capacity())
+            if pool.parent[node] == NO_NODE and pool.children[node] is not None]
+
+
+class TreeReuseTest(unittest.TestCase):
+    """Checks a search after a move carries on from the subtree of that move"""
+    def setUp(self):
+        self.game = GessGame()
+        self.search = MCTS(self.game, seed=22)
+        self.result = self.search.search(max_playouts=PLAYOUTS)
+        self.stats = self.search.root_stats()
+
+    def test_move_keeps_subtree(self):
+        move = max(self.stats, key=lambda move: self.stats[move][0])
+        pool = self.search.get_pool()
+        kept = len(pool)
+        self.assertTrue(self.game.make_move(*move))
+        self.search.search(max_playouts=0)
+        # the node of the move is the only root, with the visits it had, and its siblings are released
+        roots = _roots(pool)
+        self.assertEqual(len(roots), 1)
+        self.assertEqual(pool.key[roots[0]], self.game.get_hash())
+        self.assertEqual(pool.visits[roots[0]], self.stats[move][0])
+        self.assertLess(len(pool), kept)
+
+    def test_released_nodes_are_reused(self):
+        move = max(self.stats, key=lambda move: self.stats[move][0])
+        capacity = self.search.get_pool().get_capacity()
+        self.game.make_move(*move)
+        self.search.search(max_playouts=PLAYOUTS // 2)
+        self.assertEqual(self.search.get_pool().get_capacity(), capacity)
+
+    def test_unrelated_position_starts_afresh(self):
+        self.game.set_position(self.game.get_board_state().get_cells(), 'WHITE')
+        self.search.search(max_playouts=0)
+        self.assertEqual(self.search.root_stats(), {})
+        self.assertEqual(len(self.search.get_pool()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Checks the move tree of the starting position against the reference leaf counts
+
+import unittest
+
+from Gess import BOARD_ENGINES, GessGame
+from GessPerft import REFERENCE_COUNTS, check_reference, divide, perft, run_perft
+
+
+class PerftTest(unittest.TestCase):
+    """Counts the first plies of the move tree on every engine"""
+    def test_reference_counts(self):
+        for engine in BOARD_ENGINES:
+            for depth in (1, 2):
+                with self.subTest(engine=engine, depth=depth):
+                    game = GessGame(engine)
+                    result = run_perft(game, depth, engine=engine)
+                    self.assertEqual(result.nodes, REFERENCE_COUNTS[depth])
+                    self.assertTrue(check_reference(depth, result.nodes))
+                    # the count leaves the game as it found it
+                    self.assertEqual(game.get_hash(), GessGame(engine).get_hash())
+
+    def test_bulk_and_divide_agree(self):
+        game = GessGame()
+        self.assertEqual(perft(game, 1, bulk=False), REFERENCE_COUNTS[1])
+        counts = divide(game, 2)
+        self.assertEqual(len(counts), REFERENCE_COUNTS[1])
+        self.assertEqual(sum(counts.values()), REFERENCE_COUNTS[2])
+
+    def test_unknown_depth_has_no_reference(self):
+        self.assertIsNone(check_reference(9, 0))
+        self.assertFalse(check_reference(1, REFERENCE_COUNTS[1] + 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
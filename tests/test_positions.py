@@ -0,0 +1,66 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Checks positions are read and written as text, cells and packed bytes, and bad ones refused
+
+import unittest
+
+from Gess import BOARD_ENGINES, CELL_COUNT, GessGame, format_position, parse_position
+from GessRecord import pack_position
+
+
+class PositionTextTest(unittest.TestCase):
+    """Checks format_position and parse_position"""
+    def test_round_trip(self):
+        cells = GessGame().get_board_state().get_cells()
+        text = format_position(cells)
+        self.assertEqual(parse_position(text), cells)
+        self.assertEqual(parse_position(text.replace('/', '\n')), cells)
+
+    def test_bad_cells_are_refused(self):
+        cells = GessGame().get_board_state().get_cells()
+        with self.assertRaises(ValueError):
+            format_position(cells[:-1])
+        with self.assertRaises(ValueError):
+            format_position(cells[:-1] + b'\x03')
+
+    def test_bad_text_is_refused(self):
+        rows = format_position(GessGame().get_board_state().get_cells()).split('/')
+        for text in ('/'.join(rows[:-1]), '/'.join(rows[:-1] + ['19']), '/'.join(rows[:-1] + ['21']),
+                     '/'.join(rows[:-1] + ['10x9']), ''):
+            with self.subTest(text=text[-12:]):
+                with self.assertRaises(ValueError):
+                    parse_position(text)
+
+
+class FromPositionTest(unittest.TestCase):
+    """Checks GessGame.from_position reads every form of position and refuses bad ones"""
+    def test_every_form_gives_the_same_game(self):
+        start = GessGame()
+        cells = start.get_board_state().get_cells()
+        for engine in BOARD_ENGINES:
+            for position in (cells, bytearray(cells), pack_position(cells), format_position(cells)):
+                game = GessGame.from_position(position, engine=engine)
+                self.assertEqual(game.get_board_state().get_cells(), cells)
+                self.assertEqual(game.get_hash(), start.get_hash())
+                self.assertEqual(game.get_ring_addresses('BLACK'), start.get_ring_addresses('BLACK'))
+
+    def test_bad_positions_are_refused(self):
+        cells = GessGame().get_board_state().get_cells()
+        for position in (cells[:-1], cells[:-1] + b'\x03', b'\xff' * (CELL_COUNT // 4), b'', 'b/w'):
+            with self.subTest(size=len(position)):
+                with self.assertRaises(ValueError):
+                    GessGame.from_position(position)
+        with self.assertRaises(ValueError):
+            GessGame.from_position(cells, 'RED')
+        with self.assertRaises(ValueError):
+            GessGame.from_position(cells, engine='abacus')
+
+    def test_player_without_a_ring_has_lost(self):
+        text = format_position(GessGame().get_board_state().get_cells())
+        # row 3 without k3, which breaks black's only ring on l3
+        game = GessGame.from_position(text.replace('/1bbb1b1bbbb1b1b1bbb1/', '/1bbb1b1bbb2b1b1bbb1/'))
+        self.assertEqual(game.get_game_state(), 'WHITE_WON')
+
+
+if __name__ == '__main__':
+    unittest.main()
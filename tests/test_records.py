@@ -0,0 +1,101 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Checks that recorded games round trip, and that moves the rules refuse are reported, not raised
+
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from Gess import GessGame, InvalidMoveException, address_to_index, is_interior
+from GessBook import OpeningBook, build_book, write_book
+from GessRecord import GameRecord, GameRecorder, RecordWriter, format_record, parse_record, read_records, replay
+from GessValidator import Mismatch, validate_archive
+
+# games played on the original board, some with moves ending on the edge rows
+BASELINE_GAMES = os.path.join(os.path.dirname(__file__), 'data', 'baseline_games.json')
+
+# a game whose only move goes in a direction the piece has no stone for
+REFUSED_RECORD = GameRecord(None, 'BLACK', 'UNFINISHED', [('b4', 'b5')])
+
+
+def _recorded_baseline_games():
+    """returns the GameRecords of the baseline games, made through a GameRecorder"""
+    with open(BASELINE_GAMES) as stream:
+        games = json.load(stream)
+    records = []
+    for game in games:
+        recorder = GameRecorder(GessGame())
+        for initial, final, _ in game['attempts']:
+            try:
+                recorder.make_move(initial, final)
+            except InvalidMoveException:
+                pass
+        records.append(recorder.get_record())
+    return records
+
+
+class RoundTripTest(unittest.TestCase):
+    """Checks records, including moves with a final square on the edge, read back as written"""
+    @classmethod
+    def setUpClass(cls):
+        cls.records = _recorded_baseline_games()
+
+    def test_records_cover_edge_finals(self):
+        self.assertTrue(any(not is_interior(address_to_index(final))
+                            for record in self.records for _, final in record.moves))
+
+    def test_archive_round_trip(self):
+        stream = io.BytesIO()
+        writer = RecordWriter(stream)
+        for record in self.records:
+            writer.write(record)
+        stream.seek(0)
+        self.assertEqual(list(read_records(stream)), self.records)
+
+    def test_text_round_trip(self):
+        for record in self.records:
+            self.assertEqual(parse_record(format_record(record)), record)
+
+    def test_book_round_trip(self):
+        book = build_book(self.records, max_ply=200)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.book')
+            write_book(path, book)
+            opening_book = OpeningBook(path)
+            for key, moves in book.items():
+                self.assertEqual({(move.initial, move.final) for move in opening_book.lookup(key)}, set(moves))
+
+
+class RefusedMoveTest(unittest.TestCase):
+    """Checks refused moves of a record surface as documented"""
+    def test_replay_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            replay(REFUSED_RECORD)
+
+    def test_book_stops_at_refused_move(self):
+        record = REFUSED_RECORD._replace(moves=[('c3', 'c6'), ('b4', 'b5'), ('c18', 'c15')])
+        book = build_book([record])
+        self.assertEqual([list(moves) for moves in book.values()], [[('c3', 'c6')]])
+
+
+class ValidatorTest(unittest.TestCase):
+    """Checks the validator reports refused moves of an archive"""
+    def test_refused_move_is_a_mismatch(self):
+        records = [GameRecord(None, 'BLACK', 'UNFINISHED', [('c3', 'c6')]),
+                   REFUSED_RECORD,
+                   GameRecord(None, 'BLACK', 'UNFINISHED', [('c3', 'c6'), ('c18', 'c15')])]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.gess')
+            with open(path, 'wb') as stream:
+                writer = RecordWriter(stream)
+                for record in records:
+                    writer.write(record)
+            report = validate_archive(path, workers=1, shard_size=2)
+        self.assertEqual(report.games, 3)
+        self.assertEqual(report.mismatches, [Mismatch(1, 1, ('b4', 'b5'), 'UNFINISHED', 'UNFINISHED')])
+
+
+if __name__ == '__main__':
+    unittest.main()
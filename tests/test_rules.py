@@ -0,0 +1,121 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Replays games recorded on the original dictionary board to check the rules have not changed
+
+import json
+import os
+import random
+import unittest
+
+from Gess import (ACCEPTED_CODES, BOARD_ENGINES, MOVE_CODES, WHITE_STONE, GessGame, InvalidMoveException,
+                  address_to_index, index_to_address, is_interior, parse_position)
+
+# games played on the original dictionary board: each move tried, whether
+# it was made (true), refused (false) or raised InvalidMoveException
+# ("invalid"), and the position, player to move and game state at the end.
+# Moves the original board crashed on were left out, as were the two kinds
+# of move it got wrong: slides running off the board, which it wrapped
+# around to the far edge, and moves breaking the mover's own last ring
+BASELINE_GAMES = os.path.join(os.path.dirname(__file__), 'data', 'baseline_games.json')
+
+
+def _attempt(game, initial, final):
+    """returns the outcome of a move as recorded in the baseline games"""
+    try:
+        return game.make_move(initial, final)
+    except InvalidMoveException:
+        return 'invalid'
+
+
+class BaselineReplayTest(unittest.TestCase):
+    """Replays the baseline games on every board engine"""
+    @classmethod
+    def setUpClass(cls):
+        with open(BASELINE_GAMES) as stream:
+            cls.games = json.load(stream)
+
+    def test_moves_and_outcomes_match(self):
+        for engine in BOARD_ENGINES:
+            for record in self.games:
+                with self.subTest(engine=engine, seed=record['seed']):
+                    game = GessGame(engine)
+                    for number, (initial, final, expected) in enumerate(record['attempts']):
+                        self.assertEqual(_attempt(game, initial, final), expected,
+                                         'move %d, %s-%s' % (number, initial, final))
+                    self.assertEqual(game.get_game_state(), record['state'])
+                    self.assertEqual(game.get_current_player(), record['player'])
+                    self.assertEqual(game.get_board_state().get_cells(), parse_position(record['position']))
+
+    def test_games_cover_slides_stopped_before_the_edge(self):
+        # the moves whose final square is on the edge rows, made because stones stopped them short
+        edge_moves = [(initial, final) for record in self.games for initial, final, made in record['attempts']
+                      if made is True and not is_interior(address_to_index(final))]
+        self.assertGreater(len(edge_moves), 10)
+
+    def test_slide_running_off_the_board_is_refused(self):
+        game = GessGame()
+        # c3 slides south west onto b2 without meeting stones, and a1 lies beyond the board
+        self.assertEqual(game.validate_move('c3', 'a1').code, 'OFF_BOARD')
+        self.assertFalse(game.make_move('c3', 'a1'))
+
+
+class ValidateMoveTest(unittest.TestCase):
+    """Checks every code of validate_move, and that it agrees with make_move"""
+    # a move from the starting position giving each code, and the square the slide stops on
+    STARTING_MOVES = {
+        'VALID': ('c3', 'c6', 'c6'),
+        'BLOCKED': ('c3', 'f3', 'd3'),
+        'BAD_ADDRESS': ('c3', 'z9', None),
+        'BAD_CENTER': ('a1', 'a2', None),
+        'NOT_YOUR_STONES': ('c18', 'c15', None),
+        'BREAKS_OWN_RING': ('k3', 'k6', None),
+        'SAME_SQUARE': ('c3', 'c3', None),
+        'NOT_STRAIGHT': ('c3', 'd5', None),
+        'DIRECTION_NOT_ALLOWED': ('b4', 'b5', None),
+        'TOO_FAR': ('e3', 'e7', None),
+        'OFF_BOARD': ('c3', 'a1', None),
+    }
+
+    def test_every_code(self):
+        for engine in BOARD_ENGINES:
+            game = GessGame(engine)
+            for code, (initial, final, stop) in self.STARTING_MOVES.items():
+                with self.subTest(engine=engine, code=code):
+                    self.assertEqual(game.validate_move(initial, final), (code, stop))
+            cells = bytearray(game.get_board_state().get_cells())
+            cells[address_to_index('d2')] = WHITE_STONE
+            mixed = GessGame.from_position(bytes(cells), engine=engine)
+            self.assertEqual(mixed.validate_move('c3', 'c6').code, 'MIXED_COLORS')
+            game.resign_game()
+            self.assertEqual(game.validate_move('c3', 'c6').code, 'GAME_OVER')
+        self.assertEqual(set(self.STARTING_MOVES) | {'MIXED_COLORS', 'GAME_OVER'}, set(MOVE_CODES))
+
+    def test_agrees_with_make_move(self):
+        rng = random.Random(21)
+        for engine in BOARD_ENGINES:
+            for _ in range(6):
+                game = GessGame(engine)
+                for _ in range(30):
+                    moves = list(game.legal_moves())
+                    if not moves:
+                        break
+                    # the legal moves, their centers to random squares and random pairs of squares
+                    tries = moves[:20] + [(initial, index_to_address(rng.randrange(400))) for initial, _ in moves[:20]]
+                    tries += [(index_to_address(rng.randrange(400)), index_to_address(rng.randrange(400)))
+                              for _ in range(20)]
+                    for initial, final in tries:
+                        check = game.validate_move(initial, final)
+                        try:
+                            made = game.push_move(initial, final)
+                        except InvalidMoveException:
+                            made = False
+                        self.assertEqual(check.code in ACCEPTED_CODES, made, '%s-%s' % (initial, final))
+                        if made:
+                            pattern = game.get_board_state().pattern(address_to_index(check.stop))
+                            game.pop_move()
+                            self.assertEqual(pattern, game.get_board_state().pattern(address_to_index(initial)))
+                    game.make_move(*rng.choice(moves))
+
+
+if __name__ == '__main__':
+    unittest.main()
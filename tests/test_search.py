@@ -0,0 +1,51 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Checks the search reports wins and losses at the right distance
+
+import unittest
+
+from Gess import BLACK_STONE, CELL_COUNT, WHITE_STONE, GessGame
+from GessEngine import WIN_SCORE, GessEngine, _value_from_table, _value_to_table
+
+
+def _ring(cells, row, col, stone):
+    """places a ring of the given stones around the given center"""
+    for row_step in (-1, 0, 1):
+        for col_step in (-1, 0, 1):
+            if row_step or col_step:
+                cells[(row + row_step) * 20 + col + col_step] = stone
+
+
+def _winning_position():
+    """returns cells where black breaks white's only ring in one move"""
+    cells = bytearray(CELL_COUNT)
+    _ring(cells, 10, 10, WHITE_STONE)
+    _ring(cells, 4, 4, BLACK_STONE)
+    cells[10 * 20 + 5] = cells[10 * 20 + 6] = BLACK_STONE
+    return bytes(cells)
+
+
+class MateScoreTest(unittest.TestCase):
+    """Checks wins and losses keep their distance through the table"""
+    def test_table_values_are_node_relative(self):
+        for value in (WIN_SCORE - 7, 7 - WIN_SCORE):
+            stored = _value_to_table(value, 3)
+            # the same win or loss, two plies from the root instead of three
+            self.assertEqual(_value_from_table(stored, 1), value + (2 if value > 0 else -2))
+            self.assertEqual(_value_from_table(stored, 3), value)
+        for value in (0, 250, -250):
+            self.assertEqual(_value_to_table(value, 3), value)
+            self.assertEqual(_value_from_table(value, 3), value)
+
+    def test_win_in_one_with_a_used_table(self):
+        for engine in ('array', 'bitboard'):
+            game = GessGame.from_position(_winning_position(), 'BLACK', engine)
+            searcher = GessEngine(game)
+            for _ in range(2):
+                result = searcher.search(max_depth=3)
+                self.assertEqual(result.move, ('f10', 'i13'), engine)
+                self.assertEqual(result.value, WIN_SCORE - 1, engine)
+
+
+if __name__ == '__main__':
+    unittest.main()
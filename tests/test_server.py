@@ -0,0 +1,60 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Checks the requests of the game server against the state of the games they act on
+
+import asyncio
+import unittest
+
+from GessServer import GessServer
+
+
+async def _resign_twice():
+    """returns the replies to creating a game and resigning it twice"""
+    server = GessServer()
+    try:
+        created = await server.handle({'op': 'create'})
+        first = await server.handle({'op': 'resign', 'game': created['game']})
+        second = await server.handle({'op': 'resign', 'game': created['game']})
+        state = await server.handle({'op': 'state', 'game': created['game']})
+        return first, second, state
+    finally:
+        await server.stop()
+
+
+async def _malformed_replies():
+    """returns the replies to requests naming games and squares with the wrong types"""
+    server = GessServer()
+    try:
+        created = await server.handle({'op': 'create'})
+        return [await server.handle(request) for request in (
+            {'op': 'state', 'game': [1]},
+            {'op': 'state', 'game': {'id': 1}},
+            {'op': 'state', 'game': str(created['game'])},
+            {'op': 'move', 'game': created['game'], 'initial': ['c3'], 'final': 'c6'},
+            {'op': 'move', 'game': created['game'], 'initial': 'c3', 'final': 6},
+            {'op': 'move', 'game': created['game'], 'initial': 'c3', 'final': 'zz'},
+        )]
+    finally:
+        await server.stop()
+
+
+class MalformedRequestTest(unittest.TestCase):
+    """Checks requests with values of the wrong type are refused rather than dropping the connection"""
+    def test_malformed_requests_are_refused(self):
+        for reply in asyncio.run(_malformed_replies()):
+            self.assertFalse(reply['ok'])
+            self.assertIn('error', reply)
+
+
+class ResignTest(unittest.TestCase):
+    """Checks a finished game cannot be resigned"""
+    def test_resign_after_game_over(self):
+        first, second, state = asyncio.run(_resign_twice())
+        self.assertTrue(first['ok'])
+        self.assertEqual(first['state'], 'WHITE_WON')
+        self.assertFalse(second['ok'])
+        self.assertEqual(state['state'], 'WHITE_WON')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Checks positions written to a position store read back unchanged, and its bounds
+
+import os
+import random
+import tempfile
+import unittest
+
+from Gess import GessGame
+from GessStore import RECORD_SIZE, PositionStore, PositionWriter
+
+
+class PositionStoreTest(unittest.TestCase):
+    """Writes the positions of a seeded game to a store and reads them back"""
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'positions.store')
+        rng = random.Random(18)
+        game = GessGame()
+        self.positions = [game.snapshot()]
+        for _ in range(30):
+            moves = list(game.legal_moves())
+            if not moves:
+                break
+            game.make_move(*rng.choice(moves))
+            self.positions.append(game.snapshot())
+        with PositionWriter(self.path) as writer:
+            for position in self.positions:
+                writer.write(position)
+            writer.write_cells(self.positions[-1].get_cells(), self.positions[-1].get_current_player())
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        with PositionStore(self.path) as store:
+            self.assertEqual(len(store), len(self.positions) + 1)
+            for number, position in enumerate(self.positions + self.positions[-1:]):
+                self.assertEqual(store.get_position(number), position)
+                self.assertEqual(store.get_cells(number), position.get_cells())
+                self.assertEqual(store.get_current_player(number), position.get_current_player())
+                self.assertEqual(store.get_game_state(number), position.get_game_state())
+                for player in ('BLACK', 'WHITE'):
+                    self.assertEqual(store.get_ring_addresses(number, player), position.get_ring_addresses(player))
+            self.assertEqual(sum(1 for view in store.scan() if len(view) == RECORD_SIZE), len(store))
+
+    def test_out_of_range(self):
+        with PositionStore(self.path) as store:
+            self.assertEqual(store.get_position(-1), store.get_position(len(store) - 1))
+            with self.assertRaises(IndexError):
+                store.record(len(store))
+            with self.assertRaises(IndexError):
+                store.get_cells(-len(store) - 1)
+
+    def test_appending_keeps_one_header(self):
+        with PositionWriter(self.path) as writer:
+            writer.write(self.positions[0])
+        with PositionStore(self.path) as store:
+            self.assertEqual(store.get_position(len(store) - 1), self.positions[0])
+
+    def test_not_a_store(self):
+        with open(self.path, 'wb') as stream:
+            stream.write(b'not a store at all')
+        with self.assertRaises(ValueError):
+            PositionStore(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# Author: Sullivan Myer
+# Date: 10/18/26
+# Description: Checks the transposition table stores, finds and replaces search results as documented
+
+import unittest
+
+from Gess import TranspositionTable
+
+
+class TranspositionTableTest(unittest.TestCase):
+    """Checks the two entries of a bucket of the transposition table"""
+    def setUp(self):
+        # a single bucket, so that every key shares it
+        self.table = TranspositionTable(capacity=2)
+
+    def test_store_and_probe(self):
+        self.assertIsNone(self.table.probe(7))
+        self.table.store(7, 3, 42, TranspositionTable.LOWER_BOUND, ('c3', 'c6'))
+        entry = self.table.probe(7)
+        self.assertEqual((entry.key, entry.depth, entry.value, entry.flag, entry.move),
+                         (7, 3, 42, TranspositionTable.LOWER_BOUND, ('c3', 'c6')))
+        self.assertIsNone(self.table.probe(8))
+        self.assertEqual(self.table.get_stats(), {'probes': 3, 'hits': 1, 'filled': 1, 'capacity': 2})
+
+    def test_same_position_replaces_its_entry(self):
+        self.table.store(7, 5, 1)
+        self.table.store(7, 2, 2)
+        self.assertEqual(self.table.probe(7).value, 2)
+        self.assertEqual(len(self.table), 1)
+
+    def test_deeper_result_displaces_to_always_replaced_entry(self):
+        self.table.store(7, 2, 1)
+        self.table.store(8, 4, 2)
+        self.assertEqual(self.table.probe(7).value, 1)
+        self.assertEqual(self.table.probe(8).value, 2)
+        # shallower than the depth preferred entry, so it takes the always replaced one
+        self.table.store(9, 1, 3)
+        self.assertIsNone(self.table.probe(7))
+        self.assertEqual(self.table.probe(8).value, 2)
+        self.assertEqual(self.table.probe(9).value, 3)
+
+    def test_moving_to_preferred_entry_leaves_no_stale_copy(self):
+        self.table.store(7, 4, 1)
+        self.table.store(8, 1, 2)
+        self.table.store(8, 6, 3)
+        self.assertEqual(self.table.probe(8).value, 3)
+        self.assertEqual(self.table.probe(7).value, 1)
+        self.assertEqual(len(self.table), 2)
+
+    def test_clear(self):
+        self.table.store(7, 1, 1)
+        self.table.clear()
+        self.assertIsNone(self.table.probe(7))
+        self.assertEqual(len(self.table), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()